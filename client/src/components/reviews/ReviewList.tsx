@@ -1,14 +1,17 @@
 import { motion } from "framer-motion";
-import { Star, User } from "lucide-react";
-import { ReviewData } from "../../services/Booking";
+import { ChevronLeft, ChevronRight, Star, User } from "lucide-react";
+import { ReviewData, ReviewsPage, ReviewSummary } from "../../services/Booking";
 
 interface ReviewListProps {
     reviews: ReviewData[];
     isLoading: boolean;
     error: Error | null;
+    summary?: ReviewSummary;
+    pagination?: ReviewsPage["pagination"];
+    onPageChange?: (page: number) => void;
 }
 
-const ReviewList = ({ reviews, isLoading, error }: ReviewListProps) => {
+const ReviewList = ({ reviews, isLoading, error, summary, pagination, onPageChange }: ReviewListProps) => {
     if (isLoading) {
         return (
             <div className="flex justify-center py-8">
@@ -57,6 +60,9 @@ const ReviewList = ({ reviews, isLoading, error }: ReviewListProps) => {
         }
     };
 
+    const currentPage = pagination?.current_page || 1;
+    const totalPages = pagination?.total_pages || 1;
+
     return (
         <motion.div
             variants={containerVariants}
@@ -64,6 +70,15 @@ const ReviewList = ({ reviews, isLoading, error }: ReviewListProps) => {
             animate="visible"
             className="space-y-6"
         >
+            {summary && summary.count > 0 && (
+                <div className="flex items-center space-x-2 text-gray-700">
+                    <Star size={20} className="text-yellow-400 fill-yellow-400" />
+                    <span className="font-semibold">{summary.average.toFixed(1)}</span>
+                    <span className="text-gray-500">
+                        ({summary.count} {summary.count === 1 ? "review" : "reviews"})
+                    </span>
+                </div>
+            )}
             {reviews.map((review) => (
                 <motion.div
                     key={review.id}
@@ -123,6 +138,33 @@ const ReviewList = ({ reviews, isLoading, error }: ReviewListProps) => {
                     </div>
                 </motion.div>
             ))}
+            {onPageChange && totalPages > 1 && (
+                <div className="flex items-center justify-center space-x-4">
+                    <button
+                        onClick={() => onPageChange(currentPage - 1)}
+                        disabled={currentPage === 1}
+                        className={`p-1 rounded-md border ${currentPage === 1
+                            ? "bg-gray-100 text-gray-400 cursor-not-allowed"
+                            : "bg-white text-blue-600 hover:bg-blue-50"
+                            }`}
+                    >
+                        <ChevronLeft size={20} />
+                    </button>
+                    <span className="text-sm text-gray-600">
+                        Page {currentPage} of {totalPages}
+                    </span>
+                    <button
+                        onClick={() => onPageChange(currentPage + 1)}
+                        disabled={currentPage === totalPages}
+                        className={`p-1 rounded-md border ${currentPage === totalPages
+                            ? "bg-gray-100 text-gray-400 cursor-not-allowed"
+                            : "bg-white text-blue-600 hover:bg-blue-50"
+                            }`}
+                    >
+                        <ChevronRight size={20} />
+                    </button>
+                </div>
+            )}
         </motion.div>
     );
 };
@@ -176,7 +176,7 @@ const AvailabilityResults = () => {
                         <div className="relative">
                           <img
                             loading="lazy"
-                            src={room.room_image || '/default-room.jpg'}
+                            src={room.room_image_sizes?.card || room.room_image || '/default-room.jpg'}
                             alt={room.room_name}
                             className="w-full h-56 object-cover"
                           />
@@ -261,7 +261,7 @@ const AvailabilityResults = () => {
                         <div className="relative">
                           <img
                             loading="lazy"
-                            src={area.area_image || '/default-venue.jpg'}
+                            src={area.area_image_sizes?.card || area.area_image || '/default-venue.jpg'}
                             alt={area.area_name}
                             className="w-full h-56 object-cover"
                           />
@@ -37,18 +37,21 @@ const RoomDetails = () => {
     queryFn: fetchAmenities,
   });
 
+  const [reviewsPage, setReviewsPage] = useState<number>(1);
+
   const {
     data: reviewsData,
     isLoading: isLoadingReviews,
     error: reviewsError
   } = useQuery({
-    queryKey: ["roomReviews", id],
-    queryFn: () => fetchRoomReviews(id as string),
+    queryKey: ["roomReviews", id, reviewsPage],
+    queryFn: () => fetchRoomReviews(id as string, reviewsPage),
     enabled: !!id,
   });
 
   useEffect(() => {
     window.scrollTo(0, 0);
+    setReviewsPage(1);
   }, [id]);
 
   if (isLoadingRoom) return <LoadingDashboard />;
@@ -272,6 +275,9 @@ const RoomDetails = () => {
                 reviews={reviews}
                 isLoading={isLoadingReviews}
                 error={reviewsError as Error | null}
+                summary={reviewsData?.summary}
+                pagination={reviewsData?.pagination}
+                onPageChange={setReviewsPage}
               />
             </motion.div>
           </motion.div>
@@ -42,18 +42,21 @@ const VenueDetails = () => {
         queryFn: fetchAreas,
     });
 
+    const [reviewsPage, setReviewsPage] = useState<number>(1);
+
     const {
         data: reviewsData,
         isLoading: isLoadingReviews,
         error: reviewsError
     } = useQuery({
-        queryKey: ["areaReviews", id],
-        queryFn: () => fetchAreaReviews(id as string),
+        queryKey: ["areaReviews", id, reviewsPage],
+        queryFn: () => fetchAreaReviews(id as string, reviewsPage),
         enabled: !!id,
     });
 
     useEffect(() => {
         window.scrollTo(0, 0);
+        setReviewsPage(1);
     }, [id]);
 
     if (isLoadingVenue) return <LoadingDashboard />;
@@ -304,6 +307,9 @@ const VenueDetails = () => {
                                 reviews={reviews}
                                 isLoading={isLoadingReviews}
                                 error={reviewsError as Error | null}
+                                summary={reviewsData?.summary}
+                                pagination={reviewsData?.pagination}
+                                onPageChange={setReviewsPage}
                             />
                         </motion.div>
                     </motion.div>
@@ -125,9 +125,19 @@ const BookingDetailsModal: FC<{
 
   const renderValidId = () => {
     if (!booking.valid_id) {
+      if (booking.valid_id_status === "failed") {
+        return (
+          <div className="text-center py-4 bg-red-50 rounded-lg">
+            <p className="text-red-600">The valid ID upload failed. Ask the guest to send it again.</p>
+          </div>
+        );
+      }
+
       return (
         <div className="text-center py-4 bg-gray-50 rounded-lg">
-          <p className="text-gray-500">No valid ID uploaded</p>
+          <p className="text-gray-500">
+            {booking.valid_id_status === "pending" ? "Valid ID is still uploading" : "No valid ID uploaded"}
+          </p>
         </div>
       );
     }
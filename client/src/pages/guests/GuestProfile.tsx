@@ -8,6 +8,9 @@ import { useUserContext } from "../../contexts/AuthContext";
 import { changePassword } from "../../services/Auth";
 import { getGuestDetails, updateGuestDetails, updateProfileImage } from "../../services/Guest";
 
+// The image types the server accepts for profile pictures
+const PROFILE_IMAGE_TYPES = ["image/jpeg", "image/png", "image/gif", "image/webp"];
+
 interface FormFields {
   first_name: string;
   last_name: string;
@@ -195,6 +198,10 @@ const GuestProfile = () => {
   const handleFileChange = useCallback((e: ChangeEvent<HTMLInputElement>) => {
     if (e.target.files && e.target.files[0]) {
       const file = e.target.files[0];
+      if (!PROFILE_IMAGE_TYPES.includes(file.type)) {
+        setUploadError("Please choose a JPEG, PNG, GIF or WebP image");
+        return;
+      }
       if (file.size > 2 * 1024 * 1024) {
         setUploadError("Image size should be less than 2MB");
         return;
@@ -211,7 +218,7 @@ const GuestProfile = () => {
   };
 
   const guestData = profile?.data;
-  const displayImage = guestData?.profile_image || profileImage || "/default-avatar.png";
+  const displayImage = profileImage || guestData?.profile_image || "/default-avatar.png";
 
   const containerVariants = {
     hidden: { opacity: 0, y: 20 },
@@ -361,7 +368,7 @@ const GuestProfile = () => {
                       <ImageUp size={28} className="text-white" />
                       <input
                         type="file"
-                        accept="image/*"
+                        accept={PROFILE_IMAGE_TYPES.join(",")}
                         onChange={handleFileChange}
                         className="hidden"
                       />
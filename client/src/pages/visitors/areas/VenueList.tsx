@@ -9,6 +9,7 @@ interface Area {
   area_name: string;
   description: string;
   area_image: string;
+  area_image_sizes?: { thumbnail: string; card: string; full: string } | null;
   status: string;
   capacity: number;
   price_per_hour: string;
@@ -70,7 +71,7 @@ const VenueList = () => {
                 title={area.area_name}
                 priceRange={area.price_per_hour}
                 capacity={area.capacity}
-                image={area.area_image}
+                image={area.area_image_sizes?.card || area.area_image}
               />
             </div>
           ))}
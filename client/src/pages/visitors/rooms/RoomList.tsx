@@ -10,6 +10,7 @@ interface Room {
   id: number;
   room_name: string;
   room_image: string;
+  room_image_sizes?: { thumbnail: string; card: string; full: string } | null;
   room_type: string;
   status: string;
   description: string;
@@ -39,7 +40,7 @@ const RoomList: FC = () => {
       return {
         id: room.id,
         name: room.room_name,
-        image: room.room_image,
+        image: room.room_image_sizes?.card || room.room_image,
         title: room.room_type,
         status: room.status,
         description: room.description,
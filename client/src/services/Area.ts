@@ -5,6 +5,7 @@ interface Area {
   area_name: string;
   description: string;
   area_image: string;
+  area_image_sizes?: { thumbnail: string; card: string; full: string } | null;
   status: string;
   capacity: number;
   price_per_hour: string;
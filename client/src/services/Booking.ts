@@ -42,6 +42,7 @@ export interface BookingResponse {
   updated_at: string;
   cancellation_reason?: string;
   valid_id?: string;
+  valid_id_status?: "uploaded" | "pending" | "failed" | "missing";
 }
 
 export interface BookingFormData {
@@ -93,6 +94,23 @@ export interface ReviewData {
   };
 }
 
+export interface ReviewSummary {
+  average: number;
+  count: number;
+  histogram: Record<string, number>;
+}
+
+export interface ReviewsPage {
+  data: ReviewData[];
+  summary: ReviewSummary;
+  pagination: {
+    total_pages: number;
+    current_page: number;
+    total_items: number;
+    page_size: number;
+  };
+}
+
 export const fetchBookings = async ({
   page = 1,
   pageSize = 9,
@@ -443,9 +461,13 @@ export const deleteReview = async (reviewId: string) => {
   }
 };
 
-export const fetchRoomReviews = async (roomId: string) => {
+export const fetchRoomReviews = async (roomId: string, page = 1, pageSize = 10): Promise<ReviewsPage> => {
   try {
     const response = await booking.get(`/rooms/${roomId}/reviews`, {
+      params: {
+        page,
+        page_size: pageSize,
+      },
       headers: { "Content-Type": "application/json" },
       withCredentials: true,
     });
@@ -456,9 +478,13 @@ export const fetchRoomReviews = async (roomId: string) => {
   }
 };
 
-export const fetchAreaReviews = async (areaId: string) => {
+export const fetchAreaReviews = async (areaId: string, page = 1, pageSize = 10): Promise<ReviewsPage> => {
   try {
     const response = await booking.get(`/areas/${areaId}/reviews`, {
+      params: {
+        page,
+        page_size: pageSize,
+      },
       headers: { "Content-Type": "application/json" },
       withCredentials: true,
     });
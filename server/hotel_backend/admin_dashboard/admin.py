@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import AdminDetails
+from .models import AdminDetails, EmailOutbox
 
 # Register your models here.
-admin.site.register(AdminDetails)
\ No newline at end of file
+admin.site.register(AdminDetails)
+admin.site.register(EmailOutbox)
@@ -0,0 +1,163 @@
+import datetime
+import time
+from django.db import transaction
+from django.db.models import Count, Sum, Q
+from django.utils import timezone
+from booking.models import Bookings, Reservations, Transactions
+from property.models import Rooms
+from property.catalog import get_model_versions
+from hotel_backend.cache import cache_namespace
+
+DASHBOARD_VERSION_KEY = 'version'
+DASHBOARD_CACHE_TIMEOUT = 60 * 5
+BOOKING_STATUSES = ('pending', 'reserved', 'checked_in', 'checked_out', 'cancelled', 'no_show', 'rejected')
+
+dashboard_cache = cache_namespace('dashboard')
+
+def get_dashboard_version() -> int:
+    version = dashboard_cache.get(DASHBOARD_VERSION_KEY)
+    if version is None:
+        dashboard_cache.add(DASHBOARD_VERSION_KEY, _initial_version(), None)
+        version = dashboard_cache.get(DASHBOARD_VERSION_KEY, 0)
+    return version
+
+def bump_dashboard_version() -> None:
+    """
+    Invalidate the dashboard snapshots after a booking, reservation or
+    transaction write. Deferred to the commit, like bump_catalog_version().
+    """
+    transaction.on_commit(_bump_dashboard_version)
+
+def _bump_dashboard_version() -> None:
+    try:
+        dashboard_cache.incr(DASHBOARD_VERSION_KEY)
+    except ValueError:
+        dashboard_cache.set(DASHBOARD_VERSION_KEY, _initial_version(), None)
+
+def cached_dashboard(key, builder, timeout=DASHBOARD_CACHE_TIMEOUT):
+    """
+    Read-through cache for dashboard snapshots. Entries are keyed on the
+    dashboard version, the rooms catalog version and the current date, so
+    writes and the day (or month) rolling over both produce a fresh snapshot;
+    the timeout bounds how stale the date-relative counts can get.
+    """
+    rooms_version = get_model_versions(('rooms',))['rooms']
+    full_key = (
+        f"{key}:v{get_dashboard_version()}:rooms{rooms_version}"
+        f":{timezone.localdate().isoformat()}"
+    )
+    value = dashboard_cache.get(full_key)
+    if value is None:
+        value = builder()
+        dashboard_cache.set(full_key, value, timeout)
+    return value
+
+def get_dashboard_stats() -> dict:
+    return cached_dashboard('stats', build_dashboard_stats)
+
+def get_booking_status_counts() -> dict:
+    return cached_dashboard('booking_status_counts', build_booking_status_counts)
+
+def get_area_reservation_counts() -> list:
+    return cached_dashboard('area_reservations', build_area_reservation_counts)
+
+def build_dashboard_stats() -> dict:
+    now = timezone.now()
+    current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    current_month_end = (current_month_start.replace(month=current_month_start.month % 12 + 1, day=1) - datetime.timedelta(days=1)).replace(hour=23, minute=59, second=59)
+
+    if current_month_start.month == 12:
+        current_month_end = current_month_start.replace(year=current_month_start.year + 1, month=1, day=1) - datetime.timedelta(days=1)
+
+    total_rooms = Rooms.objects.count()
+    available_rooms = Rooms.objects.filter(status='available').count()
+    occupied_rooms = Bookings.objects.filter(
+        Q(status='checked_in') & 
+        Q(is_venue_booking=False) & 
+        Q(check_in_date__lte=now.date()) & 
+        Q(check_out_date__gte=now.date())
+    ).count()
+    maintenance_rooms = Rooms.objects.filter(status='maintenance').count()
+
+    active_bookings = Bookings.objects.filter(
+        Q(status__in=['confirmed', 'reserved', 'checked_in']) &
+        Q(created_at__range=(current_month_start, current_month_end))
+    ).count()
+
+    pending_bookings = Bookings.objects.filter(
+        Q(status='pending') &
+        Q(created_at__range=(current_month_start, current_month_end))
+    ).count()
+
+    unpaid_bookings = Bookings.objects.filter(
+        Q(payment_status='unpaid') &
+        Q(created_at__range=(current_month_start, current_month_end))
+    ).count()
+
+    checked_in_count = Bookings.objects.filter(
+        Q(status='checked_in') &
+        Q(created_at__range=(current_month_start, current_month_end))
+    ).count()
+
+    total_bookings = Bookings.objects.filter(
+        created_at__range=(current_month_start, current_month_end)
+    ).count()
+
+    upcoming_reservations = Bookings.objects.filter(
+        Q(is_venue_booking=True) &
+        Q(status__in=['confirmed', 'reserved']) &
+        Q(check_in_date__gte=now.date())
+    ).count()
+
+    transactions_this_month = Transactions.objects.filter(
+        transaction_date__range=(current_month_start, current_month_end),
+        status='completed'
+    )
+
+    revenue = transactions_this_month.aggregate(Sum('amount'))['amount__sum'] or 0
+
+    room_revenue = transactions_this_month.filter(
+        Q(booking__isnull=False) & 
+        Q(booking__is_venue_booking=False)
+    ).aggregate(Sum('amount'))['amount__sum'] or 0
+
+    venue_revenue = transactions_this_month.filter(
+        Q(booking__isnull=False) & 
+        Q(booking__is_venue_booking=True) | 
+        Q(reservation__isnull=False)
+    ).aggregate(Sum('amount'))['amount__sum'] or 0
+
+    formatted_revenue = f"₱{revenue:,.2f}"
+    formatted_room_revenue = f"₱{room_revenue:,.2f}"
+    formatted_venue_revenue = f"₱{venue_revenue:,.2f}"
+
+    return {
+        'total_rooms': total_rooms,
+        'available_rooms': available_rooms,
+        'occupied_rooms': occupied_rooms,
+        'maintenance_rooms': maintenance_rooms,
+        'active_bookings': active_bookings,
+        'pending_bookings': pending_bookings,
+        'unpaid_bookings': unpaid_bookings,
+        'checked_in_count': checked_in_count,
+        'total_bookings': total_bookings,
+        'upcoming_reservations': upcoming_reservations,
+        'revenue': revenue,
+        'room_revenue': room_revenue,
+        'venue_revenue': venue_revenue,
+        'formatted_revenue': formatted_revenue,
+        'formatted_room_revenue': formatted_room_revenue,
+        'formatted_venue_revenue': formatted_venue_revenue
+    }
+
+def build_booking_status_counts() -> dict:
+    return Bookings.objects.aggregate(**{
+        status: Count('id', filter=Q(status=status)) for status in BOOKING_STATUSES
+    })
+
+def build_area_reservation_counts() -> list:
+    return list(Reservations.objects.values('area').annotate(count=Count('area')))
+
+def _initial_version() -> int:
+    # Clock-based so versions don't repeat after the cache is flushed.
+    return time.time_ns() // 1000
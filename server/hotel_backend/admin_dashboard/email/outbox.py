@@ -0,0 +1,137 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+from ..models import EmailOutbox
+
+MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 60
+RETRY_MAX_DELAY = 3600
+# How long a claimed batch stays hidden from other workers while it is sent
+CLAIM_LEASE = 300
+
+def enqueue_email(to_email, subject, text_body, html_body='', from_email=None) -> EmailOutbox:
+    """
+    Queue an email for the outbox worker.
+
+    Call it inside the transaction that makes the change the email is about:
+    the row is committed (or rolled back) together with it, and nothing
+    touches SMTP during the request.
+    """
+    entry = outbox_entry(to_email, subject, text_body, html_body, from_email)
+    entry.save()
+    return entry
+
+def outbox_entry(to_email, subject, text_body, html_body='', from_email=None) -> EmailOutbox:
+    """An unsaved, immediately due outbox row, for callers that bulk_create() many."""
+    return EmailOutbox(
+        to_email=to_email,
+        from_email=from_email or settings.EMAIL_HOST_USER or '',
+        subject=subject,
+        text_body=text_body,
+        html_body=html_body,
+        next_attempt_at=timezone.now(),
+    )
+
+def render_email(template_name, context) -> tuple:
+    """
+    Render ``<template_name>.txt`` and ``<template_name>.html`` with the same
+    context and return ``(text_body, html_body)``. Templates come from the
+    cached loader, so each one is compiled once per process.
+    """
+    return (
+        render_to_string(f"{template_name}.txt", context).strip() + "\n",
+        render_to_string(f"{template_name}.html", context),
+    )
+
+def enqueue_template_email(to_email, subject, template_name, context, from_email=None) -> EmailOutbox:
+    """Render an email template pair and queue the result, see enqueue_email()."""
+    text_body, html_body = render_email(template_name, context)
+    return enqueue_email(to_email, subject, text_body, html_body, from_email=from_email)
+
+def deliver_outbox(batch_size=50, max_attempts=MAX_ATTEMPTS) -> dict:
+    """
+    Send one batch of due emails over a single SMTP connection.
+
+    Each accepted message is marked sent as soon as the server takes it, so
+    a worker killed mid-batch only resends the message it was sending; a
+    failure is recorded on its row and retried with exponential backoff until
+    ``max_attempts`` is reached, after which the row is marked failed.
+    """
+    entries = _claim_batch(batch_size)
+    result = {'claimed': len(entries), 'sent': 0, 'retrying': 0, 'failed': 0}
+    if not entries:
+        return result
+
+    smtp = get_connection()
+    try:
+        smtp.open()
+    except Exception as e:
+        # Nothing in the batch can go out; try all of it again later.
+        for entry in entries:
+            result[_record_failure(entry, e, max_attempts)] += 1
+        return result
+
+    try:
+        for entry in entries:
+            try:
+                if not smtp.send_messages([_build_message(entry, smtp)]):
+                    raise RuntimeError("Message was not accepted by the mail backend")
+            except Exception as e:
+                result[_record_failure(entry, e, max_attempts)] += 1
+                # Drop a possibly broken session; the next send reconnects.
+                _close_quietly(smtp)
+                continue
+            EmailOutbox.objects.filter(id=entry.id).update(
+                status=EmailOutbox.SENT, attempts=F('attempts') + 1, sent_at=timezone.now(), last_error=''
+            )
+            result['sent'] += 1
+    finally:
+        _close_quietly(smtp)
+    return result
+
+def retry_delay(attempts) -> int:
+    """Seconds to wait before the next try after ``attempts`` failed ones."""
+    return min(RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0), RETRY_MAX_DELAY)
+
+def _claim_batch(batch_size):
+    now = timezone.now()
+    with transaction.atomic():
+        due = EmailOutbox.objects.filter(
+            status=EmailOutbox.PENDING, next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        entries = list(due[:batch_size])
+        if entries:
+            EmailOutbox.objects.filter(id__in=[entry.id for entry in entries]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_LEASE)
+            )
+    return entries
+
+def _build_message(entry, smtp):
+    message = EmailMultiAlternatives(
+        entry.subject, entry.text_body, entry.from_email or None, [entry.to_email], connection=smtp
+    )
+    if entry.html_body:
+        message.attach_alternative(entry.html_body, "text/html")
+    return message
+
+def _record_failure(entry, error, max_attempts) -> str:
+    entry.attempts += 1
+    entry.last_error = f"{type(error).__name__}: {error}"[:2000]
+    if entry.attempts >= max_attempts:
+        entry.status = EmailOutbox.FAILED
+    else:
+        entry.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay(entry.attempts))
+    entry.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
+    return 'failed' if entry.status == EmailOutbox.FAILED else 'retrying'
+
+def _close_quietly(smtp):
+    try:
+        smtp.close()
+    except Exception:
+        pass
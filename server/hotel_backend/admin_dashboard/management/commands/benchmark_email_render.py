@@ -0,0 +1,82 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from admin_dashboard.email.outbox import render_email
+
+# Representative contexts for every email template pair
+SAMPLE_CONTEXTS = {
+    'emails/booking_confirmation': {
+        'guest_name': 'Guest {n}', 'booking_id': '{n}', 'property_type': 'Room',
+        'property_name': 'Deluxe Suite', 'check_in': '2025-06-01', 'check_out': '2025-06-03',
+    },
+    'emails/booking_rejection': {
+        'guest_name': 'Guest {n}', 'booking_id': '{n}', 'property_type': 'Venue',
+        'property_name': 'Grand Hall', 'check_in': '2025-06-01', 'check_out': '2025-06-01',
+        'cancellation_reason': 'Fully booked',
+    },
+    'emails/account_verification_otp': {
+        'email': 'guest{n}@example.com', 'otp': '{n}', 'message': 'Your OTP for account verification',
+        'valid_minutes': 2,
+    },
+    'emails/password_reset_otp': {'email': 'guest{n}@example.com', 'otp': '{n}', 'valid_minutes': 2},
+    'emails/arrival_reminder': {
+        'guest_name': 'Guest {n}', 'booking_id': '{n}', 'property_type': 'Room',
+        'property_name': 'Deluxe Suite', 'check_in': '2025-06-01', 'check_out': '2025-06-03',
+        'status_label': 'RESERVED',
+    },
+    'emails/post_stay': {
+        'guest_name': 'Guest {n}', 'booking_id': '{n}', 'property_type': 'Room',
+        'property_name': 'Deluxe Suite', 'check_in': '2025-06-01', 'check_out': '2025-06-03',
+        'status_label': 'CHECKED OUT',
+    },
+}
+
+class Command(BaseCommand):
+    help = (
+        "Measure email rendering for a bulk send: templates recompiled for every "
+        "message vs. compiled once by the cached loader"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000, help="Emails rendered per template")
+        parser.add_argument('--template', choices=sorted(SAMPLE_CONTEXTS), help="Only benchmark this template")
+
+    def handle(self, *args, **options):
+        loader = self._cached_loader()
+        names = [options['template']] if options['template'] else sorted(SAMPLE_CONTEXTS)
+        count = options['count']
+
+        self.stdout.write(f"{count} renders per template (text + html)")
+        for name in names:
+            contexts = [
+                {key: value.format(n=n) if isinstance(value, str) else value
+                 for key, value in SAMPLE_CONTEXTS[name].items()}
+                for n in range(count)
+            ]
+
+            def uncached(context):
+                loader.reset()
+                return render_email(name, context)
+
+            recompiled = self._time(uncached, contexts)
+            loader.reset()
+            cached = self._time(lambda context: render_email(name, context), contexts)
+            text, html = render_email(name, contexts[0])
+
+            self.stdout.write(
+                f"{name:<36} recompiled {recompiled / count * 1_000_000:>8.1f} us  "
+                f"cached {cached / count * 1_000_000:>8.1f} us  "
+                f"({count / cached:,.0f} emails/s, {len(text) + len(html):,} bytes each)"
+            )
+
+    def _time(self, render, contexts):
+        started = time.perf_counter()
+        for context in contexts:
+            render(context)
+        return time.perf_counter() - started
+
+    def _cached_loader(self):
+        for loader in engines['django'].engine.template_loaders:
+            if hasattr(loader, 'reset'):
+                return loader
+        raise CommandError("The Django template engine is not using the cached loader")
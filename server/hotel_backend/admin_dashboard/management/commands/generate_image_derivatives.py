@@ -0,0 +1,51 @@
+import time
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from hotel_backend.media import ABSOLUTE_URL_PREFIXES, MediaField, get_media_storage
+
+class Command(BaseCommand):
+    help = (
+        "Create the resized versions of stored room, area and profile images, e.g. for files saved "
+        "before derivatives were generated. Images whose sizes all exist are skipped unless --force. "
+        "Cloudinary renders sizes on request, so there is nothing to do with it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Regenerate sizes that already exist")
+
+    def handle(self, *args, **options):
+        storage = get_media_storage()
+        started = time.perf_counter()
+        generated = skipped = 0
+        for model, field in self.image_fields():
+            values = (
+                model.objects.exclude(**{f'{field.attname}__isnull': True}).exclude(**{field.attname: ''})
+                .values_list(field.attname, flat=True).distinct()
+            )
+            sizes = field.derivative_sizes
+            for value in values.iterator():
+                if value.startswith(ABSOLUTE_URL_PREFIXES):
+                    continue
+                if not options['force'] and self.has_derivatives(storage, value, sizes):
+                    skipped += 1
+                    continue
+                storage.create_derivatives(value, sizes)
+                generated += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated sizes for {generated} images ({skipped} already had them) "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        ))
+
+    def image_fields(self):
+        return [
+            (model, field)
+            for model in apps.get_models()
+            for field in model._meta.get_fields()
+            if isinstance(field, MediaField) and field.derivatives
+        ]
+
+    def has_derivatives(self, storage, value, sizes):
+        # derivative_url() falls back to the original for a size that is missing
+        original = storage.url(value)
+        return all(storage.derivative_url(value, size, sizes) != original for size in sizes)
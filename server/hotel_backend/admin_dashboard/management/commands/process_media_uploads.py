@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from admin_dashboard.uploads import process_media_uploads, MAX_ATTEMPTS
+
+class Command(BaseCommand):
+    help = (
+        "Push staged uploads (e.g. booking valid IDs) to the media backend and save their URLs. "
+        "Run once from cron, or with --loop as a long-running worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=20, help="Uploads claimed at a time")
+        parser.add_argument(
+            '--max-attempts', type=int, default=MAX_ATTEMPTS,
+            help="Attempts before an upload is marked failed"
+        )
+        parser.add_argument('--loop', action='store_true', help="Keep polling for uploads instead of exiting")
+        parser.add_argument('--interval', type=float, default=2, help="Seconds between polls when nothing is due")
+
+    def handle(self, *args, **options):
+        while True:
+            while True:
+                started = time.perf_counter()
+                result = process_media_uploads(options['batch_size'], options['max_attempts'])
+                if not result['claimed']:
+                    break
+                self.stdout.write(self.style.SUCCESS(
+                    f"Uploaded {result['done']}/{result['claimed']} files "
+                    f"({result['retrying']} to retry, {result['failed']} failed) "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+                ))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
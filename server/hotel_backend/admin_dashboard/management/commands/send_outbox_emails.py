@@ -0,0 +1,36 @@
+import time
+from django.core.management.base import BaseCommand
+from admin_dashboard.email.outbox import deliver_outbox, MAX_ATTEMPTS
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued emails from the outbox, one SMTP connection per batch. "
+        "Run once from cron, or with --loop as a long-running worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help="Emails sent per SMTP connection")
+        parser.add_argument(
+            '--max-attempts', type=int, default=MAX_ATTEMPTS,
+            help="Attempts before an email is marked failed"
+        )
+        parser.add_argument('--loop', action='store_true', help="Keep polling the outbox instead of exiting")
+        parser.add_argument('--interval', type=float, default=2, help="Seconds between polls of an empty outbox")
+
+    def handle(self, *args, **options):
+        while True:
+            # Drain everything that is due before sleeping.
+            while True:
+                started = time.perf_counter()
+                result = deliver_outbox(options['batch_size'], options['max_attempts'])
+                if not result['claimed']:
+                    break
+                self.stdout.write(self.style.SUCCESS(
+                    f"Sent {result['sent']}/{result['claimed']} emails "
+                    f"({result['retrying']} to retry, {result['failed']} failed) "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+                ))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,50 @@
+import time
+from django.core.management.base import BaseCommand
+from property.models import Rooms, Areas
+from property.utils import available_rooms_data, room_data, available_areas_data, area_data, amenities_data
+from booking.utils import booking_available_rooms_data, booking_room_data
+from admin_dashboard.dashboard import get_dashboard_stats, get_booking_status_counts, get_area_reservation_counts
+
+class Command(BaseCommand):
+    help = "Pre-populate the catalog, availability and dashboard caches before workers take traffic"
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-details', action='store_true',
+            help="Only warm the list endpoints, not the per-room and per-area details"
+        )
+    
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        
+        self._warm("catalog lists", lambda: (
+            available_rooms_data(),
+            available_areas_data(),
+            amenities_data(),
+        ))
+        self._warm("availability", booking_available_rooms_data)
+        
+        if not options['skip_details']:
+            room_ids = list(Rooms.objects.values_list('id', flat=True))
+            area_ids = list(Areas.objects.values_list('id', flat=True))
+            self._warm(f"{len(room_ids)} room details", lambda: [
+                (room_data(room_id), booking_room_data(room_id)) for room_id in room_ids
+            ])
+            self._warm(f"{len(area_ids)} area details", lambda: [
+                area_data(area_id) for area_id in area_ids
+            ])
+        
+        self._warm("dashboard snapshots", lambda: (
+            get_dashboard_stats(),
+            get_booking_status_counts(),
+            get_area_reservation_counts(),
+        ))
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Caches warmed in {(time.perf_counter() - started) * 1000:.0f} ms"
+        ))
+    
+    def _warm(self, label, warmer):
+        started = time.perf_counter()
+        warmer()
+        self.stdout.write(f"  {label}: {(time.perf_counter() - started) * 1000:.1f} ms")
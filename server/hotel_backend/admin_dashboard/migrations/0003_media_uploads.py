@@ -0,0 +1,36 @@
+# Generated by Django 5.1.8 on 2026-10-19 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0002_email_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('staged_path', models.CharField(max_length=500)),
+                ('original_name', models.CharField(blank=True, max_length=255)),
+                ('folder', models.CharField(blank=True, max_length=100)),
+                ('target_model', models.CharField(max_length=100)),
+                ('target_id', models.PositiveBigIntegerField()),
+                ('target_field', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField()),
+                ('last_error', models.TextField(blank=True)),
+                ('result', models.CharField(blank=True, max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'media_uploads',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='media_uploads_due_idx'), models.Index(fields=['target_model', 'target_id'], name='media_uploads_target_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.8 on 2026-10-19 00:14
+
+import hotel_backend.media
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0003_media_uploads'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='admindetails',
+            name='profile_pic',
+            field=hotel_backend.media.MediaField(folder='profile_images', verbose_name='profile_pic'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-19 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0005_media_assets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaupload',
+            name='discard_previous',
+            field=models.BooleanField(default=False),
+        ),
+    ]
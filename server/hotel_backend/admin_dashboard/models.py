@@ -1,11 +1,12 @@
+from django.conf import settings
 from django.db import models
-from cloudinary.models import CloudinaryField # type: ignore
+from hotel_backend.media import MediaField
 
 # Create your models here.
 class AdminDetails(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField()
-    profile_pic = CloudinaryField('profile_pic')
+    profile_pic = MediaField('profile_pic', folder='profile_images')
     
     class Meta:
         db_table = 'admin_details'
@@ -21,3 +22,97 @@ class ArchivedUser(models.Model):
     
     class Meta:
         db_table = 'archived_users'
+
+class EmailOutbox(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255)
+    text_body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'email_outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='email_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
+
+class MediaUpload(models.Model):
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    staged_path = models.CharField(max_length=500)
+    original_name = models.CharField(max_length=255, blank=True)
+    folder = models.CharField(max_length=100, blank=True)
+    # Where the final URL goes once the file is uploaded, e.g. booking.Bookings / 42 / valid_id
+    target_model = models.CharField(max_length=100)
+    target_id = models.PositiveBigIntegerField()
+    target_field = models.CharField(max_length=50)
+    # Set for uploads that may be reused later, see MediaAsset
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name='+', null=True, blank=True
+    )
+    content_hash = models.CharField(max_length=64, blank=True)
+    # Remove the file the target held before once the new one is in place
+    discard_previous = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True)
+    result = models.CharField(max_length=500, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'media_uploads'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='media_uploads_due_idx'),
+            models.Index(fields=['target_model', 'target_id'], name='media_uploads_target_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.target_model}#{self.target_id}.{self.target_field} ({self.status})"
+
+class MediaAsset(models.Model):
+    """
+    A file already in the media storage, keyed by its owner and SHA-256 so
+    that uploading identical content again reuses the stored value.
+    """
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='media_assets')
+    folder = models.CharField(max_length=100, blank=True)
+    content_hash = models.CharField(max_length=64)
+    size = models.PositiveBigIntegerField()
+    value = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'media_assets'
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'folder', 'content_hash'], name='unique_owner_media_content'),
+        ]
+
+    def __str__(self):
+        return f"{self.value} ({self.content_hash[:12]})"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from user_roles.models import CustomUsers
+from hotel_backend.media import media_url
 
 class AdminDetailSerializer(serializers.ModelSerializer):
     profile_image = serializers.SerializerMethodField()
@@ -9,6 +10,4 @@ class AdminDetailSerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_profile_image(self, obj):
-        if obj.profile_image:
-            return obj.profile_image.url
-        return ""
\ No newline at end of file
+        return media_url(obj.profile_image) or ""
\ No newline at end of file
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from booking.models import Bookings, Reservations, Transactions
+from .dashboard import bump_dashboard_version
+
+@receiver(post_save, sender=Bookings)
+@receiver(post_delete, sender=Bookings)
+@receiver(post_save, sender=Reservations)
+@receiver(post_delete, sender=Reservations)
+@receiver(post_save, sender=Transactions)
+@receiver(post_delete, sender=Transactions)
+def dashboard_data_changed(sender, instance, **kwargs):
+    bump_dashboard_version()
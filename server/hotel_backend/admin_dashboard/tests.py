@@ -1,3 +1,437 @@
-from django.test import TestCase
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.template import engines
+from django.template.base import Template
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from hotel_backend.tests import CacheTestCase
+from hotel_backend.tests.smtp import SMTPSink
+from hotel_backend.tests.storage import Image, StandInStorage, image_upload
+from hotel_backend.media import PENDING_UPLOAD, get_media_storage
+from booking.models import Bookings, Transactions
+from booking.serializers import BookingSerializer
+from property.models import Rooms, Areas
+from property.utils import available_rooms_data, room_data, area_data
+from booking.utils import booking_available_rooms_data
+from user_roles.models import CustomUsers
+from .dashboard import get_dashboard_stats, get_booking_status_counts
+from .email import outbox
+from .email.outbox import deliver_outbox, enqueue_email, render_email, retry_delay, RETRY_BASE_DELAY, RETRY_MAX_DELAY
+from .management.commands.benchmark_email_render import SAMPLE_CONTEXTS
+from .models import EmailOutbox, MediaAsset, MediaUpload
+from .uploads import queue_media_upload, process_media_uploads, RETRY_BASE_DELAY as UPLOAD_RETRY_BASE_DELAY
 
-# Create your tests here.
+class WarmCachesTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.room = Rooms.objects.create(room_name="Deluxe", room_type='premium', room_image='rooms/deluxe.jpg', capacity='2', room_price=2500)
+        self.area = Areas.objects.create(area_name="Garden", capacity=100, price_per_hour=1500)
+    
+    def test_warmed_reads_need_no_queries(self):
+        call_command('warm_caches', stdout=StringIO())
+        with self.assertNumQueries(0):
+            available_rooms_data()
+            booking_available_rooms_data()
+            room_data(self.room.id)
+            area_data(self.area.id)
+            get_dashboard_stats()
+    
+    def test_skip_details(self):
+        call_command('warm_caches', '--skip-details', stdout=StringIO())
+        with self.assertNumQueries(2):
+            room_data(self.room.id)
+
+class DashboardCacheTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.guest = CustomUsers.objects.create(username="guest@example.com", email="guest@example.com", role='guest')
+        self.room = Rooms.objects.create(room_name="Deluxe", room_type='premium', room_image='rooms/deluxe.jpg', capacity='2', room_price=2500)
+    
+    def book(self):
+        today = datetime.date.today()
+        return Bookings.objects.create(
+            user=self.guest, room=self.room, check_in_date=today, check_out_date=today + datetime.timedelta(days=1),
+            status='pending', valid_id='valid_ids/id.jpg', total_price=2500,
+        )
+    
+    def test_snapshot_is_refreshed_after_commit(self):
+        self.assertEqual(get_booking_status_counts()['pending'], 0)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.book()
+            self.assertEqual(get_booking_status_counts()['pending'], 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_booking_status_counts()['pending'], 1)
+
+SMTP_SETTINGS = {
+    'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+    'EMAIL_USE_TLS': False,
+    'EMAIL_USE_SSL': False,
+    'EMAIL_HOST_USER': 'noreply@example.com',
+    'EMAIL_HOST_PASSWORD': '',
+    'EMAIL_TIMEOUT': 5,
+}
+
+class OutboxDeliveryTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sink = SMTPSink().__enter__()
+        self.addCleanup(self.sink.__exit__, None, None, None)
+        settings_override = self.settings(EMAIL_HOST=self.sink.host, EMAIL_PORT=self.sink.port, **SMTP_SETTINGS)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+    
+    def test_batch_is_delivered_over_one_connection(self):
+        enqueue_email("a@example.com", "Hello", "Plain body", "<p>HTML body</p>")
+        enqueue_email("b@example.com", "Hello again", "Second body")
+        
+        result = deliver_outbox()
+        self.assertEqual(result, {'claimed': 2, 'sent': 2, 'retrying': 0, 'failed': 0})
+        self.assertEqual(self.sink.connections, 1)
+        recipients, message = self.sink.messages[0]
+        self.assertEqual(recipients, ["a@example.com"])
+        self.assertEqual(message['Subject'], "Hello")
+        self.assertEqual(message['From'], "noreply@example.com")
+        self.assertEqual(
+            [part.get_content_type() for part in message.walk() if not part.is_multipart()],
+            ['text/plain', 'text/html']
+        )
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailOutbox.SENT, attempts=1).count(), 2)
+        self.assertEqual(deliver_outbox()['claimed'], 0)
+    
+    def test_rejected_message_is_retried_with_backoff(self):
+        rejected = enqueue_email("a@example.com", "Rejected", "Body")
+        enqueue_email("b@example.com", "Accepted", "Body")
+        self.sink.reject_next = 1
+        
+        result = deliver_outbox()
+        self.assertEqual((result['sent'], result['retrying']), (1, 1))
+        rejected.refresh_from_db()
+        self.assertEqual(rejected.status, EmailOutbox.PENDING)
+        self.assertEqual(rejected.attempts, 1)
+        self.assertIn("554", rejected.last_error)
+        self.assertGreater(rejected.next_attempt_at, timezone.now() + timedelta(seconds=RETRY_BASE_DELAY - 5))
+        # Not due yet
+        self.assertEqual(deliver_outbox()['claimed'], 0)
+        
+        EmailOutbox.objects.filter(id=rejected.id).update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_outbox()['sent'], 1)
+        self.assertEqual([message['Subject'] for _, message in self.sink.messages], ["Accepted", "Rejected"])
+    
+    def test_gives_up_after_max_attempts(self):
+        entry = enqueue_email("a@example.com", "Rejected", "Body")
+        self.sink.reject_next = 2
+        for _ in range(2):
+            EmailOutbox.objects.filter(id=entry.id).update(next_attempt_at=timezone.now())
+            result = deliver_outbox(max_attempts=2)
+        self.assertEqual(result['failed'], 1)
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), (EmailOutbox.FAILED, 2))
+    
+    def test_unreachable_server_retries_the_whole_batch(self):
+        enqueue_email("a@example.com", "Hello", "Body")
+        with self.settings(EMAIL_PORT=1):
+            self.assertEqual(deliver_outbox()['retrying'], 1)
+    
+    def test_each_message_is_marked_sent_as_soon_as_it_is_accepted(self):
+        first = enqueue_email("a@example.com", "First", "Body")
+        enqueue_email("b@example.com", "Second", "Body")
+        statuses = []
+        build_message = outbox._build_message
+        
+        def spy(entry, smtp):
+            statuses.append(EmailOutbox.objects.get(id=first.id).status)
+            return build_message(entry, smtp)
+        
+        with mock.patch.object(outbox, '_build_message', side_effect=spy):
+            deliver_outbox()
+        self.assertEqual(statuses, [EmailOutbox.PENDING, EmailOutbox.SENT])
+    
+    def test_retry_delay_is_capped(self):
+        self.assertEqual([retry_delay(attempts) for attempts in (1, 2, 3)], [60, 120, 240])
+        self.assertEqual(retry_delay(20), RETRY_MAX_DELAY)
+
+class BookingStatusEmailTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = CustomUsers.objects.create(username="admin@example.com", email="admin@example.com", role='admin', is_staff=True)
+        self.guest = CustomUsers.objects.create(username="guest@example.com", email="guest@example.com", role='guest')
+        self.room = Rooms.objects.create(room_name="Deluxe", room_type='premium', room_image='rooms/deluxe.jpg', capacity='2', room_price=2500)
+        today = datetime.date.today()
+        self.booking = Bookings.objects.create(
+            user=self.guest, room=self.room, check_in_date=today, check_out_date=today + datetime.timedelta(days=1),
+            status='pending', valid_id='valid_ids/id.jpg', total_price=2500,
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+    
+    def update_status(self, value):
+        return self.api.put(reverse('update_booking_status', args=[self.booking.id]), {'status': value}, format='json')
+    
+    def test_confirmation_is_queued_with_the_status_change(self):
+        response = self.update_status('reserved')
+        self.assertEqual(response.status_code, 200)
+        entry = EmailOutbox.objects.get()
+        self.assertEqual(entry.to_email, "guest@example.com")
+        self.assertIn("Deluxe", entry.text_body)
+    
+    def test_failed_enqueue_rolls_the_status_change_back(self):
+        with mock.patch('admin_dashboard.views.send_booking_confirmation_email', side_effect=RuntimeError("template missing")), \
+                mock.patch('builtins.print'):
+            response = self.update_status('reserved')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json(), {"error": "template missing"})
+        self.booking.refresh_from_db()
+        self.room.refresh_from_db()
+        self.assertEqual(self.booking.status, 'pending')
+        self.assertEqual(self.room.status, 'available')
+    
+    def test_record_payment(self):
+        response = self.api.post(reverse('record_payment', args=[self.booking.id]), {'amount': "2500"}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['transaction_id'], Transactions.objects.get().id)
+
+class EmailTemplateTests(SimpleTestCase):
+    def test_every_template_pair_renders(self):
+        for name, sample in SAMPLE_CONTEXTS.items():
+            with self.subTest(name):
+                context = {key: value.format(n=7) if isinstance(value, str) else value for key, value in sample.items()}
+                text, html = render_email(name, context)
+                self.assertTrue(text.strip())
+                self.assertIn("<html", html.lower())
+    
+    def test_html_is_escaped_and_text_is_not(self):
+        text, html = render_email('emails/booking_confirmation', {
+            **SAMPLE_CONTEXTS['emails/booking_confirmation'], 'guest_name': "Tom & <Jerry>",
+        })
+        self.assertIn("Tom & <Jerry>", text)
+        self.assertIn("Tom &amp; &lt;Jerry&gt;", html)
+    
+    def test_otp_is_in_the_text_part(self):
+        text, _html = render_email('emails/account_verification_otp', {
+            'email': "guest@example.com", 'otp': 123456, 'message': "Verify", 'valid_minutes': 2,
+        })
+        self.assertIn("123456", text)
+    
+    def test_templates_are_compiled_once(self):
+        loader = next(loader for loader in engines['django'].engine.template_loaders if hasattr(loader, 'reset'))
+        loader.reset()
+        with mock.patch.object(Template, 'compile_nodelist', autospec=True, side_effect=Template.compile_nodelist) as compile_nodelist:
+            render_email('emails/booking_rejection', SAMPLE_CONTEXTS['emails/booking_rejection'])
+            compiled = compile_nodelist.call_count
+            render_email('emails/booking_rejection', SAMPLE_CONTEXTS['emails/booking_rejection'])
+        self.assertGreater(compiled, 0)
+        self.assertEqual(compile_nodelist.call_count, compiled)
+    
+    def test_benchmark_command(self):
+        stdout = StringIO()
+        call_command('benchmark_email_render', '--count', '2', '--template', 'emails/post_stay', stdout=stdout)
+        self.assertIn("emails/post_stay", stdout.getvalue())
+
+class MediaUploadTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.staging_dir = os.path.join(media_root, 'staging')
+        settings_override = self.settings(
+            MEDIA_STORAGE='hotel_backend.tests.storage.StandInStorage',
+            MEDIA_ROOT=media_root,
+            MEDIA_STAGING_DIR=self.staging_dir,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(setattr, StandInStorage, 'fail_next', 0)
+        
+        self.guest = CustomUsers.objects.create(username="guest@example.com", email="guest@example.com", role='guest')
+        room = Rooms.objects.create(room_name="Deluxe", room_type='premium', room_image='rooms/deluxe.jpg', capacity='2', room_price=2500)
+        today = datetime.date.today()
+        self.booking = Bookings.objects.create(
+            user=self.guest, room=room, check_in_date=today, check_out_date=today + datetime.timedelta(days=1),
+            status='pending', valid_id=PENDING_UPLOAD, total_price=2500,
+        )
+    
+    def queue(self, content=b"id scan"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return queue_media_upload(
+                self.booking, 'valid_id', SimpleUploadedFile("id.jpg", content), owner=self.guest
+            )
+    
+    def make_due(self, job):
+        MediaUpload.objects.filter(id=job.id).update(next_attempt_at=timezone.now())
+    
+    def valid_id_status(self):
+        self.booking.refresh_from_db()
+        return BookingSerializer(self.booking).data['valid_id_status']
+    
+    def test_upload_is_applied_and_staged_file_removed(self):
+        job = self.queue()
+        self.assertTrue(os.path.exists(job.staged_path))
+        self.assertEqual(self.valid_id_status(), 'pending')
+        
+        self.assertEqual(process_media_uploads(), {'claimed': 1, 'done': 1, 'retrying': 0, 'failed': 0})
+        job.refresh_from_db()
+        self.assertEqual(job.status, MediaUpload.DONE)
+        self.assertFalse(os.path.exists(job.staged_path))
+        self.assertEqual(self.valid_id_status(), 'uploaded')
+        self.assertEqual(self.booking.valid_id, job.result)
+    
+    def test_rolled_back_transaction_stages_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                queue_media_upload(self.booking, 'valid_id', SimpleUploadedFile("id.jpg", b"id scan"))
+                raise RuntimeError("booking failed")
+        self.assertFalse(MediaUpload.objects.exists())
+        self.assertFalse(os.path.exists(self.staging_dir))
+    
+    def test_job_is_not_due_until_its_file_is_staged(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            job = queue_media_upload(self.booking, 'valid_id', SimpleUploadedFile("id.jpg", b"id scan"))
+        self.assertEqual(process_media_uploads()['claimed'], 0)
+        for callback in callbacks:
+            callback()
+        self.assertTrue(os.path.exists(job.staged_path))
+        self.assertEqual(process_media_uploads()['done'], 1)
+    
+    def test_failed_staging_fails_the_job(self):
+        with mock.patch('admin_dashboard.uploads.stage_upload', side_effect=OSError("disk full")), \
+                self.assertLogs('admin_dashboard.uploads', 'ERROR'):
+            job = self.queue()
+        job.refresh_from_db()
+        self.assertEqual(job.status, MediaUpload.FAILED)
+        self.assertIn("disk full", job.last_error)
+        self.assertEqual(self.valid_id_status(), 'failed')
+    
+    def test_failed_upload_is_retried_with_backoff(self):
+        job = self.queue()
+        StandInStorage.fail_next = 1
+        
+        self.assertEqual(process_media_uploads()['retrying'], 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (MediaUpload.PENDING, 1))
+        self.assertIn("ConnectionError", job.last_error)
+        self.assertGreater(job.next_attempt_at, timezone.now() + timedelta(seconds=UPLOAD_RETRY_BASE_DELAY - 5))
+        # Not due yet
+        self.assertEqual(process_media_uploads()['claimed'], 0)
+        
+        self.make_due(job)
+        self.assertEqual(process_media_uploads()['done'], 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (MediaUpload.DONE, 2))
+        self.assertEqual(self.valid_id_status(), 'uploaded')
+    
+    def test_gives_up_after_max_attempts(self):
+        job = self.queue()
+        StandInStorage.fail_next = 2
+        for _ in range(2):
+            self.make_due(job)
+            result = process_media_uploads(max_attempts=2)
+        self.assertEqual(result['failed'], 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (MediaUpload.FAILED, 2))
+        # Kept for inspection
+        self.assertTrue(os.path.exists(job.staged_path))
+        self.assertEqual(self.valid_id_status(), 'failed')
+        
+        admin = CustomUsers.objects.create(username="admin@example.com", email="admin@example.com", role='admin', is_staff=True)
+        api = APIClient()
+        api.force_authenticate(admin)
+        response = api.get(reverse('admin_booking_detail', args=[self.booking.id]))
+        self.assertEqual(response.json()['data']['valid_id_status'], 'failed')
+    
+    def test_booking_lists_read_upload_statuses_in_one_query(self):
+        self.queue()
+        for _ in range(3):
+            booking = self.make_booking(self.guest)
+            queue_media_upload(booking, 'valid_id', SimpleUploadedFile("id.jpg", b"another scan"))
+        admin = CustomUsers.objects.create(username="admin@example.com", email="admin@example.com", role='admin', is_staff=True)
+        api = APIClient()
+        api.force_authenticate(admin)
+        
+        with CaptureQueriesContext(connection) as queries:
+            data = api.get(reverse('admin_bookings')).json()['data']
+        self.assertEqual([booking['valid_id_status'] for booking in data], ['pending'] * 4)
+        self.assertEqual(len([query for query in queries if 'media_uploads' in query['sql']]), 1)
+    
+    def make_booking(self, user):
+        today = datetime.date.today()
+        return Bookings.objects.create(
+            user=user, room=self.booking.room, check_in_date=today, check_out_date=today + datetime.timedelta(days=1),
+            status='pending', valid_id=PENDING_UPLOAD, total_price=2500,
+        )
+    
+    def test_same_owner_and_folder_reuse_the_stored_file(self):
+        first = self.queue()
+        process_media_uploads()
+        first.refresh_from_db()
+        self.assertEqual(MediaAsset.objects.get().value, first.result)
+        
+        booking = self.make_booking(self.guest)
+        upload = SimpleUploadedFile("same-id.jpg", b"id scan")
+        self.assertIsNone(queue_media_upload(booking, 'valid_id', upload, owner=self.guest))
+        booking.refresh_from_db()
+        self.assertEqual(booking.valid_id, first.result)
+        self.assertEqual(MediaUpload.objects.count(), 1)
+    
+    def test_other_owner_folder_or_content_uploads_again(self):
+        self.queue()
+        process_media_uploads()
+        
+        other_guest = CustomUsers.objects.create(username="other@example.com", email="other@example.com", role='guest')
+        cases = [
+            ("another guest", other_guest, None, b"id scan"),
+            ("another folder", self.guest, 'documents', b"id scan"),
+            ("new content", self.guest, None, b"new id scan"),
+        ]
+        for label, owner, folder, content in cases:
+            with self.subTest(label):
+                booking = self.make_booking(owner)
+                job = queue_media_upload(booking, 'valid_id', SimpleUploadedFile("id.jpg", content), folder=folder, owner=owner)
+                self.assertIsNotNone(job)
+                booking.refresh_from_db()
+                self.assertEqual(booking.valid_id, PENDING_UPLOAD)
+        self.assertEqual(MediaUpload.objects.filter(status=MediaUpload.PENDING).count(), 3)
+
+@unittest.skipIf(Image is None, "Pillow is not installed")
+class GenerateImageDerivativesTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_STORAGE='hotel_backend.media.LocalFileSystemStorage', MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.storage = get_media_storage()
+    
+    def test_backfills_missing_sizes(self):
+        # Stored before derivatives were generated
+        room_image = self.storage.save(image_upload("room.jpg"), folder='rooms')
+        Rooms.objects.create(room_name="Deluxe", room_type='premium', room_image=room_image, capacity='2', room_price=2500)
+        Areas.objects.create(area_name="Garden", capacity=100, price_per_hour=1500, area_image='https://example.com/garden.jpg')
+        CustomUsers.objects.create(username="guest@example.com", email="guest@example.com", role='guest')
+        self.assertEqual(self.storage.derivative_url(room_image, 'card'), self.storage.url(room_image))
+        
+        output = StringIO()
+        call_command('generate_image_derivatives', stdout=output)
+        self.assertIn("Generated sizes for 1 images (0 already had them)", output.getvalue())
+        self.assertNotEqual(self.storage.derivative_url(room_image, 'card'), self.storage.url(room_image))
+        
+        output = StringIO()
+        call_command('generate_image_derivatives', stdout=output)
+        self.assertIn("Generated sizes for 0 images (1 already had them)", output.getvalue())
+        
+        output = StringIO()
+        call_command('generate_image_derivatives', '--force', stdout=output)
+        self.assertIn("Generated sizes for 1 images", output.getvalue())
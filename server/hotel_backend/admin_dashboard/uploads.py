@@ -0,0 +1,242 @@
+import logging
+import os
+import uuid
+from datetime import timedelta
+from django.apps import apps
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core import signing
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from hotel_backend.media import content_hash, get_media_storage
+from .models import MediaAsset, MediaUpload
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 8
+RETRY_BASE_DELAY = 30
+RETRY_MAX_DELAY = 3600
+# How long a claimed upload stays hidden from other workers while it runs
+CLAIM_LEASE = 600
+PROVISIONAL_SALT = 'admin_dashboard.uploads.provisional'
+# Long enough to outlast the retries of a pending upload
+PROVISIONAL_MAX_AGE = 24 * 3600
+
+def staging_path(uploaded_file) -> str:
+    """A fresh path in MEDIA_STAGING_DIR for ``uploaded_file``."""
+    extension = os.path.splitext(uploaded_file.name or '')[1].lower()[:10]
+    return os.path.join(settings.MEDIA_STAGING_DIR, f"{uuid.uuid4().hex}{extension}")
+
+def stage_upload(uploaded_file, path) -> str:
+    """
+    Write an uploaded file to ``path`` chunk by chunk and return it.
+    Nothing is sent to the media backend here.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        # Already streamed to disk by the upload handler; move it rather than copy
+        file_move_safe(uploaded_file.temporary_file_path(), path)
+    else:
+        with open(path, 'wb') as staged:
+            for chunk in uploaded_file.chunks():
+                staged.write(chunk)
+    return path
+
+def queue_media_upload(instance, field, uploaded_file, folder=None, owner=None, discard_previous=False) -> MediaUpload | None:
+    """
+    Stage ``uploaded_file`` and queue it for process_media_uploads, which
+    saves it to the media storage and sets ``instance.<field>`` to the result.
+    ``folder`` defaults to the one declared on the MediaField.
+
+    With an ``owner``, content that user already uploaded to the same folder
+    is not uploaded again: the stored value is set right away and None is
+    returned.
+
+    With ``discard_previous``, the file the field held is deleted from the
+    storage once the new one is applied, and older uploads for the same
+    field that have not gone through yet are dropped.
+    """
+    if folder is None:
+        folder = getattr(instance._meta.get_field(field), 'folder', '')
+
+    digest = ''
+    if owner is not None:
+        digest = content_hash(uploaded_file)
+        value = MediaAsset.objects.filter(
+            owner=owner, folder=folder, content_hash=digest
+        ).values_list('value', flat=True).first()
+        if value:
+            setattr(instance, field, value)
+            instance.save(update_fields=[field])
+            return None
+
+    job = MediaUpload.objects.create(
+        staged_path=staging_path(uploaded_file),
+        original_name=(uploaded_file.name or '')[:255],
+        folder=folder,
+        target_model=instance._meta.label,
+        target_id=instance.pk,
+        target_field=field,
+        owner=owner,
+        content_hash=digest,
+        discard_previous=discard_previous,
+        # Not due until _stage_job() has written the file; if that never
+        # runs the job comes due after the lease and fails through retries.
+        next_attempt_at=timezone.now() + timedelta(seconds=CLAIM_LEASE),
+    )
+    # Staged only once the job is committed, so a rolled-back booking or
+    # profile update leaves no orphaned file behind.
+    transaction.on_commit(lambda: _stage_job(job, uploaded_file))
+    return job
+
+def provisional_url(job) -> str:
+    """
+    URL that serves the staged file while ``job`` is pending and redirects
+    to the stored file once it is done, for PROVISIONAL_MAX_AGE seconds;
+    see provisional_upload().
+    """
+    return reverse('pending_media', args=[signing.dumps(job.id, salt=PROVISIONAL_SALT)])
+
+def provisional_upload(token) -> MediaUpload | None:
+    """The upload a provisional_url() token was issued for, or None if the token is invalid or expired."""
+    try:
+        job_id = signing.loads(token, salt=PROVISIONAL_SALT, max_age=PROVISIONAL_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return MediaUpload.objects.filter(id=job_id).first()
+
+def process_media_uploads(batch_size=20, max_attempts=MAX_ATTEMPTS) -> dict:
+    """
+    Upload one batch of due staged files and swap their stored values into
+    the target rows. Failures are retried with exponential backoff until
+    ``max_attempts``, after which the job is marked failed and the staged
+    file is kept for inspection. Replacing uploads overtaken by a newer one
+    for the same field are dropped without being stored.
+    """
+    jobs = _claim_batch(batch_size)
+    result = {'claimed': len(jobs), 'done': 0, 'retrying': 0, 'failed': 0}
+    if not jobs:
+        return result
+
+    storage = get_media_storage()
+    for job in jobs:
+        if _superseded(job):
+            job.status = MediaUpload.FAILED
+            job.last_error = "Superseded by a newer upload"
+            job.save(update_fields=['status', 'last_error'])
+            _discard_staged(job.staged_path)
+            result['failed'] += 1
+            continue
+
+        try:
+            value = storage.save(job.staged_path, folder=job.folder or None)
+            previous = _apply(job, value, storage)
+            if job.owner_id and job.content_hash:
+                _remember_asset(job, value)
+        except Exception as e:
+            result[_record_failure(job, e, max_attempts)] += 1
+            continue
+
+        job.status = MediaUpload.DONE
+        job.result = value
+        job.attempts += 1
+        job.last_error = _discard_previous(job, previous, value, storage)
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'result', 'attempts', 'last_error', 'completed_at'])
+        _discard_staged(job.staged_path)
+        result['done'] += 1
+    return result
+
+def retry_delay(attempts) -> int:
+    """Seconds to wait before the next try after ``attempts`` failed ones."""
+    return min(RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0), RETRY_MAX_DELAY)
+
+def _apply(job, value, storage):
+    """Point the target field at ``value`` and return the value it replaced."""
+    # save() rather than update() so post_save handlers invalidate caches.
+    model = apps.get_model(job.target_model)
+    field = model._meta.get_field(job.target_field)
+    if getattr(field, 'derivatives', False):
+        storage.create_derivatives(value, field.derivative_sizes)
+    instance = model.objects.filter(pk=job.target_id).first()
+    if instance is None:
+        return None
+    previous = getattr(instance, job.target_field)
+    setattr(instance, job.target_field, value)
+    instance.save(update_fields=[job.target_field])
+    return previous
+
+def _discard_previous(job, previous, value, storage) -> str:
+    # The new file is already live, so a failed delete is only noted on the job.
+    if not job.discard_previous or not previous or previous == value:
+        return ''
+    if MediaAsset.objects.filter(value=previous).exists():
+        return ''
+    try:
+        storage.delete(previous)
+    except Exception as e:
+        return f"Previous file not removed: {type(e).__name__}: {e}"[:2000]
+    return ''
+
+def _superseded(job) -> bool:
+    # A newer replacing upload for the same field makes this one obsolete,
+    # e.g. when this one was waiting on a retry.
+    return job.discard_previous and MediaUpload.objects.filter(
+        target_model=job.target_model,
+        target_id=job.target_id,
+        target_field=job.target_field,
+        id__gt=job.id,
+    ).exclude(status=MediaUpload.FAILED).exists()
+
+def _remember_asset(job, value):
+    # get_or_create: an identical upload queued before this one finished may
+    # have registered the content already; the first stored value wins.
+    MediaAsset.objects.get_or_create(
+        owner_id=job.owner_id,
+        folder=job.folder,
+        content_hash=job.content_hash,
+        defaults={'value': value, 'size': os.path.getsize(job.staged_path)},
+    )
+
+def _stage_job(job, uploaded_file):
+    try:
+        stage_upload(uploaded_file, job.staged_path)
+    except Exception as e:
+        logger.exception("Staging upload %s failed", job.id)
+        MediaUpload.objects.filter(id=job.id).update(
+            status=MediaUpload.FAILED, last_error=f"Staging failed: {type(e).__name__}: {e}"[:2000]
+        )
+        return
+    MediaUpload.objects.filter(id=job.id).update(next_attempt_at=timezone.now())
+
+def _claim_batch(batch_size):
+    now = timezone.now()
+    with transaction.atomic():
+        due = MediaUpload.objects.filter(
+            status=MediaUpload.PENDING, next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        jobs = list(due[:batch_size])
+        if jobs:
+            MediaUpload.objects.filter(id__in=[job.id for job in jobs]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_LEASE)
+            )
+    return jobs
+
+def _record_failure(job, error, max_attempts) -> str:
+    job.attempts += 1
+    job.last_error = f"{type(error).__name__}: {error}"[:2000]
+    if job.attempts >= max_attempts:
+        job.status = MediaUpload.FAILED
+    else:
+        job.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+    job.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
+    return 'failed' if job.status == MediaUpload.FAILED else 'retrying'
+
+def _discard_staged(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -7,6 +7,7 @@ urlpatterns = [
     path('stats', views.dashboard_stats, name='dashboard_stats'),
     path('area_reservations', views.area_reservations, name='area_reservations'),
     path('booking_status_counts', views.booking_status_counts, name='booking_status_counts'),
+    path('cache_metrics', views.cache_metrics, name='cache_metrics'),
     
     # CRUD Rooms
     path('rooms', views.fetch_rooms, name='fetch_rooms'),
@@ -1,5 +1,6 @@
 from django.utils import timezone
-from django.db.models import Count, Sum, Q
+from django.db import transaction
+from .dashboard import get_dashboard_stats, get_booking_status_counts, get_area_reservation_counts
 from .email.booking import send_booking_confirmation_email, send_booking_rejection_email
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -9,11 +10,14 @@ from booking.models import Bookings, Reservations, Transactions
 from django.core.exceptions import ValidationError
 from user_roles.serializers import CustomUserSerializer
 from user_roles.models import CustomUsers
+from user_roles.hashing import hash_password
 from property.models import Rooms, Amenities, Areas
 from property.serializers import RoomSerializer, AmenitySerializer, AreaSerializer
+from property.utils import room_data, area_data
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from booking.serializers import BookingSerializer
-import datetime
+from booking.serializers import BookingSerializer, with_valid_id_status
+from hotel_backend.media import media_url, mutable_request_data
+from hotel_backend.cache import metrics as cache_metrics_registry
 
 # Create your views here.
 @api_view(['GET'])
@@ -30,7 +34,7 @@ def get_admin_details(request):
         data = {
             "name": admin_user.first_name + " " + admin_user.last_name,
             "role": admin_user.role,
-            "profile_pic": admin_user.profile_image.url if admin_user.profile_image else None
+            "profile_pic": media_url(admin_user.profile_image)
         }
     
         return Response({
@@ -43,95 +47,7 @@ def get_admin_details(request):
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
     try:
-        now = timezone.now()
-        current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        current_month_end = (current_month_start.replace(month=current_month_start.month % 12 + 1, day=1) - datetime.timedelta(days=1)).replace(hour=23, minute=59, second=59)
-        
-        if current_month_start.month == 12:
-            current_month_end = current_month_start.replace(year=current_month_start.year + 1, month=1, day=1) - datetime.timedelta(days=1)
-        
-        total_rooms = Rooms.objects.count()
-        available_rooms = Rooms.objects.filter(status='available').count()
-        occupied_rooms = Bookings.objects.filter(
-            Q(status='checked_in') & 
-            Q(is_venue_booking=False) & 
-            Q(check_in_date__lte=now.date()) & 
-            Q(check_out_date__gte=now.date())
-        ).count()
-        maintenance_rooms = Rooms.objects.filter(status='maintenance').count()
-        
-        active_bookings = Bookings.objects.filter(
-            Q(status__in=['confirmed', 'reserved', 'checked_in']) &
-            Q(created_at__range=(current_month_start, current_month_end))
-        ).count()
-        
-        pending_bookings = Bookings.objects.filter(
-            Q(status='pending') &
-            Q(created_at__range=(current_month_start, current_month_end))
-        ).count()
-        
-        unpaid_bookings = Bookings.objects.filter(
-            Q(payment_status='unpaid') &
-            Q(created_at__range=(current_month_start, current_month_end))
-        ).count()
-        
-        checked_in_count = Bookings.objects.filter(
-            Q(status='checked_in') &
-            Q(created_at__range=(current_month_start, current_month_end))
-        ).count()
-        
-        total_bookings = Bookings.objects.filter(
-            created_at__range=(current_month_start, current_month_end)
-        ).count()
-        
-        upcoming_reservations = Bookings.objects.filter(
-            Q(is_venue_booking=True) &
-            Q(status__in=['confirmed', 'reserved']) &
-            Q(check_in_date__gte=now.date())
-        ).count()
-        
-        transactions_this_month = Transactions.objects.filter(
-            transaction_date__range=(current_month_start, current_month_end),
-            status='completed'
-        )
-        
-        revenue = transactions_this_month.aggregate(Sum('amount'))['amount__sum'] or 0
-        
-        room_revenue = transactions_this_month.filter(
-            Q(booking__isnull=False) & 
-            Q(booking__is_venue_booking=False)
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-        
-        venue_revenue = transactions_this_month.filter(
-            Q(booking__isnull=False) & 
-            Q(booking__is_venue_booking=True) | 
-            Q(reservation__isnull=False)
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-        
-        formatted_revenue = f"₱{revenue:,.2f}"
-        formatted_room_revenue = f"₱{room_revenue:,.2f}"
-        formatted_venue_revenue = f"₱{venue_revenue:,.2f}"
-        
-        response_data = {
-            'total_rooms': total_rooms,
-            'available_rooms': available_rooms,
-            'occupied_rooms': occupied_rooms,
-            'maintenance_rooms': maintenance_rooms,
-            'active_bookings': active_bookings,
-            'pending_bookings': pending_bookings,
-            'unpaid_bookings': unpaid_bookings,
-            'checked_in_count': checked_in_count,
-            'total_bookings': total_bookings,
-            'upcoming_reservations': upcoming_reservations,
-            'revenue': revenue,
-            'room_revenue': room_revenue,
-            'venue_revenue': venue_revenue,
-            'formatted_revenue': formatted_revenue,
-            'formatted_room_revenue': formatted_room_revenue,
-            'formatted_venue_revenue': formatted_venue_revenue
-        }
-        
-        return Response(response_data, status=status.HTTP_200_OK)
+        return Response(get_dashboard_stats(), status=status.HTTP_200_OK)
     except Exception as e:
         print(f"Error in dashboard_stats: {str(e)}")
         return Response({
@@ -142,7 +58,7 @@ def dashboard_stats(request):
 @permission_classes([IsAuthenticated])
 def area_reservations(request):
     try:
-        data = Reservations.objects.values('area').annotate(count=Count('area'))
+        data = get_area_reservation_counts()
         
         return Response({
             "data": data
@@ -150,6 +66,23 @@ def area_reservations(request):
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def cache_metrics(request):
+    if request.user.role != 'admin':
+        return Response({"error": "Only admin users can access this endpoint"}, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        if request.method == 'DELETE':
+            cache_metrics_registry.reset()
+            return Response({"message": "Cache metrics reset"}, status=status.HTTP_200_OK)
+        
+        return Response({
+            "data": cache_metrics_registry.snapshot()
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 # Rooms
 @api_view(['GET'])
 def fetch_rooms(request):
@@ -188,7 +121,7 @@ def fetch_rooms(request):
 @permission_classes([IsAuthenticated])
 def add_new_room(request):
     try:
-        data = request.data.copy()
+        data = mutable_request_data(request)
         if 'room_price' in data and isinstance(data['room_price'], str):
             try:
                 price_str = data['room_price'].replace('₱', '').replace(',', '')
@@ -215,10 +148,9 @@ def add_new_room(request):
 @permission_classes([IsAuthenticated])
 def show_room_details(request, room_id):
     try:
-        room = Rooms.objects.get(id=room_id)
-        serializer = RoomSerializer(room)
+        data = room_data(room_id)
         return Response({
-            "data": serializer.data
+            "data": data
         }, status=status.HTTP_200_OK)
     except Rooms.DoesNotExist:
         return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -249,7 +181,7 @@ def edit_room(request, room_id):
         
         serializer = RoomSerializer(room, data=filtered_data, partial=True)
     else:
-        data = request.data.copy()
+        data = mutable_request_data(request)
         if 'room_price' in data and isinstance(data['room_price'], str):
             try:
                 price_str = data['room_price'].replace('₱', '').replace(',', '')
@@ -333,7 +265,7 @@ def fetch_areas(request):
 @permission_classes([IsAuthenticated])
 def add_new_area(request):
     try:
-        data = request.data.copy()
+        data = mutable_request_data(request)
         if 'price_per_hour' in data and isinstance(data['price_per_hour'], str):
             try:
                 price_str = data['price_per_hour'].replace('₱', '').replace(',', '')
@@ -359,10 +291,9 @@ def add_new_area(request):
 @permission_classes([IsAuthenticated])
 def show_area_details(request, area_id):
     try:
-        area = Areas.objects.get(id=area_id)
-        serializer = AreaSerializer(area)
+        data = area_data(area_id)
         return Response({
-            "data": serializer.data
+            "data": data
         }, status=status.HTTP_200_OK)
     except Areas.DoesNotExist:
         return Response({
@@ -397,7 +328,7 @@ def edit_area(request, area_id):
         
         serializer = AreaSerializer(area, data=filtered_data, partial=True)
     else:
-        data = request.data.copy()
+        data = mutable_request_data(request)
         if 'price_per_hour' in data and isinstance(data['price_per_hour'], str):
             try:
                 price_str = data['price_per_hour'].replace('₱', '').replace(',', '')
@@ -567,7 +498,7 @@ def delete_amenity(request, pk):
 @permission_classes([IsAuthenticated])
 def admin_bookings(request):
     try:
-        bookings = Bookings.objects.all().order_by('-created_at')
+        bookings = with_valid_id_status(Bookings.objects.all().order_by('-created_at'))
         
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 9)
@@ -631,80 +562,84 @@ def update_booking_status(request, booking_id):
         return Response({"error": f"Invalid status value. Valid values are: {', '.join(valid_statuses)}"}, 
                             status=status.HTTP_400_BAD_REQUEST)
         
-    # Check if set_available is explicitly set to False to prevent maintenance
-    set_available = request.data.get('set_available')
-    prevent_maintenance = set_available is False
+    with transaction.atomic():
+        # Check if set_available is explicitly set to False to prevent maintenance
+        set_available = request.data.get('set_available')
+        prevent_maintenance = set_available is False
 
-    # Only set to maintenance if not prevented and status requires it
-    if status_value in ['reserved', 'confirmed', 'checked_in'] and not prevent_maintenance:
-        if booking.is_venue_booking and booking.area:
-            area = booking.area
-            area.status = 'maintenance'
-            area.save()
-        elif booking.room:
-            room = booking.room
-            room.status = 'maintenance'
-            room.save()
-    elif status_value not in ['reserved', 'confirmed', 'checked_in']:
-        if booking.is_venue_booking and booking.area:
-            area = booking.area
-            area.status = 'available'
-            area.save()
-        elif booking.room:
-            room = booking.room
-            room.status = 'available'
-            room.save()
+        # Only set to maintenance if not prevented and status requires it
+        if status_value in ['reserved', 'confirmed', 'checked_in'] and not prevent_maintenance:
+            if booking.is_venue_booking and booking.area:
+                area = booking.area
+                area.status = 'maintenance'
+                area.save()
+            elif booking.room:
+                room = booking.room
+                room.status = 'maintenance'
+                room.save()
+        elif status_value not in ['reserved', 'confirmed', 'checked_in']:
+            if booking.is_venue_booking and booking.area:
+                area = booking.area
+                area.status = 'available'
+                area.save()
+            elif booking.room:
+                room = booking.room
+                room.status = 'available'
+                room.save()
     
-    # If set_available is True, always set property to available
-    if set_available:
-        if booking.is_venue_booking and booking.area:
-            area = booking.area
-            area.status = 'available'
-            area.save()
-        elif booking.room:
-            room = booking.room
-            room.status = 'available'
-            room.save()
+        # If set_available is True, always set property to available
+        if set_available:
+            if booking.is_venue_booking and booking.area:
+                area = booking.area
+                area.status = 'available'
+                area.save()
+            elif booking.room:
+                room = booking.room
+                room.status = 'available'
+                room.save()
     
-    if status_value == 'rejected':
-        booking.cancellation_date = timezone.now()
-        booking.cancellation_reason = request.data.get('reason', 'Rejected by admin/staff')
+        if status_value == 'rejected':
+            booking.cancellation_date = timezone.now()
+            booking.cancellation_reason = request.data.get('reason', 'Rejected by admin/staff')
     
-    previous_status = booking.status
-    booking.status = status_value
-    booking.save()
+        previous_status = booking.status
+        booking.status = status_value
+        booking.save()
     
-    serializer = BookingSerializer(booking)
+        serializer = BookingSerializer(booking)
     
-    if status_value == 'reserved' and previous_status != 'reserved':
-        try:
-            user_email = booking.user.email
-            send_booking_confirmation_email(user_email, serializer.data)
-        except Exception as e:
-            print(f"Error while sending booking confirmation email: {str(e)}")
-            return Response({
-                "error": str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Queued in the same transaction, delivered by send_outbox_emails. If
+        # queueing fails, nothing is saved: the guest is never left without
+        # the email about their booking's new status.
+        if status_value == 'reserved' and previous_status != 'reserved':
+            try:
+                send_booking_confirmation_email(booking.user.email, serializer.data)
+            except Exception as e:
+                print(f"Error while queueing booking confirmation email: {str(e)}")
+                transaction.set_rollback(True)
+                return Response({
+                    "error": str(e)
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    elif status_value == 'rejected' and previous_status != 'rejected':
-        try:
-            user_email = booking.user.email
-            send_booking_rejection_email(user_email, serializer.data)
-        except Exception as e:
-            print(f"Error while sending booking rejection email: {str(e)}")
-            return Response({
-                "error": str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
-    if booking.status not in ['reserved', 'checked_in'] and (status_value == 'cancelled' or status_value == 'rejected'):
-        if booking.is_venue_booking and booking.area:
-            area = booking.area
-            area.status = 'available'
-            area.save()
-        elif booking.room:
-            room = booking.room
-            room.status = 'available'
-            room.save()
+        elif status_value == 'rejected' and previous_status != 'rejected':
+            try:
+                send_booking_rejection_email(booking.user.email, serializer.data)
+            except Exception as e:
+                print(f"Error while queueing booking rejection email: {str(e)}")
+                transaction.set_rollback(True)
+                return Response({
+                    "error": str(e)
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        if booking.status not in ['reserved', 'checked_in'] and (status_value == 'cancelled' or status_value == 'rejected'):
+            if booking.is_venue_booking and booking.area:
+                area = booking.area
+                area.status = 'available'
+                area.save()
+            elif booking.room:
+                room = booking.room
+                room.status = 'available'
+                room.save()
     
     return Response({
         "message": f"Booking status updated to {status_value}",
@@ -732,7 +667,7 @@ def record_payment(request, booking_id):
         booking.payment_status = 'paid'
         booking.save()
         
-        transaction = Transactions.objects.create(
+        payment = Transactions.objects.create(
             booking=booking,
             user=booking.user,
             transaction_type=transaction_type,
@@ -742,7 +677,7 @@ def record_payment(request, booking_id):
         
         return Response({
             "message": "Payment recorded successfully",
-            "transaction_id": transaction.id,
+            "transaction_id": payment.id,
             "booking_id": booking.id,
             "amount": amount
         }, status=status.HTTP_201_CREATED)
@@ -756,23 +691,7 @@ def record_payment(request, booking_id):
 @permission_classes([IsAuthenticated])
 def booking_status_counts(request):
     try:
-        pending_count = Bookings.objects.filter(status='pending').count()
-        reserved_count = Bookings.objects.filter(status='reserved').count()
-        checked_in_count = Bookings.objects.filter(status='checked_in').count()
-        checked_out_count = Bookings.objects.filter(status='checked_out').count()
-        cancelled_count = Bookings.objects.filter(status='cancelled').count()
-        no_show_count = Bookings.objects.filter(status='no_show').count() 
-        rejected_count = Bookings.objects.filter(status='rejected').count()
-        
-        return Response({
-            "pending": pending_count,
-            "reserved": reserved_count,
-            "checked_in": checked_in_count,
-            "checked_out": checked_out_count,
-            "cancelled": cancelled_count,
-            "no_show": no_show_count,
-            "rejected": rejected_count
-        }, status=status.HTTP_200_OK)
+        return Response(get_booking_status_counts(), status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -829,13 +748,15 @@ def manage_user(request, user_id):
                         'error': 'Email already exists'
                     }, status=status.HTTP_400_BAD_REQUEST)
                 
-                user = CustomUsers.objects.create_user(
-                    email=email,
-                    password=password,
+                user = CustomUsers(
+                    username=email,
+                    email=CustomUsers.objects.normalize_email(email),
                     first_name=first_name,
                     last_name=last_name,
                     role=role
                 )
+                user.password = hash_password(password)
+                user.save()
                 
                 return Response({
                     'message': 'User created successfully',
@@ -875,7 +796,7 @@ def manage_user(request, user_id):
                 
                 password = data.get('password')
                 if password:
-                    user.set_password(password)
+                    user.password = hash_password(password)
                 
                 try:
                     user.save()
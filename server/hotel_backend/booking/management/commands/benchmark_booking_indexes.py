@@ -0,0 +1,287 @@
+import datetime
+import random
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from property.models import Rooms, Areas
+from user_roles.models import CustomUsers
+from booking.models import Bookings, Transactions
+
+ACTIVE_STATUSES = ['reserved', 'confirmed', 'checked_in']
+STATUS_WEIGHTS = {
+    'pending': 10, 'reserved': 10, 'confirmed': 5, 'checked_in': 3, 'checked_out': 55,
+    'cancelled': 10, 'rejected': 5, 'missed_reservation': 2,
+}
+
+# The hot booking and transaction filters, each with the index it should use.
+# ``run`` is how the view evaluates the queryset.
+HOT_QUERIES = [
+    {
+        'label': 'room calendar (fetch_room_bookings)',
+        'index': 'bookings_room_status_idx',
+        'run': 'list',
+        'queryset': lambda s: Bookings.objects.filter(
+            Q(room_id=s['room_id']) & Q(status__in=Bookings.CALENDAR_STATUSES),
+            check_in_date__lte=s['range_end'], check_out_date__gte=s['range_start'],
+        ),
+    },
+    {
+        'label': 'active room bookings (edit/delete_room)',
+        'index': 'bookings_room_status_idx',
+        'run': 'exists',
+        'queryset': lambda s: Bookings.objects.filter(room_id=s['room_id'], status__in=ACTIVE_STATUSES),
+    },
+    {
+        'label': 'active venue bookings (delete_area)',
+        'index': 'bookings_area_status_idx',
+        'run': 'exists',
+        'queryset': lambda s: Bookings.objects.filter(area_id=s['area_id'], status__in=ACTIVE_STATUSES),
+    },
+    {
+        'label': 'guest bookings, newest first',
+        'index': 'bookings_user_created_idx',
+        'run': 'list',
+        'queryset': lambda s: Bookings.objects.filter(user_id=s['user_id']).order_by('-created_at'),
+    },
+    {
+        'label': 'pending bookings this month',
+        'index': 'bookings_status_created_idx',
+        'run': 'count',
+        'queryset': lambda s: Bookings.objects.filter(
+            status='pending', created_at__range=(s['month_start'], s['month_end'])
+        ),
+    },
+    {
+        'label': 'active bookings this month',
+        'index': 'bookings_status_created_idx',
+        'run': 'count',
+        'queryset': lambda s: Bookings.objects.filter(
+            status__in=ACTIVE_STATUSES, created_at__range=(s['month_start'], s['month_end'])
+        ),
+    },
+    {
+        'label': 'occupied rooms today',
+        'index': 'bookings_venue_status_idx',
+        'run': 'count',
+        'queryset': lambda s: Bookings.objects.filter(
+            status='checked_in', is_venue_booking=False,
+            check_in_date__lte=s['today'], check_out_date__gte=s['today'],
+        ),
+    },
+    {
+        'label': 'upcoming venue reservations',
+        'index': 'bookings_venue_status_idx',
+        'run': 'count',
+        'queryset': lambda s: Bookings.objects.filter(
+            is_venue_booking=True, status__in=['confirmed', 'reserved'], check_in_date__gte=s['today'],
+        ),
+    },
+    {
+        'label': 'completed transactions this month',
+        'index': 'transactions_status_date_idx',
+        'run': 'list',
+        'queryset': lambda s: Transactions.objects.filter(
+            transaction_date__range=(s['month_start'], s['month_end']), status='completed'
+        ).values_list('amount', flat=True),
+    },
+]
+
+class Command(BaseCommand):
+    help = (
+        "Check with EXPLAIN that the hot booking and transaction queries use their indexes, and "
+        "time them with and without those indexes on a synthetic dataset in a throwaway test database. "
+        "With --check, only EXPLAIN against the configured database; nothing is written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Only run the EXPLAIN check on the current database")
+        parser.add_argument('--bookings', type=int, default=100_000, help="Synthetic bookings to generate")
+        parser.add_argument('--repeat', type=int, default=20, help="Runs per query when timing")
+        parser.add_argument('--seed', type=int, default=1, help="Random seed for the synthetic data")
+
+    def handle(self, *args, **options):
+        if options['check']:
+            sample = self.sample()
+            if sample is None:
+                raise CommandError("No bookings to sample query parameters from")
+            self.explain(sample)
+            return
+
+        old_name = connection.settings_dict['NAME']
+        self.stdout.write("Creating a throwaway test database...")
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            random.seed(options['seed'])
+            started = time.perf_counter()
+            self.populate(options['bookings'])
+            self.analyze()
+            self.stdout.write(
+                f"Generated {options['bookings']:,} bookings and their transactions "
+                f"in {time.perf_counter() - started:.1f} s"
+            )
+
+            sample = self.sample()
+            indexes = self.hot_indexes()
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.remove_index(model, index)
+            self.analyze()
+            before = {query['label']: self.time(query, sample, options['repeat']) for query in HOT_QUERIES}
+
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.add_index(model, index)
+            self.analyze()
+            after = {query['label']: self.time(query, sample, options['repeat']) for query in HOT_QUERIES}
+
+            self.stdout.write(f"\n{'query':<42} {'no index':>10} {'indexed':>10}")
+            for query in HOT_QUERIES:
+                label = query['label']
+                self.stdout.write(
+                    f"{label:<42} {before[label]:>8.2f}ms {after[label]:>8.2f}ms  "
+                    f"x{before[label] / after[label] if after[label] else 0:.1f}"
+                )
+            self.stdout.write("")
+            self.explain(sample)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def explain(self, sample):
+        """
+        Fail unless every hot query's plan uses one of the hot indexes. The
+        planner may prefer another of them than the one a query was written
+        for (e.g. a skip-scan); that is reported but accepted.
+        """
+        names = [index.name for _model, index in self.hot_indexes()]
+        missing = []
+        for query in HOT_QUERIES:
+            plan = query['queryset'](sample).explain()
+            used = [name for name in names if name in plan]
+            if query['index'] in used:
+                self.stdout.write(self.style.SUCCESS(f"{query['label']:<42} uses {query['index']}"))
+            elif used:
+                self.stdout.write(self.style.WARNING(
+                    f"{query['label']:<42} uses {used[0]} rather than {query['index']}"
+                ))
+            else:
+                missing.append(query['label'])
+                self.stdout.write(self.style.ERROR(f"{query['label']:<42} uses none of the hot indexes"))
+                self.stdout.write(f"    {plan}")
+        if missing:
+            raise CommandError(f"{len(missing)} hot queries do not use an index")
+
+    def time(self, query, sample, repeat):
+        queryset = query['queryset'](sample)
+        run = {
+            'list': lambda: list(queryset.all()),
+            'count': lambda: queryset.count(),
+            'exists': lambda: queryset.exists(),
+        }[query['run']]
+        run()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            run()
+        return (time.perf_counter() - started) * 1000 / repeat
+
+    def hot_indexes(self):
+        names = {query['index'] for query in HOT_QUERIES}
+        return [
+            (model, index)
+            for model in (Bookings, Transactions)
+            for index in model._meta.indexes
+            if index.name in names
+        ]
+
+    def sample(self):
+        """Query parameters drawn from the data: a busy room, venue and guest, and this month."""
+        booking = Bookings.objects.filter(room__isnull=False).order_by('id').first()
+        if booking is None:
+            return None
+        venue = Bookings.objects.filter(area__isnull=False).values_list('area_id', flat=True).first()
+        today = timezone.localdate()
+        month_start = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return {
+            'room_id': booking.room_id,
+            'area_id': venue,
+            'user_id': booking.user_id,
+            'today': today,
+            'range_start': today - datetime.timedelta(days=30),
+            'range_end': today + datetime.timedelta(days=30),
+            'month_start': month_start,
+            'month_end': month_start + datetime.timedelta(days=31),
+        }
+
+    def populate(self, count, batch_size=5000):
+        guests = CustomUsers.objects.bulk_create([
+            CustomUsers(username=f"guest{i}@example.com", email=f"guest{i}@example.com", role='guest')
+            for i in range(max(count // 20, 1))
+        ])
+        rooms = Rooms.objects.bulk_create([
+            Rooms(room_name=f"Room {i}", room_type='premium', room_image='rooms/sample.jpg', capacity='2', room_price=2500)
+            for i in range(50)
+        ])
+        areas = Areas.objects.bulk_create([
+            Areas(area_name=f"Venue {i}", capacity=100, price_per_hour=1500)
+            for i in range(10)
+        ])
+        if not guests[0].pk:
+            # Backends that do not return ids from bulk_create
+            guests = list(CustomUsers.objects.order_by('id'))
+            rooms = list(Rooms.objects.order_by('id'))
+            areas = list(Areas.objects.order_by('id'))
+
+        statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        today = timezone.localdate()
+        first_day = today - datetime.timedelta(days=730)
+        for offset in range(0, count, batch_size):
+            bookings = []
+            for _ in range(min(batch_size, count - offset)):
+                is_venue = random.random() < 0.15
+                check_in = first_day + datetime.timedelta(days=random.randrange(730 + 180))
+                bookings.append(Bookings(
+                    user=random.choice(guests),
+                    room=None if is_venue else random.choice(rooms),
+                    area=random.choice(areas) if is_venue else None,
+                    check_in_date=check_in,
+                    check_out_date=check_in + datetime.timedelta(days=0 if is_venue else random.randint(1, 7)),
+                    status=random.choices(statuses, weights)[0],
+                    valid_id='valid_ids/sample.jpg',
+                    total_price=Decimal(random.randrange(1500, 30000)),
+                    is_venue_booking=is_venue,
+                ))
+            Bookings.objects.bulk_create(bookings)
+
+        Transactions.objects.bulk_create(
+            [
+                Transactions(
+                    booking_id=booking_id, user_id=user_id, transaction_type='booking', amount=amount,
+                    status=random.choices(['completed', 'pending', 'failed'], [80, 15, 5])[0],
+                )
+                for booking_id, user_id, amount in Bookings.objects.values_list('id', 'user_id', 'total_price').iterator()
+            ],
+            batch_size=batch_size,
+        )
+
+        # created_at / transaction_date are set to now on insert; spread them
+        # over the two years so ids and dates grow together, as in production.
+        for model, field in ((Bookings, 'created_at'), (Transactions, 'transaction_date')):
+            ids = model.objects.order_by('id').values_list('id', flat=True)
+            low, high = ids.first(), ids.last()
+            per_day = max((high - low + 1) // 730, 1)
+            start = timezone.now() - datetime.timedelta(days=730)
+            for day, first_id in enumerate(range(low, high + 1, per_day)):
+                model.objects.filter(id__gte=first_id, id__lt=first_id + per_day).update(
+                    **{field: start + datetime.timedelta(days=day, seconds=random.randrange(86400))}
+                )
+
+    def analyze(self):
+        """Refresh planner statistics so EXPLAIN reflects the current data."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute(f"ANALYZE TABLE {Bookings._meta.db_table}, {Transactions._meta.db_table}")
+                cursor.fetchall()
+            elif connection.vendor in ('sqlite', 'postgresql'):
+                cursor.execute("ANALYZE")
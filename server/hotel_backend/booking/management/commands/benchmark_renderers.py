@@ -0,0 +1,113 @@
+import datetime
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from hotel_backend.renderers import ORJSONRenderer
+
+class Command(BaseCommand):
+    help = "Compare JSONRenderer and ORJSONRenderer render times on representative payloads"
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=500, help="Rows per payload")
+        parser.add_argument('--iterations', type=int, default=50, help="Renders per renderer and payload")
+    
+    def handle(self, *args, **options):
+        items = options['items']
+        iterations = options['iterations']
+        payloads = {
+            'bookings': {"data": [self.booking(i) for i in range(items)]},
+            'availability': {
+                "rooms": [self.room(i) for i in range(items)],
+                "areas": [self.area(i) for i in range(items)],
+            },
+            'reviews': {"data": [self.review(i) for i in range(items)]},
+        }
+        
+        for name, payload in payloads.items():
+            baseline = JSONRenderer().render(payload)
+            fast = ORJSONRenderer().render(payload)
+            if baseline != fast:
+                self.stderr.write(self.style.ERROR(f"{name}: ORJSONRenderer output differs from JSONRenderer"))
+            
+            baseline_ms = self.time_render(JSONRenderer(), payload, iterations)
+            fast_ms = self.time_render(ORJSONRenderer(), payload, iterations)
+            self.stdout.write(
+                f"{name:<13} {len(baseline) / 1024:>8.1f} KiB  "
+                f"JSONRenderer {baseline_ms:>8.2f} ms  "
+                f"ORJSONRenderer {fast_ms:>8.2f} ms  "
+                f"x{baseline_ms / fast_ms if fast_ms else 0:.1f}"
+            )
+    
+    def time_render(self, renderer, payload, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            renderer.render(payload)
+        return (time.perf_counter() - start) * 1000 / iterations
+    
+    def booking(self, i):
+        now = timezone.now()
+        return {
+            'id': i,
+            'user': {'id': i, 'first_name': "Juan", 'last_name': "Dela Cruz", 'email': f"guest{i}@example.com", 'profile_image': None},
+            'room': i % 20,
+            'room_details': self.room(i),
+            'area': None,
+            'area_details': None,
+            'check_in_date': datetime.date(2025, 5, 1) + datetime.timedelta(days=i % 30),
+            'check_out_date': datetime.date(2025, 5, 3) + datetime.timedelta(days=i % 30),
+            'status': 'reserved',
+            'valid_id': f"https://res.cloudinary.com/demo/image/upload/v1/valid_id_{i}.jpg",
+            'special_request': "Late check-in ✓",
+            'cancellation_date': None,
+            'cancellation_reason': None,
+            'is_venue_booking': False,
+            'total_price': Decimal('12500.00') + i,
+            'start_time': datetime.time(14, 0),
+            'created_at': now,
+            'updated_at': now,
+        }
+    
+    def room(self, i):
+        return {
+            'id': i,
+            'room_name': f"Deluxe Room {i}",
+            'room_type': 'premium',
+            'status': 'available',
+            'room_price': f"₱{12500 + i:,.2f}",
+            'room_image': f"https://res.cloudinary.com/demo/image/upload/v1/room_{i}.jpg",
+            'description': "Spacious room with a view of the bay.",
+            'capacity': '2 adults',
+            'amenities': [{'id': a, 'description': f"Amenity {a}"} for a in range(5)],
+        }
+    
+    def area(self, i):
+        return {
+            'id': i,
+            'area_name': f"Function Hall {i}",
+            'description': "Venue for events.",
+            'area_image': None,
+            'status': 'available',
+            'capacity': 150,
+            'price_per_hour': Decimal('3500.00'),
+        }
+    
+    def review(self, i):
+        return {
+            'id': i,
+            'booking': i,
+            'user': i,
+            'review_text': "Great stay, friendly staff.",
+            'rating': i % 5 + 1,
+            'created_at': timezone.now(),
+            'user_name': "Juan Dela Cruz",
+            'booking_details': {
+                'type': 'room',
+                'name': f"Deluxe Room {i}",
+                'check_in_date': datetime.date(2025, 5, 1),
+                'check_out_date': datetime.date(2025, 5, 3),
+            },
+            'user_profile_image': None,
+            'formatted_date': "May 03, 2025",
+        }
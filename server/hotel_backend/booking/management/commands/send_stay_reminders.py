@@ -0,0 +1,143 @@
+import datetime
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from admin_dashboard.email.outbox import deliver_outbox, outbox_entry, render_email
+from admin_dashboard.models import EmailOutbox
+from booking.models import Bookings, NotificationLog
+
+NOTIFICATIONS = {
+    NotificationLog.ARRIVAL_REMINDER: {
+        'date_field': 'check_in_date',
+        'day_offset': 1,
+        'statuses': ['reserved', 'confirmed'],
+        'subject': "Azurea Hotel - Your Stay Starts Tomorrow",
+        'template': "emails/arrival_reminder",
+    },
+    NotificationLog.POST_STAY: {
+        'date_field': 'check_out_date',
+        'day_offset': -1,
+        'statuses': ['checked_out'],
+        'subject': "Azurea Hotel - Thank You for Staying With Us",
+        'template': "emails/post_stay",
+    },
+}
+
+class Command(BaseCommand):
+    help = (
+        "Email tomorrow's arrivals a reminder and yesterday's departures a thank-you note. "
+        "Safe to re-run: a booking gets each notification at most once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Run as if today were this date (YYYY-MM-DD)")
+        parser.add_argument('--kind', choices=sorted(NOTIFICATIONS), help="Only send this notification")
+        parser.add_argument('--batch-size', type=int, default=500, help="Emails queued per transaction and sent per SMTP connection")
+        parser.add_argument(
+            '--queue-only', action='store_true',
+            help="Only queue the emails and leave delivery to send_outbox_emails"
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Count recipients without queueing anything")
+
+    def handle(self, *args, **options):
+        if options['date']:
+            try:
+                today = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError("--date must be in YYYY-MM-DD format")
+        else:
+            today = timezone.localdate()
+
+        started = time.perf_counter()
+        kinds = [options['kind']] if options['kind'] else list(NOTIFICATIONS)
+        queued = 0
+        for kind in kinds:
+            queued += self.queue(kind, today, options)
+
+        sent = 0
+        if queued and not options['queue_only'] and not options['dry_run']:
+            while True:
+                result = deliver_outbox(options['batch_size'])
+                if not result['claimed']:
+                    break
+                sent += result['sent']
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Queued {queued} emails, delivered {sent} in {(time.perf_counter() - started) * 1000:.0f} ms"
+        ))
+
+    def queue(self, kind, today, options):
+        spec = NOTIFICATIONS[kind]
+        day = today + datetime.timedelta(days=spec['day_offset'])
+
+        # One query on the (date, status) index; bookings that already have
+        # this notification are excluded in the same statement.
+        bookings = list(
+            Bookings.objects.filter(**{spec['date_field']: day, 'status__in': spec['statuses']})
+            .exclude(notifications__kind=kind)
+            .select_related('user', 'room', 'area')
+            .only(
+                'id', 'check_in_date', 'check_out_date', 'status', 'is_venue_booking',
+                'user__email', 'user__first_name', 'user__last_name',
+                'room__room_name', 'area__area_name',
+            )
+            .order_by('id')
+        )
+        if options['dry_run']:
+            self.stdout.write(f"  {kind} for {day}: {len(bookings)} to notify")
+            return 0
+
+        queued = 0
+        for offset in range(0, len(bookings), options['batch_size']):
+            batch = bookings[offset:offset + options['batch_size']]
+            entries = []
+            for booking in batch:
+                text_body, html_body = render_email(spec['template'], stay_email_context(booking))
+                entries.append(outbox_entry(booking.user.email, spec['subject'], text_body, html_body))
+            queued += self.save_batch(kind, batch, entries)
+
+        self.stdout.write(f"  {kind} for {day}: {queued} queued")
+        return queued
+
+    def save_batch(self, kind, batch, entries):
+        """
+        Write the sent markers and the outbox rows together. If another run
+        marked some of these bookings first, fall back to one booking at a
+        time so only the duplicates are dropped.
+        """
+        try:
+            with transaction.atomic():
+                NotificationLog.objects.bulk_create([NotificationLog(booking=booking, kind=kind) for booking in batch])
+                EmailOutbox.objects.bulk_create(entries)
+            return len(batch)
+        except IntegrityError:
+            pass
+
+        saved = 0
+        for booking, entry in zip(batch, entries):
+            try:
+                with transaction.atomic():
+                    NotificationLog.objects.create(booking=booking, kind=kind)
+                    entry.save()
+            except IntegrityError:
+                continue
+            saved += 1
+        return saved
+
+def stay_email_context(booking) -> dict:
+    if booking.is_venue_booking and booking.area:
+        property_type, property_name = "Venue", booking.area.area_name
+    else:
+        property_type, property_name = "Room", booking.room.room_name if booking.room else ''
+
+    guest_name = f"{booking.user.first_name} {booking.user.last_name}".strip() or "Guest"
+    return {
+        'guest_name': guest_name,
+        'booking_id': booking.id,
+        'property_type': property_type,
+        'property_name': property_name,
+        'check_in': booking.check_in_date.isoformat(),
+        'check_out': booking.check_out_date.isoformat(),
+        'status_label': booking.get_status_display().upper(),
+    }
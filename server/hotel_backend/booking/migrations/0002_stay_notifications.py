@@ -0,0 +1,45 @@
+# Generated by Django 5.1.8 on 2026-10-19 00:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0001_initial'),
+        ('property', '0002_rating_aggregates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('arrival_reminder', 'Arrival Reminder'), ('post_stay', 'Post-stay')], max_length=30)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'notification_logs',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['check_in_date', 'status'], name='bookings_check_in_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['check_out_date', 'status'], name='bookings_check_out_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='booking',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='booking.bookings'),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationlog',
+            constraint=models.UniqueConstraint(fields=('booking', 'kind'), name='unique_booking_notification'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.8 on 2026-10-19 00:14
+
+import hotel_backend.media
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0002_stay_notifications'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bookings',
+            name='valid_id',
+            field=hotel_backend.media.MediaField(folder='valid_ids', verbose_name='valid_id'),
+        ),
+        migrations.AlterField(
+            model_name='reservations',
+            name='valid_id',
+            field=hotel_backend.media.MediaField(blank=True, folder='valid_ids', null=True, verbose_name='valid_id'),
+        ),
+    ]
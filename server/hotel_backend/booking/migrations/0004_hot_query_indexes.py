@@ -0,0 +1,57 @@
+# Generated by Django 5.1.8 on 2026-10-19 00:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0003_media_field'),
+        ('property', '0004_image_derivatives'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['room', 'status', 'check_in_date', 'check_out_date'], name='bookings_room_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['area', 'status', 'check_in_date', 'check_out_date'], name='bookings_area_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['user', 'created_at'], name='bookings_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['status', 'created_at'], name='bookings_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['is_venue_booking', 'status', 'check_in_date'], name='bookings_venue_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transactions',
+            index=models.Index(fields=['status', 'transaction_date'], name='transactions_status_date_idx'),
+        ),
+        # The composite indexes above cover the foreign keys' own indexes.
+        migrations.AlterField(
+            model_name='bookings',
+            name='area',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='area_bookings', to='property.areas'),
+        ),
+        migrations.AlterField(
+            model_name='bookings',
+            name='room',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='property.rooms'),
+        ),
+        migrations.AlterField(
+            model_name='bookings',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -2,7 +2,7 @@ from django.db import models
 from property.models import Rooms, Areas
 from user_roles.models import CustomUsers
 from django.utils.timezone import now
-from cloudinary.models import CloudinaryField # type: ignore
+from hotel_backend.media import MediaField
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from property.models import Rooms, Areas
@@ -21,9 +21,18 @@ class Bookings(models.Model):
         ('rejected', 'Rejected'),
         ('missed_reservation', 'Missed Reservation'),
     ]
-    user = models.ForeignKey(CustomUsers, on_delete=models.CASCADE, related_name='bookings')
-    room = models.ForeignKey(Rooms, on_delete=models.CASCADE, related_name='bookings', null=True, blank=True)
-    area = models.ForeignKey(Areas, on_delete=models.CASCADE, related_name='area_bookings', null=True, blank=True)
+    # Statuses that hold a room or venue on the calendar: everything but
+    # cancelled and rejected, including 'no_show', which update_booking_status
+    # stores although it is not among the choices. Listed rather than
+    # excluded so lookups can seek on the (room/area, status, ...) indexes.
+    CALENDAR_STATUSES = [
+        'pending', 'reserved', 'confirmed', 'checked_in', 'checked_out', 'missed_reservation', 'no_show',
+    ]
+    # No single-column indexes: the (user, ...), (room, ...) and (area, ...)
+    # indexes below lead with these columns and serve their lookups too.
+    user = models.ForeignKey(CustomUsers, on_delete=models.CASCADE, related_name='bookings', db_index=False)
+    room = models.ForeignKey(Rooms, on_delete=models.CASCADE, related_name='bookings', null=True, blank=True, db_index=False)
+    area = models.ForeignKey(Areas, on_delete=models.CASCADE, related_name='area_bookings', null=True, blank=True, db_index=False)
     check_in_date = models.DateField(null=False, blank=False)
     check_out_date = models.DateField(null=False, blank=False)
     status = models.CharField(
@@ -31,7 +40,7 @@ class Bookings(models.Model):
         choices=BOOKING_STATUS_CHOICES,
         default='pending',
     )
-    valid_id = CloudinaryField('valid_id', null=False, blank=False)
+    valid_id = MediaField('valid_id', folder='valid_ids', null=False, blank=False)
     special_request = models.TextField(null=True, blank=True)
     cancellation_date = models.DateTimeField(null=True, blank=True)
     cancellation_reason = models.TextField(null=True, blank=True)
@@ -45,6 +54,19 @@ class Bookings(models.Model):
     
     class Meta:
         db_table = 'bookings'
+        indexes = [
+            # Day-based lookups such as tomorrow's arrivals and yesterday's departures
+            models.Index(fields=['check_in_date', 'status'], name='bookings_check_in_idx'),
+            models.Index(fields=['check_out_date', 'status'], name='bookings_check_out_idx'),
+            # Calendars and active-booking checks for one room or venue
+            models.Index(fields=['room', 'status', 'check_in_date', 'check_out_date'], name='bookings_room_status_idx'),
+            models.Index(fields=['area', 'status', 'check_in_date', 'check_out_date'], name='bookings_area_status_idx'),
+            # A guest's bookings, newest first
+            models.Index(fields=['user', 'created_at'], name='bookings_user_created_idx'),
+            # Dashboard counts by status for a period
+            models.Index(fields=['status', 'created_at'], name='bookings_status_created_idx'),
+            models.Index(fields=['is_venue_booking', 'status', 'check_in_date'], name='bookings_venue_status_idx'),
+        ]
     
     def __str__(self):
         if self.is_venue_booking and self.area:
@@ -83,7 +105,7 @@ class Reservations(models.Model):
     start_time = models.DateTimeField(default=now)
     end_time = models.DateTimeField(default=now)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
-    valid_id = CloudinaryField('valid_id', null=True, blank=True)
+    valid_id = MediaField('valid_id', folder='valid_ids', null=True, blank=True)
     special_request = models.TextField(null=True, blank=True)
     status = models.CharField(
         max_length=20,
@@ -124,6 +146,10 @@ class Transactions(models.Model):
     
     class Meta:
         db_table = 'transactions'
+        indexes = [
+            # Completed transactions in a date range; equality column first
+            models.Index(fields=['status', 'transaction_date'], name='transactions_status_date_idx'),
+        ]
 
 class Reviews(models.Model):
     booking = models.ForeignKey(Bookings, on_delete=models.CASCADE, related_name='reviews')
@@ -140,3 +166,21 @@ class Reviews(models.Model):
             )
         ]
         db_table = 'reviews'
+
+class NotificationLog(models.Model):
+    ARRIVAL_REMINDER = 'arrival_reminder'
+    POST_STAY = 'post_stay'
+    KIND_CHOICES = [
+        (ARRIVAL_REMINDER, 'Arrival Reminder'),
+        (POST_STAY, 'Post-stay'),
+    ]
+    booking = models.ForeignKey(Bookings, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            # A booking gets each kind of notification at most once
+            models.UniqueConstraint(fields=['booking', 'kind'], name='unique_booking_notification'),
+        ]
+        db_table = 'notification_logs'
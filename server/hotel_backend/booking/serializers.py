@@ -2,8 +2,12 @@ from rest_framework import serializers
 from .models import Bookings, Reservations, Transactions, Reviews
 from user_roles.models import CustomUsers
 from property.models import Rooms, Amenities, Areas
-import cloudinary # type: ignore
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
 from property.serializers import AreaSerializer
+from hotel_backend.media import media_url, absolute_media_url, MediaDerivativesField, PENDING_UPLOAD
+from admin_dashboard.models import MediaUpload
+from admin_dashboard.uploads import queue_media_upload
 
 class AmenitySerializer(serializers.ModelSerializer):
     class Meta:
@@ -13,6 +17,7 @@ class AmenitySerializer(serializers.ModelSerializer):
 class RoomSerializer(serializers.ModelSerializer):
     amenities = AmenitySerializer(many=True, read_only=True)
     room_image = serializers.SerializerMethodField()
+    room_image_sizes = MediaDerivativesField(source='room_image')
     
     class Meta:
         model = Rooms
@@ -23,18 +28,14 @@ class RoomSerializer(serializers.ModelSerializer):
             'status',
             'room_price',
             'room_image',
+            'room_image_sizes',
             'description',
             'capacity',
             'amenities'
         ]
     
     def get_room_image(self, obj):
-        if obj.room_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.room_image.url)
-            return obj.room_image.url
-        return None
+        return absolute_media_url(self.context.get('request'), obj.room_image)
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -42,11 +43,23 @@ class RoomSerializer(serializers.ModelSerializer):
             representation['room_price'] = f"₱{float(instance.room_price):,.2f}"
         return representation
 
+def _valid_id_uploads():
+    return MediaUpload.objects.filter(target_model=Bookings._meta.label, target_field='valid_id').order_by('-id')
+
+def with_valid_id_status(bookings):
+    """
+    Annotate ``bookings`` with the status of each one's latest valid ID
+    upload, so BookingSerializer doesn't query MediaUpload per booking.
+    """
+    latest = _valid_id_uploads().filter(target_id=OuterRef('pk')).values('status')[:1]
+    return bookings.annotate(valid_id_upload_status=Subquery(latest))
+
 class BookingSerializer(serializers.ModelSerializer):
     room_details = RoomSerializer(source='room', read_only=True)
     area_details = AreaSerializer(source='area', read_only=True)
     user = serializers.SerializerMethodField()
     valid_id = serializers.SerializerMethodField()
+    valid_id_status = serializers.SerializerMethodField()
     
     class Meta:
         model = Bookings
@@ -61,6 +74,7 @@ class BookingSerializer(serializers.ModelSerializer):
             'check_out_date',
             'status',
             'valid_id',
+            'valid_id_status',
             'special_request',
             'cancellation_date',
             'cancellation_reason',
@@ -77,17 +91,26 @@ class BookingSerializer(serializers.ModelSerializer):
                 'first_name': obj.user.first_name,
                 'last_name': obj.user.last_name,
                 'email': obj.user.email,
-                'profile_image': obj.user.profile_image.url if obj.user.profile_image else None,
+                'profile_image': media_url(obj.user.profile_image),
             }
         return None
         
     def get_valid_id(self, obj):
+        return media_url(obj.valid_id)
+
+    def get_valid_id_status(self, obj):
+        """
+        'uploaded', or while the booking has no valid ID yet the status of
+        its queued upload: 'pending', 'failed' (the guest has to send it
+        again) or 'missing'.
+        """
         if obj.valid_id:
-            if hasattr(obj.valid_id, 'url'):
-                return obj.valid_id.url
-            else:
-                return obj.valid_id
-        return None
+            return 'uploaded'
+        if hasattr(obj, 'valid_id_upload_status'):
+            upload_status = obj.valid_id_upload_status
+        else:
+            upload_status = _valid_id_uploads().filter(target_id=obj.pk).values_list('status', flat=True).first()
+        return upload_status or 'missing'
     
     def to_representation(self, instance):
         representation = super().to_representation(instance)        
@@ -143,16 +166,7 @@ class BookingRequestSerializer(serializers.Serializer):
         print(f"Is venue booking: {is_venue_booking}")
         
         valid_id = validated_data.get('validId')
-        if valid_id:
-            print(f"Uploading valid ID file: {valid_id.name}, size: {valid_id.size}")
-            try:
-                upload_result = cloudinary.uploader.upload(valid_id)
-                valid_id_url = upload_result['secure_url']
-                print(f"Valid ID uploaded successfully: {valid_id_url}")
-            except Exception as e:
-                print(f"Error uploading to Cloudinary: {str(e)}")
-                raise serializers.ValidationError(f"Error uploading ID: {str(e)}")
-        else:
+        if not valid_id:
             print("Valid ID is missing")
             raise serializers.ValidationError("Valid ID is required")
 
@@ -169,19 +183,21 @@ class BookingRequestSerializer(serializers.Serializer):
                 
                 total_price = validated_data.get('totalPrice', 0)
                 
-                # Create a booking record for venue
-                booking = Bookings.objects.create(
-                    user=user,
-                    area=area,
-                    room=None,
-                    check_in_date=validated_data['checkIn'],
-                    check_out_date=validated_data['checkOut'],
-                    status=validated_data.get('status', 'pending'),
-                    valid_id=valid_id_url,
-                    special_request=validated_data.get('specialRequests', ''),
-                    total_price=total_price,
-                    is_venue_booking=True
-                )
+                with transaction.atomic():
+                    # Create a booking record for venue
+                    booking = Bookings.objects.create(
+                        user=user,
+                        area=area,
+                        room=None,
+                        check_in_date=validated_data['checkIn'],
+                        check_out_date=validated_data['checkOut'],
+                        status=validated_data.get('status', 'pending'),
+                        valid_id=PENDING_UPLOAD,
+                        special_request=validated_data.get('specialRequests', ''),
+                        total_price=total_price,
+                        is_venue_booking=True
+                    )
+                    queue_media_upload(booking, 'valid_id', valid_id, owner=user)
                 
                 print(f"Venue booking created successfully: ID {booking.id}")
                 return booking
@@ -195,28 +211,21 @@ class BookingRequestSerializer(serializers.Serializer):
                 room = Rooms.objects.get(id=validated_data['roomId'])
                 print(f"Found room: {room.room_name} (ID: {room.id})")
                 
-                booking = Bookings.objects.create(
-                    user=user,
-                    room=room,
-                    area=None,
-                    check_in_date=validated_data['checkIn'],
-                    check_out_date=validated_data['checkOut'],
-                    status=validated_data.get('status', 'pending'),
-                    valid_id=valid_id_url,
-                    special_request=validated_data.get('specialRequests', ''),
-                    is_venue_booking=False,
-                    total_price=validated_data.get('totalPrice')
-                )
-                print(f"Booking created successfully: ID {booking.id}, Valid ID: {booking.valid_id}")
-                
-                # Verify the URL is accessible
-                if booking.valid_id:
-                    try:
-                        # Handle both CloudinaryField objects and string URLs
-                        url = booking.valid_id if isinstance(booking.valid_id, str) else booking.valid_id.url
-                        print(f"Valid ID URL is accessible: {url}")
-                    except Exception as e:
-                        print(f"Error accessing valid_id URL: {str(e)}")
+                with transaction.atomic():
+                    booking = Bookings.objects.create(
+                        user=user,
+                        room=room,
+                        area=None,
+                        check_in_date=validated_data['checkIn'],
+                        check_out_date=validated_data['checkOut'],
+                        status=validated_data.get('status', 'pending'),
+                        valid_id=PENDING_UPLOAD,
+                        special_request=validated_data.get('specialRequests', ''),
+                        is_venue_booking=False,
+                        total_price=validated_data.get('totalPrice')
+                    )
+                    queue_media_upload(booking, 'valid_id', valid_id, owner=user)
+                print(f"Booking created successfully: ID {booking.id}")
                 
                 return booking
             except Rooms.DoesNotExist:
@@ -276,11 +285,8 @@ class ReviewSerializer(serializers.ModelSerializer):
         return "Anonymous"
     
     def get_user_profile_image(self, obj):
-        if obj.user and obj.user.profile_image:
-            request = self.context.get('request')
-            if request and hasattr(obj.user.profile_image, 'url'):
-                return request.build_absolute_uri(obj.user.profile_image.url)
-            return obj.user.profile_image.url if hasattr(obj.user.profile_image, 'url') else None
+        if obj.user:
+            return absolute_media_url(self.context.get('request'), obj.user.profile_image)
         return None
     
     def get_formatted_date(self, obj):
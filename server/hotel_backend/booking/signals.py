@@ -0,0 +1,46 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from property.utils import apply_rating_change
+from user_roles.cache import bump_user_data_version
+from .models import Bookings, Reviews
+
+@receiver(post_save, sender=Bookings)
+@receiver(post_delete, sender=Bookings)
+@receiver(post_save, sender=Reviews)
+@receiver(post_delete, sender=Reviews)
+def user_data_changed(sender, instance, **kwargs):
+    bump_user_data_version(instance.user_id)
+
+@receiver(pre_save, sender=Reviews)
+def remember_stored_rating(sender, instance, raw=False, **kwargs):
+    instance._stored_rating = None
+    if instance.pk and not raw:
+        instance._stored_rating = Reviews.objects.filter(pk=instance.pk).values_list('booking_id', 'rating').first()
+
+@receiver(post_save, sender=Reviews)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    # Keeps the rating counters on rooms and areas in step with every
+    # review write, whichever code path makes it.
+    if raw:
+        return
+    stored = None if created else getattr(instance, '_stored_rating', None)
+    if stored is None:
+        apply_rating_change(instance.booking, new_rating=instance.rating)
+        return
+    
+    old_booking_id, old_rating = stored
+    if old_booking_id != instance.booking_id:
+        old_booking = Bookings.objects.filter(id=old_booking_id).first()
+        if old_booking is not None:
+            apply_rating_change(old_booking, old_rating=old_rating)
+        apply_rating_change(instance.booking, new_rating=instance.rating)
+    elif old_rating != instance.rating:
+        apply_rating_change(instance.booking, old_rating=old_rating, new_rating=instance.rating)
+
+@receiver(post_delete, sender=Reviews)
+def review_deleted(sender, instance, **kwargs):
+    # Also runs for reviews removed by a cascade from their booking or room;
+    # the booking row is deleted after its reviews, so it can still be read.
+    booking = Bookings.objects.filter(id=instance.booking_id).first()
+    if booking is not None:
+        apply_rating_change(booking, old_rating=instance.rating)
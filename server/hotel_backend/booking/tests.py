@@ -1,3 +1,257 @@
-from django.test import TestCase
+import datetime
+from io import StringIO
+from django.core import mail
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from hotel_backend.pagination import MAX_PAGE_SIZE
+from hotel_backend.tests import CacheTestCase
+from admin_dashboard.email.outbox import outbox_entry
+from admin_dashboard.models import EmailOutbox
+from property.models import Rooms, Areas
+from user_roles.models import CustomUsers
+from .management.commands.benchmark_booking_indexes import HOT_QUERIES
+from .management.commands.send_stay_reminders import Command as StayRemindersCommand
+from .models import Bookings, NotificationLog, Reviews, Transactions
+from .utils import booking_room_data
 
-# Create your tests here.
+def make_guest(email="guest@example.com", **fields):
+    return CustomUsers.objects.create(username=email, email=email, role='guest', **fields)
+
+def make_room(name="Deluxe", **fields):
+    fields = {'room_type': 'premium', 'room_image': 'rooms/room.jpg', 'capacity': '2', 'room_price': 2500, **fields}
+    return Rooms.objects.create(room_name=name, **fields)
+
+def make_booking(user, room=None, area=None, status='checked_out', **fields):
+    today = datetime.date.today()
+    fields = {
+        'check_in_date': today, 'check_out_date': today + datetime.timedelta(days=1),
+        'valid_id': 'valid_ids/id.jpg', 'total_price': 2500, **fields,
+    }
+    return Bookings.objects.create(
+        user=user, room=room, area=area, is_venue_booking=area is not None, status=status, **fields
+    )
+
+class ReviewListTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.guest = make_guest()
+        self.room = make_room()
+        self.area = Areas.objects.create(area_name="Garden", capacity=100, price_per_hour=1500)
+        for rating in (5, 5, 4, 2, 1):
+            Reviews.objects.create(booking=make_booking(self.guest, room=self.room), user=self.guest, rating=rating)
+        # Reviews of another room and of a venue must not leak into the room's list
+        Reviews.objects.create(booking=make_booking(self.guest, room=make_room("Suite")), user=self.guest, rating=3)
+        Reviews.objects.create(booking=make_booking(self.guest, area=self.area), user=self.guest, rating=4)
+    
+    def test_room_reviews_summary_and_pagination(self):
+        response = self.client.get(reverse('room_reviews', args=[self.room.id]), {'page': 2, 'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['summary'], {
+            'average': 3.4, 'count': 5,
+            'histogram': {'1': 1, '2': 1, '3': 0, '4': 1, '5': 2},
+        })
+        self.assertEqual(len(body['data']), 2)
+        self.assertEqual(body['pagination']['total_pages'], 3)
+        self.assertEqual(body['pagination']['current_page'], 2)
+    
+    def test_out_of_range_page_returns_last_page(self):
+        response = self.client.get(reverse('room_reviews', args=[self.room.id]), {'page': 9, 'page_size': 2})
+        body = response.json()
+        self.assertEqual(body['pagination']['current_page'], 3)
+        self.assertEqual(len(body['data']), 1)
+    
+    def test_page_size_is_parsed_and_clamped(self):
+        url = reverse('room_reviews', args=[self.room.id])
+        for params, expected_size in (
+            ({'page_size': 0}, 1),
+            ({'page_size': 'ten'}, 10),
+            ({'page_size': 10_000}, MAX_PAGE_SIZE),
+            ({'page': 'x', 'page_size': 2}, 2),
+        ):
+            with self.subTest(params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
+                pagination = response.json()['pagination']
+                self.assertEqual(pagination['page_size'], expected_size)
+                self.assertEqual(pagination['current_page'], 1)
+    
+    def test_area_reviews_only_count_venue_bookings(self):
+        response = self.client.get(reverse('area_reviews', args=[self.area.id]))
+        body = response.json()
+        self.assertEqual(body['summary']['count'], 1)
+        self.assertEqual(body['summary']['average'], 4)
+    
+    def test_unknown_room(self):
+        response = self.client.get(reverse('room_reviews', args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+class UserDataCacheTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.guest = make_guest()
+        self.client.force_authenticate(self.guest)
+        self.booking = make_booking(self.guest, room=make_room())
+    
+    def review_count(self):
+        return len(self.client.get(reverse('user_reviews')).json()['data'])
+    
+    def test_payload_is_cached_until_the_user_writes(self):
+        self.assertEqual(self.review_count(), 0)
+        # A write by the user invalidates their payloads once it commits
+        with self.captureOnCommitCallbacks(execute=True):
+            Reviews.objects.create(booking=self.booking, user=self.guest, rating=5)
+        self.assertEqual(self.review_count(), 1)
+        
+        with self.assertNumQueries(0):
+            self.client.get(reverse('user_reviews'))
+    
+    def test_other_users_writes_do_not_invalidate(self):
+        self.review_count()
+        other = make_guest("other@example.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            make_booking(other, room=self.booking.room)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.review_count(), 0)
+    
+    def test_booking_pages_are_keyed_on_the_resolved_page(self):
+        for name in ('user_bookings', 'get_guest_bookings'):
+            with self.subTest(name):
+                first = self.client.get(reverse(name)).json()
+                self.assertEqual(first['pagination'], {
+                    'total_pages': 1, 'current_page': 1, 'total_items': 1, 'page_size': 5,
+                })
+                # Spellings of page 1, junk and pages past the end all reuse its entry
+                with self.assertNumQueries(0):
+                    for params in ({'page': '01'}, {'page': 1, 'page_size': '5 '}, {'page': 'abc'}, {'page': 99}):
+                        self.assertEqual(self.client.get(reverse(name), params).json(), first)
+    
+    def test_uncommitted_write_does_not_bump(self):
+        self.review_count()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Reviews.objects.create(booking=self.booking, user=self.guest, rating=5)
+            self.assertEqual(self.review_count(), 0)
+        self.assertTrue(callbacks)
+
+@override_settings(MEDIA_URL='/media/', ALLOWED_HOSTS=['one.example.com', 'two.example.com'])
+class AvailabilityCacheTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.room = make_room(room_image='rooms/deluxe.jpg')
+    
+    def test_image_urls_are_absolute_for_each_requester(self):
+        params = {'arrival': '2030-01-01', 'departure': '2030-01-03'}
+        first = self.client.get(reverse('availability'), params, HTTP_HOST='one.example.com').json()
+        second = self.client.get(reverse('availability'), params, HTTP_HOST='two.example.com').json()
+        
+        self.assertEqual(first['rooms'][0]['room_image'], 'http://one.example.com/media/rooms/deluxe.jpg')
+        self.assertEqual(second['rooms'][0]['room_image'], 'http://two.example.com/media/rooms/deluxe.jpg')
+        self.assertEqual(second['rooms'][0]['room_image_sizes']['card'], 'http://two.example.com/media/rooms/deluxe.jpg')
+    
+    def test_cached_payload_keeps_relative_urls(self):
+        self.client.get(reverse('room_detail', args=[self.room.id]), HTTP_HOST='one.example.com')
+        self.assertEqual(booking_room_data(self.room.id)['room_image'], '/media/rooms/deluxe.jpg')
+        response = self.client.get(reverse('room_detail', args=[self.room.id]), HTTP_HOST='two.example.com')
+        self.assertEqual(response.json()['data']['room_image'], 'http://two.example.com/media/rooms/deluxe.jpg')
+
+class StayRemindersTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = datetime.date(2030, 5, 10)
+        tomorrow, yesterday = self.today + datetime.timedelta(days=1), self.today - datetime.timedelta(days=1)
+        self.guest = make_guest(first_name="Ana")
+        room = make_room()
+        self.arriving = [
+            make_booking(self.guest, room=room, status=status, check_in_date=tomorrow, check_out_date=tomorrow + datetime.timedelta(days=2))
+            for status in ('reserved', 'confirmed')
+        ]
+        make_booking(self.guest, room=room, status='pending', check_in_date=tomorrow, check_out_date=tomorrow + datetime.timedelta(days=2))
+        self.departed = make_booking(self.guest, room=room, status='checked_out', check_in_date=yesterday - datetime.timedelta(days=2), check_out_date=yesterday)
+    
+    def run_command(self, *args):
+        stdout = StringIO()
+        call_command('send_stay_reminders', '--date', self.today.isoformat(), *args, stdout=stdout)
+        return stdout.getvalue()
+    
+    def test_queues_and_delivers_each_notification_once(self):
+        self.run_command()
+        self.assertEqual(sorted(message.subject for message in mail.outbox), [
+            "Azurea Hotel - Thank You for Staying With Us",
+            "Azurea Hotel - Your Stay Starts Tomorrow",
+            "Azurea Hotel - Your Stay Starts Tomorrow",
+        ])
+        self.assertIn("Ana", mail.outbox[0].body)
+        self.assertEqual(NotificationLog.objects.count(), 3)
+        
+        self.run_command()
+        self.assertEqual(len(mail.outbox), 3)
+    
+    def test_queue_only_and_dry_run(self):
+        self.assertIn("arrival_reminder for 2030-05-11: 2 to notify", self.run_command('--dry-run'))
+        self.assertEqual(EmailOutbox.objects.count(), 0)
+        
+        self.run_command('--queue-only', '--kind', NotificationLog.POST_STAY)
+        self.assertEqual(list(EmailOutbox.objects.values_list('status', flat=True)), [EmailOutbox.PENDING])
+        self.assertEqual(len(mail.outbox), 0)
+    
+    def test_overlapping_run_only_drops_the_duplicates(self):
+        # Another run marked the first booking after this one selected it
+        NotificationLog.objects.create(booking=self.arriving[0], kind=NotificationLog.ARRIVAL_REMINDER)
+        entries = [outbox_entry(self.guest.email, "Reminder", "Body") for _ in self.arriving]
+        saved = StayRemindersCommand().save_batch(NotificationLog.ARRIVAL_REMINDER, self.arriving, entries)
+        self.assertEqual(saved, 1)
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+        self.assertEqual(NotificationLog.objects.filter(kind=NotificationLog.ARRIVAL_REMINDER).count(), 2)
+    
+    def test_invalid_date(self):
+        with self.assertRaises(CommandError):
+            call_command('send_stay_reminders', '--date', '10/05/2030', stdout=StringIO())
+
+class BookingIndexTests(CacheTestCase):
+    def indexes(self, model):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        return {
+            name: constraint['columns'] for name, constraint in constraints.items()
+            if constraint['index'] and not constraint['primary_key'] and not constraint['unique']
+        }
+    
+    def test_foreign_keys_rely_on_the_composite_indexes(self):
+        indexes = self.indexes(Bookings)
+        for column in ('user_id', 'room_id', 'area_id'):
+            with self.subTest(column):
+                self.assertNotIn([column], indexes.values())
+                self.assertTrue(any(columns[0] == column and len(columns) > 1 for columns in indexes.values()))
+        hot = {query['index'] for query in HOT_QUERIES}
+        self.assertLessEqual(hot, set(indexes) | set(self.indexes(Transactions)))
+    
+    def test_hot_queries_use_their_indexes(self):
+        guest = make_guest()
+        room = make_room()
+        area = Areas.objects.create(area_name="Garden", capacity=100, price_per_hour=1500)
+        make_booking(guest, room=room)
+        make_booking(guest, area=area)
+        output = StringIO()
+        call_command('benchmark_booking_indexes', '--check', stdout=output)
+        self.assertNotIn("uses none", output.getvalue())
+
+class CalendarTests(CacheTestCase):
+    def test_only_cancelled_and_rejected_bookings_free_the_dates(self):
+        guest = make_guest()
+        room = make_room()
+        area = Areas.objects.create(area_name="Garden", capacity=100, price_per_hour=1500)
+        for value in ('no_show', 'checked_in', 'cancelled', 'rejected'):
+            make_booking(guest, room=room, status=value)
+            make_booking(guest, area=area, status=value)
+        
+        for name, target in (('room_bookings', room), ('area_bookings', area)):
+            with self.subTest(name):
+                response = self.client.get(reverse(name, args=[target.id]))
+                self.assertEqual(
+                    sorted(booking['status'] for booking in response.json()['data']), ['checked_in', 'no_show']
+                )
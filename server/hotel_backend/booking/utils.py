@@ -0,0 +1,61 @@
+from django.db.models import Avg, Count, Q
+from property.models import Rooms
+from property.catalog import cached_catalog
+from hotel_backend.cache import cache_namespace
+from hotel_backend.media import absolute_url
+from .serializers import RoomSerializer
+
+availability_cache = cache_namespace('availability')
+
+def rating_summary(reviews) -> dict:
+    """Average, count and 1-5 histogram for a reviews queryset in one aggregate query."""
+    histogram_aggregates = {
+        f"rating_{rating}": Count('id', filter=Q(rating=rating))
+        for rating in range(1, 6)
+    }
+    result = reviews.aggregate(
+        average=Avg('rating'),
+        count=Count('id'),
+        **histogram_aggregates
+    )
+    
+    return {
+        "average": round(float(result['average']), 2) if result['average'] is not None else 0,
+        "count": result['count'],
+        "histogram": {
+            str(rating): result[f"rating_{rating}"] for rating in range(1, 6)
+        }
+    }
+
+def booking_available_rooms_data(request=None):
+    rooms = cached_catalog(
+        ('rooms', 'amenities'), 'booking_available_rooms',
+        lambda: RoomSerializer(
+            Rooms.objects.filter(status='available').prefetch_related('amenities'), many=True
+        ).data,
+        store=availability_cache
+    )
+    return [with_absolute_image_urls(request, room) for room in rooms]
+
+def booking_room_data(room_id, request=None):
+    room = cached_catalog(
+        ('rooms', 'amenities'), f"booking_room:{room_id}",
+        lambda: RoomSerializer(Rooms.objects.get(id=room_id)).data,
+        store=availability_cache
+    )
+    return with_absolute_image_urls(request, room)
+
+def with_absolute_image_urls(request, room) -> dict:
+    """
+    Copy of a cached room payload with its image URLs made absolute against
+    ``request``. The cache is shared by every requester, so it is built
+    without a request and keeps URLs relative.
+    """
+    if request is None:
+        return room
+    sizes = room.get('room_image_sizes')
+    return {
+        **room,
+        'room_image': absolute_url(request, room.get('room_image')),
+        'room_image_sizes': sizes and {size: absolute_url(request, url) for size, url in sizes.items()},
+    }
@@ -4,18 +4,24 @@ from rest_framework.response import Response
 from .models import Reservations, Bookings, Reviews
 from property.models import Rooms, Areas
 from property.serializers import AreaSerializer
+from property.utils import available_areas_data, area_data
+from hotel_backend.media import media_url
+from hotel_backend.pagination import page_params, get_page, last_page
+from user_roles.cache import cached_user_payload
 from .serializers import (
     ReservationSerializer, 
     BookingSerializer, 
     BookingRequestSerializer,
     RoomSerializer,
-    ReviewSerializer
+    ReviewSerializer,
+    with_valid_id_status,
 )
 from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
 from datetime import datetime
+from django.db import transaction
 from django.db.models import Q
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from .utils import rating_summary, booking_available_rooms_data, booking_room_data
 
 # Create your views here.
 @api_view(['GET'])
@@ -41,15 +47,12 @@ def fetch_availability(request):
             'error': "Departure date should be greater than arrival date"
         }, status=status.HTTP_400_BAD_REQUEST)
         
-    rooms = Rooms.objects.filter(status='available')
-    areas = Areas.objects.filter(status='available')
-    
-    room_serializer = RoomSerializer(rooms, many=True, context={'request': request})
-    area_serializer = AreaSerializer(areas, many=True)
+    rooms = booking_available_rooms_data(request)
+    areas = available_areas_data()
     
     return Response({
-        "rooms": room_serializer.data,
-        "areas": area_serializer.data
+        "rooms": rooms,
+        "areas": areas
     }, status=status.HTTP_200_OK)
 
 @api_view(['GET', 'POST'])
@@ -57,7 +60,9 @@ def fetch_availability(request):
 def bookings_list(request):
     try:
         if request.method == 'GET':
-            bookings = Bookings.objects.all().order_by('-created_at').select_related('user', 'room', 'area')
+            bookings = with_valid_id_status(
+                Bookings.objects.all().order_by('-created_at').select_related('user', 'room', 'area')
+            )
             serializer = BookingSerializer(bookings, many=True)
             
             return Response({
@@ -102,10 +107,7 @@ def booking_detail(request, booking_id):
             data['room'] = room_serializer.data
         
         if booking.valid_id:
-            if hasattr(booking.valid_id, 'url'):
-                data['valid_id'] = booking.valid_id.url
-            else:
-                data['valid_id'] = booking.valid_id
+            data['valid_id'] = media_url(booking.valid_id)
             
         return Response({
             "data": data
@@ -197,10 +199,9 @@ def area_reservations(request):
 @api_view(['GET'])
 def area_detail(request, area_id):
     try:
-        area = Areas.objects.get(id=area_id)
-        serializer = AreaSerializer(area)
+        data = area_data(area_id)
         return Response({
-            "data": serializer.data
+            "data": data
         }, status=status.HTTP_200_OK)
     except Areas.DoesNotExist:
         return Response({"error": "Area not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -210,10 +211,9 @@ def area_detail(request, area_id):
 @api_view(['GET'])
 def room_detail(request, room_id):
     try:
-        room = Rooms.objects.get(id=room_id)
-        serializer = RoomSerializer(room, context={'request': request})
+        data = booking_room_data(room_id, request)
         return Response({
-            "data": serializer.data
+            "data": data
         }, status=status.HTTP_200_OK)
     except Rooms.DoesNotExist:
         return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -225,49 +225,48 @@ def room_detail(request, room_id):
 def user_bookings(request):
     try:
         user = request.user
-        bookings = Bookings.objects.filter(user=user).order_by('-created_at')
+        page, page_size = page_params(request, 5)
+        # Resolve the page before keying the cache, so only real pages get
+        # an entry and pages past the end share the last one's.
+        total = cached_user_payload(user.id, "bookings_count", Bookings.objects.filter(user=user).count)
+        page = min(page, last_page(total, page_size))
         
-        page = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 5)
-        
-        paginator = Paginator(bookings, page_size)
-        
-        try:
-            paginated_bookings = paginator.page(page)
-        except PageNotAnInteger:
-            paginated_bookings = paginator.page(1)
-        except EmptyPage:
-            paginated_bookings = paginator.page(paginator.num_pages)
+        def build_payload():
+            bookings = with_valid_id_status(Bookings.objects.filter(user=user)).order_by('-created_at').select_related(
+                'user', 'room', 'area'
+            ).prefetch_related('room__amenities')
             
-        booking_data = []
-        for booking in paginated_bookings:
-            booking_serializer = BookingSerializer(booking)
-            data = booking_serializer.data
-            
-            if booking.is_venue_booking and booking.area:
-                area_serializer = AreaSerializer(booking.area)
-                data['area'] = area_serializer.data
-            elif booking.room:
-                room_serializer = RoomSerializer(booking.room)
-                data['room'] = room_serializer.data
-            
-            if booking.valid_id:
-                if hasattr(booking.valid_id, 'url'):
-                    data['valid_id'] = booking.valid_id.url
-                else:
-                    data['valid_id'] = booking.valid_id
+            paginated_bookings = get_page(bookings, page, page_size, count=total)
+                
+            booking_data = []
+            for booking in paginated_bookings:
+                booking_serializer = BookingSerializer(booking)
+                data = booking_serializer.data
+                
+                if booking.is_venue_booking and booking.area:
+                    area_serializer = AreaSerializer(booking.area)
+                    data['area'] = area_serializer.data
+                elif booking.room:
+                    room_serializer = RoomSerializer(booking.room)
+                    data['room'] = room_serializer.data
+                
+                if booking.valid_id:
+                    data['valid_id'] = media_url(booking.valid_id)
+                
+                booking_data.append(data)
             
-            booking_data.append(data)
-        
-        return Response({
-            "data": booking_data,
-            "pagination": {
-                "total_pages": paginator.num_pages,
-                "current_page": int(page),
-                "total_items": paginator.count,
-                "page_size": int(page_size)
+            return {
+                "data": booking_data,
+                "pagination": {
+                    "total_pages": paginated_bookings.paginator.num_pages,
+                    "current_page": page,
+                    "total_items": total,
+                    "page_size": page_size
+                }
             }
-        }, status=status.HTTP_200_OK)
+        
+        payload = cached_user_payload(user.id, f"user_bookings:{page}:{page_size}", build_payload)
+        return Response(payload, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -321,7 +320,7 @@ def fetch_room_bookings(request, room_id):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         
-        query = Q(room_id=room_id) & ~Q(status__in=['cancelled', 'rejected'])
+        query = Q(room_id=room_id) & Q(status__in=Bookings.CALENDAR_STATUSES)
 
         if start_date and end_date:
             try:
@@ -357,7 +356,7 @@ def fetch_area_bookings(request, area_id):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         
-        query = Q(area_id=area_id) & ~Q(status__in=['cancelled', 'rejected'])
+        query = Q(area_id=area_id) & Q(status__in=Bookings.CALENDAR_STATUSES)
         
         if start_date and end_date:
             try:
@@ -422,7 +421,8 @@ def booking_reviews(request, booking_id):
         
         serializer = ReviewSerializer(data=data, context={'request': request})
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
             return Response({
                 "message": "Review submitted successfully",
                 "data": serializer.data
@@ -433,9 +433,15 @@ def booking_reviews(request, booking_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_reviews(request):
-    reviews = Reviews.objects.filter(user=request.user).order_by('-created_at')
-    serializer = ReviewSerializer(reviews, many=True)
-    return Response({"data": serializer.data}, status=status.HTTP_200_OK)
+    def build_payload():
+        reviews = Reviews.objects.filter(user=request.user).order_by('-created_at').select_related(
+            'user', 'booking__room', 'booking__area'
+        )
+        serializer = ReviewSerializer(reviews, many=True)
+        return {"data": serializer.data}
+    
+    payload = cached_user_payload(request.user.id, 'user_reviews', build_payload)
+    return Response(payload, status=status.HTTP_200_OK)
     
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
@@ -457,7 +463,8 @@ def review_detail(request, review_id):
         serializer = ReviewSerializer(review, data=request.data, partial=True, 
                                      context={'request': request})
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
             return Response({"data": serializer.data}, status=status.HTTP_200_OK)
         return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
     
@@ -469,35 +476,53 @@ def review_detail(request, review_id):
 @api_view(['GET'])
 def room_reviews(request, room_id):
     try:
-        room = Rooms.objects.get(id=room_id)
-        
-        bookings = Bookings.objects.filter(room=room, is_venue_booking=False)
-        booking_ids = [booking.id for booking in bookings]
+        if not Rooms.objects.filter(id=room_id).exists():
+            return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        reviews = Reviews.objects.filter(booking_id__in=booking_ids).order_by('-created_at')
+        reviews = Reviews.objects.filter(
+            booking__room_id=room_id,
+            booking__is_venue_booking=False
+        )
         
-        serializer = ReviewSerializer(reviews, many=True)
-        return Response({"data": serializer.data}, status=status.HTTP_200_OK)
-    
-    except Rooms.DoesNotExist:
-        return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
+        return paginated_reviews_response(request, reviews)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
 def area_reviews(request, area_id):
     try:
-        area = Areas.objects.get(id=area_id)
-        
-        bookings = Bookings.objects.filter(area=area, is_venue_booking=True)
-        booking_ids = [booking.id for booking in bookings]
+        if not Areas.objects.filter(id=area_id).exists():
+            return Response({"error": "Area not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        reviews = Reviews.objects.filter(booking_id__in=booking_ids).order_by('-created_at')
+        reviews = Reviews.objects.filter(
+            booking__area_id=area_id,
+            booking__is_venue_booking=True
+        )
         
-        serializer = ReviewSerializer(reviews, many=True)
-        return Response({"data": serializer.data}, status=status.HTTP_200_OK)
-    
-    except Areas.DoesNotExist:
-        return Response({"error": "Area not found"}, status=status.HTTP_404_NOT_FOUND)
+        return paginated_reviews_response(request, reviews)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+def paginated_reviews_response(request, reviews):
+    summary = rating_summary(reviews)
+    
+    reviews = reviews.select_related(
+        'user', 'booking__room', 'booking__area'
+    ).order_by('-created_at')
+    
+    page, page_size = page_params(request, 10)
+    # The summary already counted the reviews; reuse it instead of a second COUNT query.
+    paginated_reviews = get_page(reviews, page, page_size, count=summary['count'])
+    
+    serializer = ReviewSerializer(paginated_reviews, many=True)
+    
+    return Response({
+        "data": serializer.data,
+        "summary": summary,
+        "pagination": {
+            "total_pages": paginated_reviews.paginator.num_pages,
+            "current_page": paginated_reviews.number,
+            "total_items": paginated_reviews.paginator.count,
+            "page_size": page_size
+        }
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,187 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from django.core.cache import caches, DEFAULT_CACHE_ALIAS
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+NAMESPACES = ('otp', 'catalog', 'availability', 'dashboard', 'user_data', 'auth', 'throttle')
+METRIC_FIELDS = ('hits', 'local_hits', 'misses', 'sets', 'deletes', 'operations', 'latency_us')
+METRICS_FLUSH_INTERVAL = 10
+METRICS_KEY_PREFIX = 'cache_metrics'
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+class NamespacedCache:
+    """
+    Thin wrapper around a Django cache that prefixes every key with a
+    namespace and records hits, misses, writes and latency for it.
+
+    Only the subset of the cache API the project uses is exposed; the
+    semantics of each method are those of the underlying backend.
+    """
+
+    def __init__(self, namespace, alias=DEFAULT_CACHE_ALIAS):
+        self.namespace = namespace
+        self.alias = alias
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def make_key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key, default=None):
+        started = time.perf_counter()
+        value = self.backend.get(self.make_key(key), _MISSING)
+        hit = value is not _MISSING
+        self._record(started, hits=int(hit), misses=int(not hit))
+        return value if hit else default
+
+    def get_many(self, keys) -> dict:
+        key_map = {self.make_key(key): key for key in keys}
+        started = time.perf_counter()
+        found = self.backend.get_many(list(key_map))
+        self._record(started, hits=len(found), misses=len(key_map) - len(found))
+        return {key_map[key]: value for key, value in found.items()}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        started = time.perf_counter()
+        self.backend.set(self.make_key(key), value, timeout)
+        self._record(started, sets=1)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT) -> bool:
+        started = time.perf_counter()
+        added = self.backend.add(self.make_key(key), value, timeout)
+        self._record(started, sets=int(added))
+        return added
+
+    def incr(self, key, delta=1):
+        started = time.perf_counter()
+        try:
+            value = self.backend.incr(self.make_key(key), delta)
+        except ValueError:
+            self._record(started, misses=1)
+            raise
+        self._record(started, hits=1, sets=1)
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT) -> bool:
+        started = time.perf_counter()
+        touched = self.backend.touch(self.make_key(key), timeout)
+        self._record(started, hits=int(touched), misses=int(not touched))
+        return touched
+
+    def delete(self, key) -> bool:
+        started = time.perf_counter()
+        deleted = self.backend.delete(self.make_key(key))
+        self._record(started, deletes=1)
+        return deleted
+
+    def record_local_hit(self) -> None:
+        """Count a hit served from an in-process cache in front of this one."""
+        metrics.record(self.namespace, local_hits=1)
+
+    def _record(self, started, **counts):
+        latency_us = int((time.perf_counter() - started) * 1_000_000)
+        metrics.record(self.namespace, operations=1, latency_us=latency_us, **counts)
+
+def cache_namespace(namespace, alias=DEFAULT_CACHE_ALIAS) -> NamespacedCache:
+    if namespace not in NAMESPACES:
+        raise ValueError(f"Unknown cache namespace '{namespace}'")
+    return NamespacedCache(namespace, alias)
+
+class CacheMetrics:
+    """
+    Per-process counters, folded into shared totals in the default cache
+    every ``METRICS_FLUSH_INTERVAL`` seconds by a daemon thread, so neither
+    recording a metric nor the flush itself runs inside a request.
+    """
+
+    def __init__(self):
+        self._reset_after_fork()
+        if hasattr(os, 'register_at_fork'):
+            # Workers forked from a preloaded master start with no flusher
+            # thread and must not flush the master's counts a second time.
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        self._pending = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def record(self, namespace, **counts):
+        with self._lock:
+            self._pending[namespace].update(counts)
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, name='cache-metrics-flush', daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing cache metrics failed")
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+
+        backend = caches[DEFAULT_CACHE_ALIAS]
+        for namespace, counts in pending.items():
+            for field, delta in counts.items():
+                if not delta:
+                    continue
+                key = _metrics_key(namespace, field)
+                try:
+                    backend.incr(key, delta)
+                except ValueError:
+                    if not backend.add(key, delta, None):
+                        backend.incr(key, delta)
+
+    def snapshot(self) -> dict:
+        """Shared totals for every namespace, including this process's unflushed counts."""
+        self.flush()
+        backend = caches[DEFAULT_CACHE_ALIAS]
+        keys = [_metrics_key(namespace, field) for namespace in NAMESPACES for field in METRIC_FIELDS]
+        totals = backend.get_many(keys)
+        evictions = getattr(backend, 'eviction_counts', dict)()
+
+        result = {}
+        for namespace in NAMESPACES:
+            counts = {field: totals.get(_metrics_key(namespace, field), 0) for field in METRIC_FIELDS}
+            lookups = counts['hits'] + counts['local_hits'] + counts['misses']
+            result[namespace] = {
+                'hits': counts['hits'],
+                'local_hits': counts['local_hits'],
+                'misses': counts['misses'],
+                'sets': counts['sets'],
+                'deletes': counts['deletes'],
+                'evictions': evictions.get(namespace, 0),
+                'hit_rate': round((counts['hits'] + counts['local_hits']) / lookups, 4) if lookups else None,
+                'avg_latency_ms': (
+                    round(counts['latency_us'] / counts['operations'] / 1000, 3)
+                    if counts['operations'] else None
+                ),
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._pending = defaultdict(Counter)
+        caches[DEFAULT_CACHE_ALIAS].delete_many([
+            _metrics_key(namespace, field) for namespace in NAMESPACES for field in METRIC_FIELDS
+        ])
+
+metrics = CacheMetrics()
+
+def _metrics_key(namespace, field) -> str:
+    return f"{METRICS_KEY_PREFIX}:{namespace}:{field}"
@@ -0,0 +1,245 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+
+class SQLiteCache(BaseCache):
+    """
+    Cache backend stored in a single SQLite file, shared by every worker
+    process on the host.
+
+    The database runs in WAL mode so readers never block the writer, and
+    read-modify-write operations (add, incr, touch) run inside
+    ``BEGIN IMMEDIATE`` transactions so they are atomic across processes.
+    Expired rows are ignored on read and swept in bulk every
+    ``SWEEP_INTERVAL`` seconds; once ``MAX_ENTRIES`` is exceeded the
+    ``1 / CULL_FREQUENCY`` entries closest to expiry are evicted.
+    """
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = str(location)
+        options = params.get("OPTIONS", {})
+        self._sweep_interval = int(options.get("SWEEP_INTERVAL", 60))
+        self._busy_timeout = float(options.get("BUSY_TIMEOUT", 5))
+        self._local = threading.local()
+        self._last_sweep = 0.0
+
+    # Connection handling
+
+    def _connection(self):
+        # One connection per thread and per process: connections must never
+        # cross a fork (e.g. gunicorn --preload) or be shared between threads.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_evictions ("
+                "namespace TEXT PRIMARY KEY, evicted INTEGER NOT NULL)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _write(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        self._maybe_sweep(conn)
+
+    def _maybe_sweep(self, conn):
+        now = time.time()
+        if now - self._last_sweep < self._sweep_interval:
+            return
+        self._last_sweep = now
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM cache_entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+            self._cull(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def _cull(self, conn):
+        (count,) = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        if count <= self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            victims = [row[0] for row in conn.execute("SELECT key FROM cache_entries")]
+        else:
+            # Evict the entries closest to expiry first; entries without an
+            # expiry sort last.
+            victims = [row[0] for row in conn.execute(
+                "SELECT key FROM cache_entries ORDER BY expires IS NULL, expires LIMIT ?",
+                (count // self._cull_frequency,)
+            )]
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", [(key,) for key in victims])
+        self._record_evictions(conn, victims)
+
+    def _record_evictions(self, conn, keys):
+        evicted = Counter(self._namespace_of(key) for key in keys)
+        conn.executemany(
+            "INSERT INTO cache_evictions (namespace, evicted) VALUES (?, ?) "
+            "ON CONFLICT(namespace) DO UPDATE SET evicted = evicted + excluded.evicted",
+            list(evicted.items())
+        )
+
+    def _namespace_of(self, key):
+        # Keys are stored as "<KEY_PREFIX>:<version>:<key>"; the namespace is
+        # the first segment of the caller's key.
+        parts = key.split(':', 3)
+        return parts[2] if len(parts) > 3 else ''
+
+    def eviction_counts(self):
+        """Entries culled to stay under MAX_ENTRIES, per key namespace, since the file was created."""
+        return dict(self._connection().execute("SELECT namespace, evicted FROM cache_evictions"))
+
+    # Serialization
+
+    def _dumps(self, value):
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _loads(self, blob):
+        return pickle.loads(blob)
+
+    def _alive(self, expires, now=None):
+        return expires is None or expires > (now or time.time())
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            "SELECT value, expires FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or not self._alive(row[1]):
+            return default
+        return self._loads(row[0])
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        placeholders = ", ".join("?" * len(key_map))
+        rows = self._connection().execute(
+            f"SELECT key, value, expires FROM cache_entries WHERE key IN ({placeholders})",
+            list(key_map)
+        ).fetchall()
+        now = time.time()
+        return {
+            key_map[key]: self._loads(value)
+            for key, value, expires in rows
+            if self._alive(expires, now)
+        }
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)",
+                (key, self._dumps(value), self.get_backend_timeout(timeout))
+            )
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        rows = [
+            (self.make_and_validate_key(key, version=version), self._dumps(value), expires)
+            for key, value in data.items()
+        ]
+        with self._write() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)",
+                rows
+            )
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key = ? AND expires IS NOT NULL AND expires <= ?",
+                (key, time.time())
+            )
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)",
+                (key, self._dumps(value), self.get_backend_timeout(timeout))
+            )
+            return cursor.rowcount == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            cursor = conn.execute(
+                "UPDATE cache_entries SET expires = ? "
+                "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (self.get_backend_timeout(timeout), key, time.time())
+            )
+            return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT value, expires FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or not self._alive(row[1]):
+                raise ValueError("Key '%s' not found" % key)
+            new_value = self._loads(row[0]) + delta
+            conn.execute(
+                "UPDATE cache_entries SET value = ? WHERE key = ?",
+                (self._dumps(new_value), key)
+            )
+            return new_value
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            cursor = conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            return cursor.rowcount > 0
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if not keys:
+            return
+        with self._write() as conn:
+            conn.executemany("DELETE FROM cache_entries WHERE key = ?", [(key,) for key in keys])
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            "SELECT expires FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        return row is not None and self._alive(row[0])
+
+    def clear(self):
+        with self._write() as conn:
+            conn.execute("DELETE FROM cache_entries")
+
+    def close(self, **kwargs):
+        # Django calls close() at the end of every request; the per-thread
+        # connection is cheap to keep and expensive to reopen, so keep it.
+        pass
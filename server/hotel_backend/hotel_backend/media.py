@@ -0,0 +1,418 @@
+import glob
+import hashlib
+import os
+import re
+import shutil
+import uuid
+from functools import lru_cache
+from django.conf import settings
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.core.signals import setting_changed
+from django.db import models
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+import cloudinary # type: ignore
+import cloudinary.uploader # type: ignore
+from cloudinary.models import CLOUDINARY_FIELD_DB_RE # type: ignore
+from cloudinary.utils import cloudinary_url # type: ignore
+
+ABSOLUTE_URL_PREFIXES = ('http://', 'https://')
+# Value of a media field whose upload is still queued; media_url() maps it to None
+PENDING_UPLOAD = ''
+
+# Responsive sizes for room and area images. Cloudinary renders each one on
+# its first request and caches it; LocalFileSystemStorage writes them next to
+# the original at upload time with Pillow (generate_image_derivatives
+# backfills files stored before then).
+IMAGE_DERIVATIVES = {
+    'thumbnail': {'width': 320, 'height': 240, 'crop': 'fill'},
+    'card': {'width': 800, 'height': 600, 'crop': 'fill'},
+    'full': {'width': 1920, 'crop': 'limit'},
+}
+# Square profile pictures; Cloudinary also centres the crop on a face.
+AVATAR_DERIVATIVES = {
+    'small': {'width': 64, 'height': 64, 'crop': 'fill', 'gravity': 'face'},
+    'medium': {'width': 160, 'height': 160, 'crop': 'fill', 'gravity': 'face'},
+    'large': {'width': 320, 'height': 320, 'crop': 'fill', 'gravity': 'face'},
+}
+
+# Uploads that are served back before they reach the media storage (see
+# pending_media): Pillow format -> the extension and content type they are
+# staged and served with, whatever the client called or labelled them.
+IMAGE_UPLOAD_FORMATS = {
+    'JPEG': ('.jpg', 'image/jpeg'),
+    'MPO': ('.jpg', 'image/jpeg'),
+    'PNG': ('.png', 'image/png'),
+    'GIF': ('.gif', 'image/gif'),
+    'WEBP': ('.webp', 'image/webp'),
+}
+IMAGE_UPLOAD_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+def media_url(value, **transformation):
+    """
+    Resolve a stored media value to its delivery URL through the configured
+    storage. Absolute URLs are returned as they are.
+    """
+    if not value:
+        return None
+    if isinstance(value, str) and value.startswith(ABSOLUTE_URL_PREFIXES):
+        return value
+    return get_media_storage().url(value, **transformation)
+
+def absolute_media_url(request, value, **transformation):
+    """media_url() made absolute against the request for relative URLs."""
+    return absolute_url(request, media_url(value, **transformation))
+
+def media_urls(value, request=None, sizes=IMAGE_DERIVATIVES):
+    """
+    ``{size: url}`` for every size in ``sizes`` of a stored image, made
+    absolute against ``request`` when one is given.
+    """
+    if not value:
+        return None
+    if isinstance(value, str) and value.startswith(ABSOLUTE_URL_PREFIXES):
+        return {name: value for name in sizes}
+    storage = get_media_storage()
+    return {name: absolute_url(request, storage.derivative_url(value, name, sizes)) for name in sizes}
+
+def absolute_url(request, url):
+    """A resolved media URL made absolute against ``request``, if it isn't already."""
+    if url and request and not url.startswith(ABSOLUTE_URL_PREFIXES):
+        return request.build_absolute_uri(url)
+    return url
+
+def verified_image_extension(uploaded_file) -> str | None:
+    """
+    The extension to store an uploaded image under, from the format Pillow
+    reads rather than the client's file name, or None unless it has an
+    image extension and is a whole image in one of IMAGE_UPLOAD_FORMATS.
+    """
+    from PIL import Image # type: ignore
+
+    if os.path.splitext(uploaded_file.name or '')[1].lower() not in IMAGE_UPLOAD_EXTENSIONS:
+        return None
+    try:
+        with Image.open(uploaded_file) as image:
+            image_format = image.format
+            image.verify()
+    except Exception:
+        # Pillow raises all sorts for truncated or disguised files
+        return None
+    finally:
+        uploaded_file.seek(0)
+    return IMAGE_UPLOAD_FORMATS[image_format][0] if image_format in IMAGE_UPLOAD_FORMATS else None
+
+def image_content_type(name) -> str | None:
+    """The content type to serve a file named by verified_image_extension() with."""
+    extension = os.path.splitext(name)[1].lower()
+    return next((content_type for ext, content_type in IMAGE_UPLOAD_FORMATS.values() if ext == extension), None)
+
+@lru_cache(maxsize=None)
+def get_media_storage():
+    return import_string(settings.MEDIA_STORAGE)()
+
+@receiver(setting_changed)
+def _reset_media_storage(setting, **kwargs):
+    if setting in ('MEDIA_STORAGE', 'MEDIA_ROOT', 'MEDIA_URL', 'CLOUDINARY'):
+        get_media_storage.cache_clear()
+
+class MediaStorage:
+    """
+    Where uploaded media lives. ``save()`` stores a file and returns the
+    value kept in a MediaField; ``url()`` turns such a value back into a
+    delivery URL.
+    """
+
+    def save(self, source, folder=None) -> str:
+        """Store ``source`` (a path or a Django File) and return its stored value."""
+        raise NotImplementedError('subclasses of MediaStorage must provide a save() method')
+
+    def url(self, value, **transformation):
+        raise NotImplementedError('subclasses of MediaStorage must provide a url() method')
+
+    def delete(self, value) -> None:
+        """Remove a stored file and any derivatives of it."""
+        raise NotImplementedError('subclasses of MediaStorage must provide a delete() method')
+
+    def create_derivatives(self, value, sizes=IMAGE_DERIVATIVES) -> None:
+        """Pre-generate the ``sizes`` of a saved image, if the backend needs to."""
+
+    def derivative_url(self, value, size, sizes=IMAGE_DERIVATIVES):
+        """URL of one of ``sizes``; the original unless the backend can resize."""
+        return self.url(value)
+
+class CloudinaryStorage(MediaStorage):
+    """
+    Cloudinary, configured from ``settings.CLOUDINARY`` when first used
+    rather than at settings import. Stored values are Cloudinary references
+    (``image/upload/v<version>/<public_id>.<format>``), so URLs for them are
+    built locally and can carry transformations.
+    """
+
+    def __init__(self):
+        options = getattr(settings, 'CLOUDINARY', {})
+        cloudinary.config(
+            cloud_name=options.get('CLOUD_NAME'),
+            api_key=options.get('API_KEY'),
+            api_secret=options.get('API_SECRET'),
+        )
+
+    def save(self, source, folder=None) -> str:
+        if isinstance(source, File):
+            source.seek(0)
+        result = cloudinary.uploader.upload(source, folder=folder or None)
+        reference = f"{result['resource_type']}/{result['type']}/v{result['version']}/{result['public_id']}"
+        return f"{reference}.{result['format']}" if result.get('format') else reference
+
+    def url(self, value, **transformation):
+        reference = self._parse(value)
+        if reference is None:
+            return None
+        public_id, file_format, version, upload_type, resource_type = reference
+
+        if public_id.startswith(ABSOLUTE_URL_PREFIXES):
+            return f"{public_id}.{file_format}" if file_format else public_id
+
+        return _cloudinary_url(
+            public_id, file_format, version, upload_type, resource_type,
+            tuple(sorted(transformation.items()))
+        )
+
+    def delete(self, value) -> None:
+        reference = self._parse(value)
+        if reference is None or reference[0].startswith(ABSOLUTE_URL_PREFIXES):
+            return
+        public_id, _format, _version, upload_type, resource_type = reference
+        # Derived sizes go with the original; invalidate drops CDN copies too.
+        cloudinary.uploader.destroy(public_id, type=upload_type, resource_type=resource_type, invalidate=True)
+
+    def derivative_url(self, value, size, sizes=IMAGE_DERIVATIVES):
+        return self.url(value, quality='auto', fetch_format='auto', **sizes[size])
+
+    def _parse(self, value):
+        if isinstance(value, str):
+            match = re.match(CLOUDINARY_FIELD_DB_RE, value)
+            return (
+                match.group('public_id'), match.group('format'), match.group('version'),
+                match.group('type') or 'upload', match.group('resource_type') or 'image',
+            )
+        # A CloudinaryResource, e.g. from code still holding one
+        public_id = getattr(value, 'public_id', None)
+        if not public_id:
+            return None
+        return public_id, value.format, value.version, value.type or 'upload', value.resource_type or 'image'
+
+class LocalFileSystemStorage(MediaStorage):
+    """
+    Files under ``MEDIA_ROOT`` served from ``MEDIA_URL``, for tests and
+    deployments without access to Cloudinary. Files are copied in chunks,
+    never read into memory whole. Transformations are ignored; derivative
+    sizes are written as ``<name>.<size>.<ext>`` beside the original.
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(self, location=None, base_url=None):
+        self.location = str(location or settings.MEDIA_ROOT)
+        self.base_url = base_url or settings.MEDIA_URL
+
+    def save(self, source, folder=None) -> str:
+        original_name = source if isinstance(source, str) else (source.name or '')
+        extension = os.path.splitext(original_name)[1].lower()[:10]
+        name = f"{folder}/{uuid.uuid4().hex}{extension}" if folder else f"{uuid.uuid4().hex}{extension}"
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        if isinstance(source, str):
+            with open(source, 'rb') as src, open(path, 'wb') as dest:
+                shutil.copyfileobj(src, dest, self.chunk_size)
+        elif hasattr(source, 'temporary_file_path'):
+            # Already spooled to disk by the upload handler: move it over
+            file_move_safe(source.temporary_file_path(), path)
+        else:
+            with open(path, 'wb') as dest:
+                for chunk in source.chunks(self.chunk_size):
+                    dest.write(chunk)
+        return name
+
+    def url(self, value, **transformation):
+        return f"{self.base_url.rstrip('/')}/{str(value).lstrip('/')}"
+
+    def delete(self, value) -> None:
+        path = self.path(value)
+        stem, extension = os.path.splitext(path)
+        for name in [path, *glob.glob(f"{glob.escape(stem)}.*{glob.escape(extension)}")]:
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+    def create_derivatives(self, value, sizes=IMAGE_DERIVATIVES) -> None:
+        try:
+            from PIL import Image, ImageOps # type: ignore
+        except ImportError:
+            return
+
+        try:
+            with Image.open(self.path(value)) as source:
+                # exif_transpose() returns a copy without .format. Camera
+                # JPEGs often open as MPO; their sizes are plain JPEGs.
+                image_format = {'MPO': 'JPEG'}.get(source.format, source.format) or 'JPEG'
+                original = ImageOps.exif_transpose(source)
+                if image_format == 'JPEG' and original.mode not in ('RGB', 'L', 'CMYK'):
+                    original = original.convert('RGB')
+                for size, spec in sizes.items():
+                    if spec['crop'] == 'fill':
+                        image = ImageOps.fit(original, (spec['width'], spec['height']))
+                    else:
+                        image = original.copy()
+                        image.thumbnail((spec['width'], spec['width'] * 10))
+                    image.save(self.path(self._derivative_name(value, size)), format=image_format, quality=85, optimize=True)
+        except (OSError, Image.DecompressionBombError):
+            # Not an image Pillow can read; every size falls back to the original.
+            return
+
+    def derivative_url(self, value, size, sizes=IMAGE_DERIVATIVES):
+        name = self._derivative_name(value, size)
+        return self.url(name if os.path.exists(self.path(name)) else value)
+
+    def _derivative_name(self, value, size) -> str:
+        stem, extension = os.path.splitext(str(value))
+        return f"{stem}.{size}{extension}"
+
+    def path(self, name) -> str:
+        path = os.path.normpath(os.path.join(self.location, name))
+        if not path.startswith(os.path.normpath(self.location) + os.sep):
+            raise ValueError(f"Media path '{name}' is outside {self.location}")
+        return path
+
+class MediaField(models.CharField):
+    """
+    Holds a value returned by the media storage. Assigning an uploaded
+    file and saving the model stores the file through get_media_storage()
+    and keeps the returned value, like CloudinaryField used to. With
+    ``derivatives`` (True for IMAGE_DERIVATIVES, or a dict of sizes such as
+    AVATAR_DERIVATIVES) the resized versions are prepared as well.
+    """
+
+    def __init__(self, *args, folder='', derivatives=False, **kwargs):
+        kwargs.setdefault('max_length', 255)
+        self.folder = folder
+        self.derivatives = derivatives
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.folder:
+            kwargs['folder'] = self.folder
+        if self.derivatives:
+            kwargs['derivatives'] = self.derivatives
+        if kwargs.get('max_length') == 255:
+            del kwargs['max_length']
+        return name, path, args, kwargs
+
+    @property
+    def derivative_sizes(self) -> dict:
+        if self.derivatives is True:
+            return IMAGE_DERIVATIVES
+        return self.derivatives or {}
+
+    def to_python(self, value):
+        if isinstance(value, File):
+            return value
+        return super().to_python(value)
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if isinstance(value, File):
+            storage = get_media_storage()
+            value = storage.save(value, folder=self.folder or None)
+            if self.derivatives:
+                storage.create_derivatives(value, self.derivative_sizes)
+            setattr(model_instance, self.attname, value)
+        return value
+
+class MediaUploadField(serializers.Field):
+    """
+    Serializer field for a MediaField: accepts an uploaded file (or an
+    existing stored value) and renders the delivery URL via media_url().
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, File) or isinstance(data, str):
+            return data
+        raise serializers.ValidationError("Expected a file upload.")
+
+    def to_representation(self, value):
+        return media_url(value)
+
+class MediaDerivativesField(serializers.Field):
+    """Read-only ``{size: url}`` for an image field, see media_urls()."""
+
+    def __init__(self, sizes=IMAGE_DERIVATIVES, **kwargs):
+        kwargs['read_only'] = True
+        self.sizes = sizes
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return media_urls(value, self.context.get('request'), self.sizes)
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    TemporaryFileUploadHandler that also hashes each file as its chunks are
+    written, exposing the SHA-256 as ``uploaded_file.content_hash``.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.content_hash = self.hasher.hexdigest()
+        return uploaded_file
+
+def content_hash(uploaded_file) -> str:
+    """
+    SHA-256 of an uploaded file: the one computed while it streamed in, or
+    read in chunks for files that did not come through the hashing handler.
+    """
+    digest = getattr(uploaded_file, 'content_hash', None)
+    if not digest:
+        hasher = hashlib.sha256()
+        for chunk in uploaded_file.chunks():
+            hasher.update(chunk)
+        uploaded_file.seek(0)
+        digest = uploaded_file.content_hash = hasher.hexdigest()
+    return digest
+
+def mutable_request_data(request):
+    """
+    A writable copy of ``request.data``. QueryDict.copy() deep-copies every
+    value, which fails for uploads spooled to temporary files, so form
+    fields are copied and uploaded files are attached as they are.
+    """
+    if not request.FILES:
+        return request.data.copy()
+    data = request.POST.copy()
+    for key, files in request.FILES.lists():
+        data.setlist(key, files)
+    return data
+
+@lru_cache(maxsize=8192)
+def _cloudinary_url(public_id, file_format, version, upload_type, resource_type, transformation):
+    url, _options = cloudinary_url(
+        public_id,
+        format=file_format,
+        version=version,
+        type=upload_type,
+        resource_type=resource_type,
+        **dict(transformation)
+    )
+    return url
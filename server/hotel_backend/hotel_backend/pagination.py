@@ -0,0 +1,38 @@
+import math
+from django.core.paginator import EmptyPage, Paginator
+
+MAX_PAGE_SIZE = 50
+
+def page_params(request, default_size, max_size=MAX_PAGE_SIZE) -> tuple[int, int]:
+    """
+    ``page`` and ``page_size`` from the query string as ints. Missing or
+    non-numeric values fall back to page 1 and ``default_size``; the page
+    is at least 1 and the size is clamped to 1..``max_size``.
+    """
+    return (
+        max(_int_param(request, 'page', 1), 1),
+        min(max(_int_param(request, 'page_size', default_size), 1), max_size),
+    )
+
+def get_page(queryset, page, page_size, count=None):
+    """
+    Page ``page`` of ``queryset``, or the last page past the end. ``count``
+    skips the COUNT query when the caller already knows the total.
+    """
+    paginator = Paginator(queryset, page_size)
+    if count is not None:
+        paginator.count = count
+    try:
+        return paginator.page(page)
+    except EmptyPage:
+        return paginator.page(paginator.num_pages)
+
+def last_page(count, page_size) -> int:
+    """Number of the last page of ``count`` items; 1 when there are none."""
+    return max(math.ceil(count / page_size), 1)
+
+def _int_param(request, name, default) -> int:
+    try:
+        return int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,40 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson # type: ignore
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer backed by orjson.
+    
+    Dates, times, datetimes and Decimals are passed back to DRF's own
+    encoder so the output matches the default renderer byte for byte.
+    Indented output (browsable API, ``; indent=`` media types) and payloads
+    orjson can't encode fall back to the stdlib renderer, as does a missing
+    orjson install.
+    """
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            ret = orjson.dumps(
+                data,
+                default=_encoder.default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # Same strict-javascript-subset escaping as JSONRenderer.
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+_encoder = JSONEncoder()
@@ -14,9 +14,6 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 from datetime import timedelta
-import cloudinary # type: ignore
-import cloudinary.uploader # type: ignore
-import cloudinary.api # type: ignore
 
 load_dotenv()
 
@@ -95,7 +92,24 @@ TEMPLATES = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'user_roles.authentication.CookieJWTAuthentication',
-    )
+    ),
+    # orjson-backed renderer; views can still opt into JSONRenderer with @renderer_classes
+    'DEFAULT_RENDERER_CLASSES': (
+        'hotel_backend.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    # Sliding-window limits for user_roles.throttling, as <requests>/<period>
+    # with an optional multiplier on the period (s, m, h, d)
+    'DEFAULT_THROTTLE_RATES': {
+        'otp_ip': '20/h',
+        'otp_email': '5/10m',
+        'login_ip': '30/m',
+        'login_email': '10/15m',
+    },
+    # Reverse proxies in front of the app. The IP throttles use the client
+    # address they append to X-Forwarded-For; with 0 they use REMOTE_ADDR and
+    # ignore the header, which a client could otherwise rotate freely.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
 SIMPLE_JWT = {
@@ -103,10 +117,23 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
 }
 
+# Email + password logins; ModelBackend stays for usernames in the admin site
+AUTHENTICATION_BACKENDS = [
+    'user_roles.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 PASSWORD_HASHERS = [
-    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'user_roles.hashers.BCryptSHA256PasswordHasher',
 ]
 
+# bcrypt work factor; hashes made with a different one are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+# Concurrent password hashes per worker process, and how long a request
+# waits for a free slot before getting a 503
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', os.cpu_count() or 2))
+PASSWORD_HASHING_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASHING_QUEUE_TIMEOUT', 5))
+
 WSGI_APPLICATION = 'hotel_backend.wsgi.application'
 
 
@@ -169,6 +196,21 @@ USE_TZ = True
 STATIC_URL = 'static/'
 
 MEDIA_URL = '/media/'
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', str(BASE_DIR / 'media'))
+
+# Backend for uploaded media: hotel_backend.media.CloudinaryStorage (configured
+# from CLOUDINARY below) or hotel_backend.media.LocalFileSystemStorage, which
+# keeps files under MEDIA_ROOT for tests and deployments without Cloudinary.
+MEDIA_STORAGE = os.getenv('MEDIA_STORAGE', 'hotel_backend.media.CloudinaryStorage')
+
+# Stream every upload to a temporary file in chunks instead of holding small
+# ones in memory, hashing it on the way; staging and local storage then move
+# the file into place, and the hash lets repeat uploads reuse a MediaAsset.
+FILE_UPLOAD_HANDLERS = ['hotel_backend.media.HashingTemporaryFileUploadHandler']
+
+# Uploads are written here first and pushed to MEDIA_STORAGE by the
+# process_media_uploads worker, so it must be shared with the worker host.
+MEDIA_STAGING_DIR = os.getenv('MEDIA_STAGING_DIR', str(BASE_DIR / 'media_staging'))
 
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
@@ -185,19 +227,32 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'user_roles.CustomUsers'
 
-# Cloudinary - Django config
-cloudinary.config(
-    cloud_name=os.getenv('CLOUD_NAME'),
-    api_key=os.getenv('API_KEY'),
-    api_secret=os.getenv('API_SECRET')
-)
-
 # Cache Configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+# Shared by every worker on the host so OTPs, versions and cached payloads are
+# seen by all of them. Set REDIS_URL to use a Redis-compatible server instead
+# (requires the redis package).
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'hotel_backend.cache_backends.SQLiteCache',
+            'LOCATION': os.getenv('CACHE_PATH', str(BASE_DIR / 'cache.sqlite3')),
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000,
+                'SWEEP_INTERVAL': 60,
+            },
+        }
+    }
+
+# Run the warm_caches command when a WSGI worker loads, before it serves
+# its first request.
+WARM_CACHES_ON_STARTUP = os.getenv('WARM_CACHES_ON_STARTUP', 'false').lower() in ('1', 'true', 'yes')
 
 # Cache middleware settings
 CACHE_MIDDLEWARE_ALIAS = 'default'
@@ -0,0 +1,38 @@
+import atexit
+import os
+import shutil
+import tempfile
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hotel-backend-tests',
+    }
+}
+
+# Local media under a throwaway directory, so the suite never needs
+# Cloudinary credentials. Tests that write files use their own directory.
+TEST_MEDIA_ROOT = tempfile.mkdtemp(prefix='hotel-backend-media-')
+atexit.register(shutil.rmtree, TEST_MEDIA_ROOT, ignore_errors=True)
+TEST_MEDIA = {
+    'MEDIA_STORAGE': 'hotel_backend.media.LocalFileSystemStorage',
+    'MEDIA_ROOT': TEST_MEDIA_ROOT,
+    'MEDIA_STAGING_DIR': os.path.join(TEST_MEDIA_ROOT, 'staging'),
+}
+
+@override_settings(CACHES=TEST_CACHES, **TEST_MEDIA)
+class CacheTestCase(TestCase):
+    """
+    TestCase with a private in-memory cache, emptied before every test
+    together with the in-process catalog LRU, so cached payloads and
+    version counters never leak between tests. Media is stored locally
+    under TEST_MEDIA_ROOT.
+    """
+
+    def setUp(self):
+        super().setUp()
+        from property.catalog import _local_cache
+        caches['default'].clear()
+        _local_cache.clear()
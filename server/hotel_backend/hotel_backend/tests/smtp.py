@@ -0,0 +1,82 @@
+import email
+import socketserver
+import threading
+
+class SMTPSink:
+    """
+    Minimal SMTP server on a free localhost port that accepts every message
+    and keeps it, parsed, in ``messages``. ``reject_next`` makes the next N
+    messages get a 554 after DATA, so delivery failures can be exercised.
+
+        with SMTPSink() as sink:
+            with override_settings(EMAIL_HOST=sink.host, EMAIL_PORT=sink.port, ...):
+                ...
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.reject_next = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                sink._session(self.rfile, self.wfile)
+
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _session(self, rfile, wfile):
+        def reply(line):
+            wfile.write(f"{line}\r\n".encode())
+            wfile.flush()
+
+        with self._lock:
+            self.connections += 1
+        reply("220 localhost SMTP sink")
+        recipients = []
+        while True:
+            line = rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                reply("250 localhost")
+            elif verb == 'MAIL':
+                recipients = []
+                reply("250 OK")
+            elif verb == 'RCPT':
+                recipients.append(command.split(':', 1)[1].strip(' <>'))
+                reply("250 OK")
+            elif verb == 'DATA':
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for raw in iter(rfile.readline, b''):
+                    if raw in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(raw[1:] if raw.startswith(b'..') else raw)
+                with self._lock:
+                    rejected = self.reject_next > 0
+                    if rejected:
+                        self.reject_next -= 1
+                    else:
+                        message = email.message_from_bytes(b''.join(data))
+                        self.messages.append((recipients, message))
+                reply("554 Rejected by the sink" if rejected else "250 OK")
+            elif verb == 'QUIT':
+                reply("221 Bye")
+                return
+            else:
+                # RSET, NOOP and anything else
+                reply("250 OK")
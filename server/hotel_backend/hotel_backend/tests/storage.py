@@ -0,0 +1,29 @@
+from io import BytesIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from hotel_backend.media import LocalFileSystemStorage
+
+try:
+    from PIL import Image # type: ignore
+except ImportError:
+    Image = None
+
+class StandInStorage(LocalFileSystemStorage):
+    """
+    LocalFileSystemStorage for tests: setting ``fail_next`` makes the next
+    N saves raise, so retry paths can be exercised.
+    """
+    fail_next = 0
+
+    def save(self, source, folder=None) -> str:
+        cls = type(self)
+        if cls.fail_next:
+            cls.fail_next -= 1
+            raise ConnectionError("Stand-in storage failure")
+        return super().save(source, folder)
+
+def image_upload(name, size=(400, 200), mode='RGB', image_format='JPEG', exif=None):
+    """An uploaded image file generated with Pillow; tests using it skip when ``Image`` is None."""
+    buffer = BytesIO()
+    image = Image.new(mode, size)
+    image.save(buffer, format=image_format, **({'exif': exif} if exif else {}))
+    return SimpleUploadedFile(name, buffer.getvalue())
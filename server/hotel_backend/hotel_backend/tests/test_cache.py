@@ -0,0 +1,51 @@
+from unittest import mock
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from hotel_backend.cache import CacheMetrics, cache_namespace
+from hotel_backend.tests import TEST_CACHES
+
+@override_settings(CACHES=TEST_CACHES)
+class CacheMetricsTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.metrics = CacheMetrics()
+        # Keep the flusher thread from starting so each test controls flushes
+        patcher = mock.patch('threading.Thread')
+        self.thread = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_record_never_touches_the_cache(self):
+        with mock.patch.object(caches['default'], 'incr') as incr, mock.patch.object(caches['default'], 'add') as add:
+            for _ in range(100):
+                self.metrics.record('catalog', hits=1, operations=1)
+        incr.assert_not_called()
+        add.assert_not_called()
+        # The flusher is started once, in the background
+        self.thread.assert_called_once()
+        self.assertTrue(self.thread.call_args.kwargs['daemon'])
+        self.thread.return_value.start.assert_called_once()
+    
+    def test_flushes_accumulate_in_the_shared_totals(self):
+        self.metrics.record('catalog', hits=2, misses=1, operations=3, latency_us=3000)
+        self.metrics.flush()
+        # Another worker process flushing into the same cache
+        other = CacheMetrics()
+        other.record('catalog', hits=1, operations=1, latency_us=1000)
+        other.flush()
+        
+        catalog = self.metrics.snapshot()['catalog']
+        self.assertEqual((catalog['hits'], catalog['misses']), (3, 1))
+        self.assertEqual(catalog['hit_rate'], 0.75)
+        self.assertEqual(catalog['avg_latency_ms'], 1.0)
+    
+    def test_snapshot_includes_unflushed_counts(self):
+        self.metrics.record('otp', misses=1)
+        self.assertEqual(self.metrics.snapshot()['otp']['misses'], 1)
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot()['otp']['misses'], 0)
+
+class NamespacedCacheTests(SimpleTestCase):
+    def test_keys_are_prefixed_with_the_namespace(self):
+        self.assertEqual(cache_namespace('catalog').make_key('rooms'), 'catalog:rooms')
+        with self.assertRaises(ValueError):
+            cache_namespace('unknown')
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import threading
+from django.test import SimpleTestCase
+from hotel_backend.cache_backends import SQLiteCache
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'cache.sqlite3')
+        self.cache = self.backend()
+    
+    def backend(self, **options):
+        return SQLiteCache(self.path, {'OPTIONS': options})
+    
+    def test_basic_operations(self):
+        self.cache.set('rooms', [{'id': 1}])
+        self.assertEqual(self.cache.get('rooms'), [{'id': 1}])
+        self.assertFalse(self.cache.add('rooms', 'other'))
+        self.assertTrue(self.cache.add('areas', []))
+        self.cache.set('counter', 1)
+        self.assertEqual(self.cache.incr('counter'), 2)
+        self.cache.set_many({'a': 1, 'b': 2})
+        self.assertEqual(self.cache.get_many(['a', 'b', 'missing']), {'a': 1, 'b': 2})
+        self.assertTrue(self.cache.delete('a'))
+        self.assertFalse(self.cache.has_key('a'))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('rooms'))
+    
+    def test_expired_entries_are_invisible(self):
+        self.cache.set('stale', 1, 0)
+        self.assertIsNone(self.cache.get('stale'))
+        self.assertEqual(self.cache.get_many(['stale']), {})
+        self.assertFalse(self.cache.touch('stale'))
+        self.assertTrue(self.cache.add('stale', 2))
+        self.assertEqual(self.cache.get('stale'), 2)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+    
+    def test_entries_are_shared_between_instances(self):
+        # Each worker process opens its own backend on the same file
+        other = self.backend()
+        self.cache.set('version', 1, None)
+        self.assertEqual(other.incr('version'), 2)
+        self.assertEqual(self.cache.get('version'), 2)
+    
+    def test_concurrent_increments_are_atomic(self):
+        self.cache.set('hits', 0, None)
+        
+        def worker():
+            backend = self.backend()
+            for _ in range(50):
+                backend.incr('hits')
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.get('hits'), 200)
+    
+    def test_cull_evicts_and_counts_per_namespace(self):
+        cache = self.backend(MAX_ENTRIES=10, CULL_FREQUENCY=2, SWEEP_INTERVAL=0)
+        for i in range(12):
+            cache.set(f"catalog:entry{i}", i, 60 + i)
+        self.assertLessEqual(len(cache.get_many([f"catalog:entry{i}" for i in range(12)])), 10)
+        self.assertIsNone(cache.get('catalog:entry0'))
+        self.assertGreater(cache.eviction_counts()['catalog'], 0)
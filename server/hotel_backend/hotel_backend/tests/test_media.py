@@ -0,0 +1,158 @@
+import os
+import shutil
+import tempfile
+import unittest
+from cloudinary import CloudinaryResource # type: ignore
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+from hotel_backend.media import (
+    AVATAR_DERIVATIVES, IMAGE_DERIVATIVES, CloudinaryStorage, LocalFileSystemStorage, _cloudinary_url,
+    absolute_media_url, media_url,
+)
+from .storage import Image, image_upload
+
+CLOUDINARY = {'CLOUD_NAME': 'demo', 'API_KEY': 'key', 'API_SECRET': 'secret'}
+
+@override_settings(MEDIA_STORAGE='hotel_backend.media.CloudinaryStorage', CLOUDINARY=CLOUDINARY)
+class CloudinaryURLTests(SimpleTestCase):
+    def test_reference_resolves_to_delivery_url(self):
+        self.assertEqual(
+            media_url('image/upload/v1712345678/rooms/deluxe.jpg'),
+            'http://res.cloudinary.com/demo/image/upload/v1712345678/rooms/deluxe.jpg',
+        )
+    
+    def test_resolution_is_memoized(self):
+        _cloudinary_url.cache_clear()
+        for _ in range(3):
+            media_url('image/upload/v1712345678/rooms/deluxe.jpg', width=320)
+        info = _cloudinary_url.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+        # Transformations are part of the memo key
+        self.assertNotEqual(
+            media_url('image/upload/v1712345678/rooms/deluxe.jpg', width=320),
+            media_url('image/upload/v1712345678/rooms/deluxe.jpg', width=640),
+        )
+    
+    def test_absolute_urls_are_left_alone(self):
+        secure_url = 'https://res.cloudinary.com/demo/image/upload/v1/valid_ids/id.png'
+        self.assertEqual(media_url(secure_url), secure_url)
+        request = APIRequestFactory().get('/')
+        self.assertEqual(absolute_media_url(request, secure_url), secure_url)
+    
+    def test_empty_values(self):
+        self.assertIsNone(media_url(None))
+        self.assertIsNone(media_url(''))
+
+@override_settings(CLOUDINARY=CLOUDINARY)
+class CloudinaryParseTests(SimpleTestCase):
+    def setUp(self):
+        self.storage = CloudinaryStorage()
+    
+    def test_stored_reference(self):
+        self.assertEqual(
+            self.storage._parse('image/upload/v1712345678/rooms/deluxe.jpg'),
+            ('rooms/deluxe', 'jpg', '1712345678', 'upload', 'image'),
+        )
+        self.assertEqual(
+            self.storage._parse('raw/private/v12/documents/terms.pdf'),
+            ('documents/terms', 'pdf', '12', 'private', 'raw'),
+        )
+    
+    def test_legacy_cloudinary_field_values(self):
+        # CloudinaryField stored "v<version>/<public_id>.<format>", or a bare public id
+        self.assertEqual(
+            self.storage._parse('v1712345678/rooms/deluxe.jpg'),
+            ('rooms/deluxe', 'jpg', '1712345678', 'upload', 'image'),
+        )
+        self.assertEqual(self.storage._parse('rooms/deluxe'), ('rooms/deluxe', None, None, 'upload', 'image'))
+    
+    def test_cloudinary_resource(self):
+        resource = CloudinaryResource('rooms/deluxe', format='png', version='17', type='upload', resource_type='image')
+        self.assertEqual(self.storage._parse(resource), ('rooms/deluxe', 'png', '17', 'upload', 'image'))
+        self.assertIsNone(self.storage._parse(CloudinaryResource()))
+
+class LocalFileSystemStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.storage = LocalFileSystemStorage(self.location, '/media/')
+    
+    def test_save_streams_the_upload_into_the_folder(self):
+        name = self.storage.save(SimpleUploadedFile("Scan.JPG", b"image bytes"), folder='valid_ids')
+        self.assertRegex(name, r'^valid_ids/[0-9a-f]{32}\.jpg$')
+        with open(os.path.join(self.location, name), 'rb') as stored:
+            self.assertEqual(stored.read(), b"image bytes")
+        self.assertEqual(self.storage.url(name), f"/media/{name}")
+    
+    def test_save_copies_a_staged_path(self):
+        staged = os.path.join(self.location, 'staged.png')
+        with open(staged, 'wb') as f:
+            f.write(b"png bytes")
+        name = self.storage.save(staged)
+        self.assertTrue(name.endswith('.png'))
+        self.assertTrue(os.path.exists(staged))
+        with open(self.storage.path(name), 'rb') as stored:
+            self.assertEqual(stored.read(), b"png bytes")
+    
+    def test_delete_removes_the_derivatives(self):
+        name = self.storage.save(SimpleUploadedFile("room.jpg", b"image bytes"), folder='rooms')
+        derivative = self.storage.path(self.storage._derivative_name(name, 'thumb'))
+        other = self.storage.save(SimpleUploadedFile("other.jpg", b"other"), folder='rooms')
+        open(derivative, 'wb').close()
+        
+        self.storage.delete(name)
+        self.assertFalse(os.path.exists(self.storage.path(name)))
+        self.assertFalse(os.path.exists(derivative))
+        self.assertTrue(os.path.exists(self.storage.path(other)))
+        # Already gone
+        self.storage.delete(name)
+    
+    def test_path_rejects_traversal(self):
+        for name in ('../outside.jpg', 'rooms/../../outside.jpg', '/etc/passwd', ''):
+            with self.subTest(name), self.assertRaises(ValueError):
+                self.storage.path(name)
+        self.assertEqual(self.storage.path('rooms/a.jpg'), os.path.join(self.location, 'rooms', 'a.jpg'))
+
+@unittest.skipIf(Image is None, "Pillow is not installed")
+class LocalDerivativeTests(SimpleTestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.storage = LocalFileSystemStorage(self.location, '/media/')
+    
+    def derivative(self, name, size):
+        return Image.open(self.storage.path(self.storage._derivative_name(name, size)))
+    
+    def test_sizes_keep_the_source_format(self):
+        name = self.storage.save(image_upload("room.png", image_format='PNG'), folder='rooms')
+        self.storage.create_derivatives(name)
+        sizes = {}
+        for size in IMAGE_DERIVATIVES:
+            with self.derivative(name, size) as image:
+                self.assertEqual(image.format, 'PNG')
+                sizes[size] = image.size
+        # Fills are cropped to the exact size; limits only ever shrink
+        self.assertEqual(sizes, {'thumbnail': (320, 240), 'card': (800, 600), 'full': (400, 200)})
+        self.assertEqual(self.storage.derivative_url(name, 'card'), self.storage.url(self.storage._derivative_name(name, 'card')))
+    
+    def test_rotated_jpeg_stays_jpeg(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6 # Orientation: rotate 90° clockwise
+        name = self.storage.save(image_upload("id.jpg", exif=exif), folder='rooms')
+        self.storage.create_derivatives(name)
+        with self.derivative(name, 'full') as image:
+            self.assertEqual((image.format, image.size), ('JPEG', (200, 400)))
+    
+    def test_transparent_and_palette_images(self):
+        for mode, image_format in (('RGBA', 'PNG'), ('P', 'PNG'), ('P', 'GIF')):
+            with self.subTest(mode=mode, format=image_format):
+                name = self.storage.save(image_upload(f"avatar.{image_format.lower()}", mode=mode, image_format=image_format))
+                self.storage.create_derivatives(name, AVATAR_DERIVATIVES)
+                with self.derivative(name, 'small') as image:
+                    self.assertEqual((image.format, image.size), (image_format, (64, 64)))
+    
+    def test_non_images_fall_back_to_the_original(self):
+        name = self.storage.save(SimpleUploadedFile("notes.jpg", b"not an image"))
+        self.storage.create_derivatives(name)
+        self.assertEqual(self.storage.derivative_url(name, 'card'), self.storage.url(name))
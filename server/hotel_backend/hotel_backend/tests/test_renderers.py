@@ -0,0 +1,36 @@
+import datetime
+import uuid
+from decimal import Decimal
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from hotel_backend.renderers import ORJSONRenderer
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assertSameAsJSONRenderer(self, data, media_type='application/json'):
+        self.assertEqual(
+            ORJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type),
+        )
+    
+    def test_matches_json_renderer(self):
+        self.assertSameAsJSONRenderer({
+            "data": [{
+                "id": 1,
+                "room_name": "Suite – Ocean View",
+                "room_price": Decimal('2500.00'),
+                "check_in_date": datetime.date(2025, 1, 31),
+                "created_at": datetime.datetime(2025, 1, 31, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+                "time": datetime.time(14, 0),
+                "token": uuid.UUID(int=1),
+                "amenities": [],
+                "rating": 4.5,
+                "histogram": {1: 0, 5: 2},
+                "note": "line\u2028separator",
+            }]
+        })
+    
+    def test_indented_output_falls_back(self):
+        self.assertSameAsJSONRenderer({"data": [1, 2]}, 'application/json; indent=4')
+    
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
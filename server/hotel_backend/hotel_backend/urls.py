@@ -14,6 +14,8 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
@@ -24,3 +26,7 @@ urlpatterns = [
     path('booking/', include('booking.urls')),
     path('property/', include('property.urls')),
 ]
+
+# Files kept by LocalFileSystemStorage; static() only serves them with DEBUG on,
+# otherwise the web server should serve MEDIA_ROOT at MEDIA_URL.
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
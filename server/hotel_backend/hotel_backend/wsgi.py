@@ -7,6 +7,7 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 """
 
+import logging
 import os
 
 from django.core.wsgi import get_wsgi_application
@@ -14,3 +15,14 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hotel_backend.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.WARM_CACHES_ON_STARTUP:
+    from django.core.management import call_command
+
+    try:
+        call_command('warm_caches')
+    except Exception:
+        # A cold cache is slower, not broken: never keep the worker from starting.
+        logging.getLogger(__name__).exception("Cache warming failed")
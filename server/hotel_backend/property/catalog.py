@@ -0,0 +1,132 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from django.db import transaction
+from hotel_backend.cache import cache_namespace
+
+CATALOG_VERSION_KEY = 'version'
+CATALOG_MODELS = ('rooms', 'areas', 'amenities')
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+LOCAL_CACHE_SIZE = 512
+
+catalog_cache = cache_namespace('catalog')
+
+def get_catalog_version() -> dict:
+    """
+    Current catalog version stamp: an opaque ``version`` string and the
+    ``modified`` unix timestamp of the last Rooms/Areas/Amenities write.
+    """
+    stamp = catalog_cache.get(CATALOG_VERSION_KEY)
+    if stamp is None:
+        # First read after a cache flush: every worker races to add the same
+        # key and whichever wins becomes the shared stamp.
+        catalog_cache.add(CATALOG_VERSION_KEY, _new_stamp(), None)
+        stamp = catalog_cache.get(CATALOG_VERSION_KEY) or _new_stamp()
+    return stamp
+
+def bump_catalog_version(*models) -> None:
+    """
+    Invalidate the catalog after a write: bumps the version of each named
+    model ('rooms', 'areas', 'amenities') and the catalog-wide stamp.
+
+    Inside a transaction the bump waits for the commit. Bumping earlier
+    would let a concurrent request re-cache the pre-write rows under the
+    new version, where they would stay until the next write.
+    """
+    transaction.on_commit(lambda: _bump_catalog_version(models))
+
+def _bump_catalog_version(models) -> None:
+    for model in models:
+        key = _model_version_key(model)
+        try:
+            catalog_cache.incr(key)
+        except ValueError:
+            catalog_cache.set(key, _initial_model_version(), None)
+    catalog_cache.set(CATALOG_VERSION_KEY, _new_stamp(), None)
+
+def catalog_etag(request, *args, **kwargs) -> str:
+    return get_catalog_version()['version']
+
+def catalog_last_modified(request, *args, **kwargs) -> datetime:
+    return datetime.fromtimestamp(get_catalog_version()['modified'], tz=timezone.utc)
+
+def get_model_versions(models) -> dict:
+    keys = {_model_version_key(model): model for model in models}
+    versions = catalog_cache.get_many(list(keys))
+    for key, model in keys.items():
+        if key not in versions:
+            catalog_cache.add(key, _initial_model_version(), None)
+            versions[key] = catalog_cache.get(key, 0)
+    return {model: versions[key] for key, model in keys.items()}
+
+def cached_catalog(models, key, builder, timeout=CATALOG_CACHE_TIMEOUT, store=catalog_cache):
+    """
+    Read-through cache for serialized catalog data.
+
+    ``models`` lists the catalog models the payload depends on; their
+    current versions are part of the cache key, so any write bumping one of
+    them makes the old entries unreachable instead of having to find and
+    delete them. Lookups go to the in-process LRU first, then the shared
+    cache, and only call ``builder()`` on a miss in both. ``store`` is the
+    cache namespace the payload is kept (and its metrics counted) under.
+    """
+    versions = get_model_versions(models)
+    version_part = ":".join(f"{model}{versions[model]}" for model in models)
+    full_key = f"{key}:{version_part}"
+    local_key = store.make_key(full_key)
+
+    value = _local_cache.get(local_key)
+    if value is not None:
+        store.record_local_hit()
+        return value
+
+    value = store.get(full_key)
+    if value is None:
+        value = builder()
+        store.set(full_key, value, timeout)
+    _local_cache.set(local_key, value)
+    return value
+
+class LocalLRUCache:
+    """Small thread-safe in-process LRU used in front of the shared cache."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+_local_cache = LocalLRUCache(LOCAL_CACHE_SIZE)
+
+def _model_version_key(model) -> str:
+    return f"version:{model}"
+
+def _initial_model_version() -> int:
+    # Start from the clock rather than 1, so versions never repeat after the
+    # shared cache is flushed while workers still hold entries in their LRU.
+    return time.time_ns() // 1000
+
+def _new_stamp() -> dict:
+    return {
+        'version': uuid.uuid4().hex,
+        'modified': int(time.time()),
+    }
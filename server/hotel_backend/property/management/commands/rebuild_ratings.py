@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from booking.models import Reviews
+from property.models import Rooms, Areas
+from property.catalog import bump_catalog_version
+from property.ratings import rebuild_rating_aggregates
+
+class Command(BaseCommand):
+    help = "Recompute the rating aggregates of every room and area from the reviews table"
+    
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rooms, areas = rebuild_rating_aggregates(Reviews, Rooms, Areas)
+        
+        bump_catalog_version('rooms', 'areas')
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt ratings for {rooms} rooms and {areas} areas"
+        ))
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.8 on 2026-10-19 00:14
+
+import hotel_backend.media
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0002_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='areas',
+            name='area_image',
+            field=hotel_backend.media.MediaField(blank=True, folder='areas', null=True, verbose_name='area_image'),
+        ),
+        migrations.AlterField(
+            model_name='rooms',
+            name='room_image',
+            field=hotel_backend.media.MediaField(folder='rooms', verbose_name='room_image'),
+        ),
+    ]
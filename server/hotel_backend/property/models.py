@@ -1,14 +1,49 @@
 from django.db import models
-from cloudinary.models import CloudinaryField # type: ignore
+from hotel_backend.media import MediaField
+from .ratings import RATING_FIELDS
 
 # Create your models here.
+class RatingAggregate(models.Model):
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        abstract = True
+    
+    def save(self, *args, **kwargs):
+        # Rating counters are only changed through atomic F() updates; a regular
+        # save of a stale instance must not overwrite them.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+    
+    @property
+    def average_rating(self):
+        """Average review rating, or 0 when there are no reviews yet"""
+        if not self.rating_count:
+            return 0
+        return round(self.rating_sum / self.rating_count, 2)
+    
+    @property
+    def rating_histogram(self):
+        """Number of reviews per star rating, keyed '1' to '5'"""
+        return {str(rating): getattr(self, f"rating_{rating}") for rating in range(1, 6)}
+
 class Amenities(models.Model):
     description = models.TextField(blank=True, null=True)
     
     class Meta:
         db_table = 'amenities'
 
-class Rooms(models.Model):
+class Rooms(RatingAggregate):
     ROOM_STATUS_CHOICES = [
         ('available', 'Available'),
         ('maintenance', 'Maintenance'),
@@ -21,7 +56,7 @@ class Rooms(models.Model):
         default='available',
     )
     room_price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
-    room_image = CloudinaryField('room_image', null=False, blank=False)
+    room_image = MediaField('room_image', folder='rooms', derivatives=True, null=False, blank=False)
     description = models.TextField(blank=True)
     capacity = models.TextField(max_length=100, null=False)
     amenities = models.ManyToManyField(Amenities, related_name='rooms', blank=True)
@@ -29,7 +64,7 @@ class Rooms(models.Model):
     class Meta:
         db_table = 'rooms'
 
-class Areas(models.Model):
+class Areas(RatingAggregate):
     AREA_STATUS_CHOICES = [
         ('available', 'Available'),
         ('maintenance', 'Maintenance'),
@@ -44,7 +79,7 @@ class Areas(models.Model):
         choices=AREA_STATUS_CHOICES,
         default='available',
     )
-    area_image = CloudinaryField('area_image', null=True, blank=True)
+    area_image = MediaField('area_image', folder='areas', derivatives=True, null=True, blank=True)
     
     class Meta:
         db_table = 'areas'
\ No newline at end of file
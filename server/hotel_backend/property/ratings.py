@@ -0,0 +1,41 @@
+from django.db.models import Count, Q, Sum
+
+RATING_FIELDS = ['rating_sum', 'rating_count', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+
+def rebuild_rating_aggregates(reviews, rooms, areas) -> tuple[int, int]:
+    """
+    Recompute the rating counters of every room and area from the reviews
+    table and return how many rooms and areas have reviews. Takes the model
+    classes so data migrations can pass their historical models.
+    """
+    aggregates = {
+        'rating_sum': Sum('rating'),
+        'rating_count': Count('id'),
+        **{f"rating_{rating}": Count('id', filter=Q(rating=rating)) for rating in range(1, 6)}
+    }
+    
+    room_totals = list(reviews.objects.filter(
+        booking__is_venue_booking=False,
+        booking__room__isnull=False
+    ).values('booking__room_id').annotate(**aggregates))
+    
+    area_totals = list(reviews.objects.filter(
+        booking__is_venue_booking=True,
+        booking__area__isnull=False
+    ).values('booking__area_id').annotate(**aggregates))
+    
+    reset = {field: 0 for field in RATING_FIELDS}
+    rooms.objects.update(**reset)
+    areas.objects.update(**reset)
+    
+    for totals in room_totals:
+        rooms.objects.filter(id=totals['booking__room_id']).update(
+            **{field: totals[field] for field in RATING_FIELDS}
+        )
+    
+    for totals in area_totals:
+        areas.objects.filter(id=totals['booking__area_id']).update(
+            **{field: totals[field] for field in RATING_FIELDS}
+        )
+    
+    return len(room_totals), len(area_totals)
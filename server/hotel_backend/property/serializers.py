@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import Amenities, Rooms, Areas
-from cloudinary.utils import cloudinary_url # type: ignore
+from hotel_backend.media import MediaUploadField, MediaDerivativesField
 
 class AmenitySerializer(serializers.ModelSerializer):
     class Meta:
@@ -9,6 +9,11 @@ class AmenitySerializer(serializers.ModelSerializer):
 
 class RoomSerializer(serializers.ModelSerializer):
     amenities = serializers.PrimaryKeyRelatedField(queryset=Amenities.objects.all(), many=True, required=False)
+    average_rating = serializers.FloatField(read_only=True)
+    review_count = serializers.IntegerField(source='rating_count', read_only=True)
+    rating_histogram = serializers.DictField(read_only=True)
+    room_image = MediaUploadField()
+    room_image_sizes = MediaDerivativesField(source='room_image')
     
     class Meta:
         model = Rooms
@@ -19,20 +24,29 @@ class RoomSerializer(serializers.ModelSerializer):
             'status',
             'room_price',
             'room_image',
+            'room_image_sizes',
             'description',
             'capacity',
             'amenities',
+            'average_rating',
+            'review_count',
+            'rating_histogram',
         ]
         
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['room_image'] = instance.room_image.url if instance.room_image else None
         
         if instance.room_price is not None:
             representation['room_price'] = f"₱{float(instance.room_price):,.2f}"
         return representation
 
 class AreaSerializer(serializers.ModelSerializer):
+    average_rating = serializers.FloatField(read_only=True)
+    review_count = serializers.IntegerField(source='rating_count', read_only=True)
+    rating_histogram = serializers.DictField(read_only=True)
+    area_image = MediaUploadField(required=False, allow_null=True)
+    area_image_sizes = MediaDerivativesField(source='area_image')
+    
     class Meta:
         model = Areas
         fields = [
@@ -40,14 +54,17 @@ class AreaSerializer(serializers.ModelSerializer):
             'area_name',
             'description',
             'area_image',
+            'area_image_sizes',
             'status',
             'capacity',
             'price_per_hour',
+            'average_rating',
+            'review_count',
+            'rating_histogram',
         ]
         
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['area_image'] = instance.area_image.url if instance.area_image else None
         
         if instance.price_per_hour is not None:
             representation['price_per_hour'] = f"₱{float(instance.price_per_hour):,.2f}"
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Rooms, Areas, Amenities
+from .catalog import bump_catalog_version
+
+@receiver(post_save, sender=Rooms)
+@receiver(post_delete, sender=Rooms)
+def rooms_changed(sender, **kwargs):
+    bump_catalog_version('rooms')
+
+@receiver(post_save, sender=Areas)
+@receiver(post_delete, sender=Areas)
+def areas_changed(sender, **kwargs):
+    bump_catalog_version('areas')
+
+@receiver(post_save, sender=Amenities)
+@receiver(post_delete, sender=Amenities)
+def amenities_changed(sender, **kwargs):
+    bump_catalog_version('amenities')
+
+@receiver(m2m_changed, sender=Rooms.amenities.through)
+def room_amenities_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_catalog_version('rooms')
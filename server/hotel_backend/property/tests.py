@@ -1,3 +1,156 @@
-from django.test import TestCase
+import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+from hotel_backend.tests import CacheTestCase
+from booking.models import Bookings, Reviews
+from user_roles.models import CustomUsers
+from .catalog import get_model_versions
+from .models import Rooms, Areas, Amenities
+from .ratings import rebuild_rating_aggregates
+from .utils import room_data
 
-# Create your tests here.
+class RatingAggregateTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.guest = CustomUsers.objects.create(username="guest@example.com", email="guest@example.com", role='guest')
+        self.room = Rooms.objects.create(room_name="Deluxe", room_type='premium', room_image='rooms/deluxe.jpg', capacity='2', room_price=2500)
+        self.other_room = Rooms.objects.create(room_name="Suite", room_type='premium', room_image='rooms/suite.jpg', capacity='4', room_price=5000)
+        self.area = Areas.objects.create(area_name="Garden", capacity=100, price_per_hour=1500)
+    
+    def book(self, room=None, area=None):
+        today = datetime.date.today()
+        return Bookings.objects.create(
+            user=self.guest, room=room, area=area, is_venue_booking=area is not None,
+            check_in_date=today, check_out_date=today, status='checked_out',
+            valid_id='valid_ids/id.jpg', total_price=2500,
+        )
+    
+    def review(self, booking, rating):
+        return Reviews.objects.create(booking=booking, user=self.guest, rating=rating, review_text="")
+    
+    def assertCounters(self, obj, count, total, histogram):
+        obj.refresh_from_db()
+        self.assertEqual(obj.rating_count, count)
+        self.assertEqual(obj.rating_sum, total)
+        self.assertEqual(obj.rating_histogram, histogram)
+    
+    def test_review_create_update_delete_maintain_counters(self):
+        first = self.review(self.book(room=self.room), 5)
+        self.review(self.book(room=self.room), 3)
+        self.assertCounters(self.room, 2, 8, {'1': 0, '2': 0, '3': 1, '4': 0, '5': 1})
+        self.assertEqual(self.room.average_rating, 4)
+        
+        first.rating = 4
+        first.save()
+        self.assertCounters(self.room, 2, 7, {'1': 0, '2': 0, '3': 1, '4': 1, '5': 0})
+        
+        first.delete()
+        self.assertCounters(self.room, 1, 3, {'1': 0, '2': 0, '3': 1, '4': 0, '5': 0})
+    
+    def test_moving_a_review_to_another_booking(self):
+        review = self.review(self.book(room=self.room), 2)
+        review.booking = self.book(room=self.other_room)
+        review.save()
+        self.assertCounters(self.room, 0, 0, {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0})
+        self.assertCounters(self.other_room, 1, 2, {'1': 0, '2': 1, '3': 0, '4': 0, '5': 0})
+    
+    def test_cascade_delete_keeps_counters_in_step(self):
+        booking = self.book(area=self.area)
+        self.review(booking, 4)
+        self.review(self.book(area=self.area), 2)
+        booking.delete()
+        self.assertCounters(self.area, 1, 2, {'1': 0, '2': 1, '3': 0, '4': 0, '5': 0})
+    
+    def test_decrement_never_goes_below_zero(self):
+        review = self.review(self.book(room=self.room), 5)
+        Rooms.objects.filter(id=self.room.id).update(rating_count=0, rating_sum=0, rating_5=0)
+        review.delete()
+        self.assertCounters(self.room, 0, 0, {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0})
+    
+    def test_rebuild_recomputes_from_reviews(self):
+        self.review(self.book(room=self.room), 5)
+        self.review(self.book(room=self.room), 1)
+        self.review(self.book(area=self.area), 3)
+        Rooms.objects.update(rating_count=9, rating_sum=40, rating_1=9)
+        Areas.objects.update(rating_count=0, rating_sum=0, rating_3=0)
+        
+        self.assertEqual(rebuild_rating_aggregates(Reviews, Rooms, Areas), (1, 1))
+        self.assertCounters(self.room, 2, 6, {'1': 1, '2': 0, '3': 0, '4': 0, '5': 1})
+        self.assertCounters(self.other_room, 0, 0, {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0})
+        self.assertCounters(self.area, 1, 3, {'1': 0, '2': 0, '3': 1, '4': 0, '5': 0})
+    
+    def test_rebuild_ratings_command(self):
+        self.review(self.book(room=self.room), 4)
+        Rooms.objects.update(rating_count=0, rating_sum=0, rating_4=0)
+        call_command('rebuild_ratings', stdout=StringIO())
+        self.assertCounters(self.room, 1, 4, {'1': 0, '2': 0, '3': 0, '4': 1, '5': 0})
+
+class ConditionalCatalogTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.room = Rooms.objects.create(room_name="Deluxe", room_type='premium', room_image='rooms/deluxe.jpg', capacity='2', room_price=2500)
+    
+    def test_unchanged_catalog_answers_304(self):
+        response = self.client.get(reverse('fetch_rooms'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('Last-Modified'))
+        etag = response['ETag']
+        
+        response = self.client.get(reverse('fetch_room_detail', args=[self.room.id]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+    
+    def test_write_changes_the_etag(self):
+        etag = self.client.get(reverse('fetch_rooms'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.room_price = 3000
+            self.room.save()
+        
+        response = self.client.get(reverse('fetch_rooms'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['data'][0]['room_price'], '₱3,000.00')
+    
+    def test_amenity_change_changes_the_etag(self):
+        etag = self.client.get(reverse('fetch_amenities'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.amenities.add(Amenities.objects.create(description="Wi-Fi"))
+        self.assertEqual(self.client.get(reverse('fetch_amenities'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+class CatalogCacheTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.room = Rooms.objects.create(room_name="Deluxe", room_type='premium', room_image='rooms/deluxe.jpg', capacity='2', room_price=2500)
+    
+    def test_reads_are_cached_until_a_write(self):
+        self.assertEqual(room_data(self.room.id)['room_name'], "Deluxe")
+        with self.assertNumQueries(0):
+            room_data(self.room.id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.room_name = "Grand"
+            self.room.save()
+        self.assertEqual(room_data(self.room.id)['room_name'], "Grand")
+    
+    def test_version_is_bumped_only_on_commit(self):
+        room_data(self.room.id)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.room.room_name = "Grand"
+            self.room.save()
+            # Before the commit, readers still get the cached payload and
+            # cannot re-cache pre-write rows under a new version.
+            self.assertEqual(room_data(self.room.id)['room_name'], "Deluxe")
+        for callback in callbacks:
+            callback()
+        self.assertEqual(room_data(self.room.id)['room_name'], "Grand")
+    
+    def test_rolled_back_write_does_not_bump(self):
+        versions = get_model_versions(('rooms',))
+        try:
+            with transaction.atomic():
+                self.room.save()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(get_model_versions(('rooms',)), versions)
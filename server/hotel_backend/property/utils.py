@@ -1,4 +1,7 @@
-from .models import Rooms
+from django.db.models import Case, F, Value, When
+from .models import Rooms, Areas, Amenities
+from .serializers import RoomSerializer, AreaSerializer, AmenitySerializer
+from .catalog import bump_catalog_version, cached_catalog
 
 def generate_room_number() -> str:
     last_room = Rooms.objects.order_by('-id').first()
@@ -10,4 +13,74 @@ def generate_room_number() -> str:
             next_num = Rooms.objects.count() + 1
     else:
         next_num = 1
-    return f"RM-{next_num:03d}"
\ No newline at end of file
+    return f"RM-{next_num:03d}"
+
+def apply_rating_change(booking, old_rating=None, new_rating=None) -> None:
+    """
+    Incrementally update the rating aggregates of the room or area a booking
+    belongs to. Pass ``new_rating`` for a new review, ``old_rating`` for a
+    deleted one, and both when a review's rating is edited. Called from the
+    Reviews signals in booking.signals.
+    """
+    if booking.is_venue_booking and booking.area_id:
+        queryset = Areas.objects.filter(id=booking.area_id)
+        catalog_model = 'areas'
+    elif not booking.is_venue_booking and booking.room_id:
+        queryset = Rooms.objects.filter(id=booking.room_id)
+        catalog_model = 'rooms'
+    else:
+        return
+    
+    deltas = {}
+    if old_rating is not None:
+        deltas['rating_sum'] = deltas.get('rating_sum', 0) - old_rating
+        deltas['rating_count'] = deltas.get('rating_count', 0) - 1
+        deltas[f"rating_{old_rating}"] = deltas.get(f"rating_{old_rating}", 0) - 1
+    if new_rating is not None:
+        deltas['rating_sum'] = deltas.get('rating_sum', 0) + new_rating
+        deltas['rating_count'] = deltas.get('rating_count', 0) + 1
+        deltas[f"rating_{new_rating}"] = deltas.get(f"rating_{new_rating}", 0) + 1
+    
+    updates = {field: _add_clamped(field, delta) for field, delta in deltas.items() if delta}
+    if updates:
+        queryset.update(**updates)
+        # Ratings are part of the serialized catalog but queryset.update()
+        # doesn't send post_save, so bump the catalog version explicitly.
+        bump_catalog_version(catalog_model)
+
+def _add_clamped(field, delta):
+    # The counters are unsigned; never let a decrement take one below zero,
+    # even if it has drifted from the reviews table.
+    if delta >= 0:
+        return F(field) + delta
+    return Case(When(**{f"{field}__gte": -delta}, then=F(field) + delta), default=Value(0))
+
+def available_rooms_data():
+    return cached_catalog(
+        ('rooms', 'amenities'), 'available_rooms',
+        lambda: RoomSerializer(Rooms.objects.filter(status='available').prefetch_related('amenities'), many=True).data
+    )
+
+def room_data(room_id):
+    return cached_catalog(
+        ('rooms', 'amenities'), f"room:{room_id}",
+        lambda: RoomSerializer(Rooms.objects.get(id=room_id)).data
+    )
+
+def available_areas_data():
+    return cached_catalog(
+        ('areas',), 'available_areas',
+        lambda: AreaSerializer(Areas.objects.filter(status='available'), many=True).data
+    )
+
+def area_data(area_id):
+    return cached_catalog(
+        ('areas',), f"area:{area_id}",
+        lambda: AreaSerializer(Areas.objects.get(id=area_id)).data
+    )
+
+def amenities_data():
+    return cached_catalog(
+        ('amenities',), 'amenities',
+        lambda: AmenitySerializer(Amenities.objects.all(), many=True).data
+    )
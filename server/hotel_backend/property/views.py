@@ -1,59 +1,60 @@
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from .models import Rooms, Areas, Amenities
-from .serializers import RoomSerializer, AreaSerializer, AmenitySerializer
+from django.views.decorators.http import condition
+from .catalog import catalog_etag, catalog_last_modified
+from .utils import available_rooms_data, room_data, available_areas_data, area_data, amenities_data
 
 # Create your views here.
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 @api_view(['GET'])
 def fetch_rooms(request):
     try:
-        rooms = Rooms.objects.filter(status='available')
-        serializer = RoomSerializer(rooms, many=True)
+        data = available_rooms_data()
         return Response({
-            "data": serializer.data
+            "data": data
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 @api_view(['GET'])
 def fetch_room_detail(request, id):
     try:
-        room = Rooms.objects.get(id=id)
-        serializer = RoomSerializer(room)
+        data = room_data(id)
         return Response({
-            "data": serializer.data
+            "data": data
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 @api_view(['GET'])
 def fetch_amenities(request):
     try:
-        amenities = Amenities.objects.all()
-        serializer = AmenitySerializer(amenities, many=True)
+        data = amenities_data()
         return Response({
-            "data": serializer.data
+            "data": data
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 @api_view(['GET'])
 def fetch_areas(request):
     try:
-        areas = Areas.objects.filter(status='available')
-        serializer = AreaSerializer(areas, many=True)
+        data = available_areas_data()
         return Response({
-            "data": serializer.data
+            "data": data
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 @api_view(['GET'])
 def fetch_area_detail(request, id):
     try:
-        area = Areas.objects.get(id=id)
-        serializer = AreaSerializer(area)
-        return Response({"data": serializer.data}, status=status.HTTP_200_OK)
+        data = area_data(id)
+        return Response({"data": data}, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -1,4 +1,8 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication # type: ignore
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken # type: ignore
+from rest_framework_simplejwt.settings import api_settings # type: ignore
+from rest_framework_simplejwt.utils import get_md5_hash_password # type: ignore
+from .cache import get_cached_user
 
 class CookieJWTAuthentication(JWTAuthentication):
     def authenticate(self, request):
@@ -16,4 +20,24 @@ class CookieJWTAuthentication(JWTAuthentication):
             return None
         
         validated_token = self.get_validated_token(raw_token)
-        return self.get_user(validated_token), validated_token
\ No newline at end of file
+        return self.get_user(validated_token), validated_token
+    
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        
+        # The parent lookup only runs on a cache miss; the per-token checks it
+        # makes are repeated here since a cached user is shared by every token.
+        user = get_cached_user(user_id, lambda: super(CookieJWTAuthentication, self).get_user(validated_token))
+        
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+        
+        return user
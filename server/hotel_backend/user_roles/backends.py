@@ -0,0 +1,40 @@
+from django.contrib.auth.backends import ModelBackend
+from .models import CustomUsers
+from .hashing import verify_password
+
+AUTHENTICATED = 'authenticated'
+UNKNOWN_USER = 'unknown_user'
+BAD_PASSWORD = 'bad_password'
+INACTIVE = 'inactive'
+
+# For login() calls on users that didn't come through authenticate()
+EMAIL_BACKEND_PATH = 'user_roles.backends.EmailBackend'
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate with an email address (passed as ``email`` or ``username``)
+    and password: one query on the unique email index, then one password
+    check on the bounded hashing pool.
+    """
+
+    def authenticate(self, request, username=None, password=None, email=None, **kwargs):
+        user, outcome = check_credentials(email or username, password)
+        return user if outcome == AUTHENTICATED else None
+
+def check_credentials(email, password):
+    """
+    Returns ``(user, outcome)``, where outcome tells a missing account
+    (UNKNOWN_USER, user is None) apart from a wrong password (BAD_PASSWORD)
+    and a deactivated account (INACTIVE).
+    """
+    if not email or password is None:
+        return None, UNKNOWN_USER
+
+    user = CustomUsers.objects.filter(email=email).first()
+    if user is None:
+        return None, UNKNOWN_USER
+    if not verify_password(user, password):
+        return user, BAD_PASSWORD
+    if not user.is_active:
+        return user, INACTIVE
+    return user, AUTHENTICATED
@@ -0,0 +1,103 @@
+import time
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from hotel_backend.cache import cache_namespace
+from property.catalog import get_catalog_version
+
+USER_DATA_CACHE_TIMEOUT = 60 * 10
+AUTH_USER_CACHE_TIMEOUT = 60 * 5
+
+# What authentication, permission checks and user_auth read on every request.
+# The password hash and everything else stay out of the shared cache and are
+# loaded from the database if a view asks for them.
+AUTH_USER_FIELDS = (
+    'id', 'email', 'username', 'first_name', 'last_name', 'profile_image',
+    'role', 'is_active', 'is_staff', 'is_superuser',
+)
+
+user_data_cache = cache_namespace('user_data')
+auth_cache = cache_namespace('auth')
+
+def get_user_data_version(user_id) -> int:
+    key = _user_version_key(user_id)
+    version = user_data_cache.get(key)
+    if version is None:
+        user_data_cache.add(key, _initial_version(), None)
+        version = user_data_cache.get(key, 0)
+    return version
+
+def bump_user_data_version(user_id) -> None:
+    """
+    Invalidate every cached payload of a user after their bookings, reviews
+    or profile change. Deferred to the commit, like bump_catalog_version().
+    """
+    transaction.on_commit(lambda: _bump_user_data_version(user_id))
+
+def _bump_user_data_version(user_id) -> None:
+    key = _user_version_key(user_id)
+    try:
+        user_data_cache.incr(key)
+    except ValueError:
+        user_data_cache.set(key, _initial_version(), None)
+
+def cached_user_payload(user_id, key, builder, timeout=USER_DATA_CACHE_TIMEOUT):
+    """
+    Per-user response cache. Entries are keyed on the user's data version and
+    on the catalog version (payloads embed room and area details), so any
+    write to either makes them unreachable.
+    """
+    full_key = (
+        f"{user_id}:v{get_user_data_version(user_id)}"
+        f":{get_catalog_version()['version']}:{key}"
+    )
+    payload = user_data_cache.get(full_key)
+    if payload is None:
+        payload = builder()
+        user_data_cache.set(full_key, payload, timeout)
+    return payload
+
+def get_cached_user(user_id, loader):
+    """
+    User instance for request authentication, cached for a few minutes under
+    the user's auth version so any save of the account (profile, role,
+    password, active flag) is picked up by the next request. Only
+    AUTH_USER_FIELDS are cached; the user is rebuilt with the rest deferred,
+    so save() writes back just the fields that were loaded or assigned.
+    """
+    version_key = f"version:{user_id}"
+    version = auth_cache.get(version_key)
+    if version is None:
+        auth_cache.add(version_key, _initial_version(), None)
+        version = auth_cache.get(version_key, 0)
+
+    key = f"user:{user_id}:v{version}"
+    fields = auth_cache.get(key)
+    if fields is None:
+        user = loader()
+        auth_cache.set(key, {name: getattr(user, name) for name in AUTH_USER_FIELDS}, AUTH_USER_CACHE_TIMEOUT)
+        return user
+    model = get_user_model()
+    # from_db() takes the loaded values in the model's field order
+    names = [f.attname for f in model._meta.concrete_fields if f.attname in fields]
+    return model.from_db(model.objects.db, names, [fields[name] for name in names])
+
+def bump_auth_version(user_id) -> None:
+    """
+    Drop the cached user after any save of the account. Deferred to the
+    commit, so a request racing the write can't re-cache the old row.
+    """
+    transaction.on_commit(lambda: _bump_auth_version(user_id))
+
+def _bump_auth_version(user_id) -> None:
+    key = f"version:{user_id}"
+    try:
+        auth_cache.incr(key)
+    except ValueError:
+        auth_cache.set(key, _initial_version(), None)
+
+def _user_version_key(user_id) -> str:
+    return f"version:{user_id}"
+
+def _initial_version() -> int:
+    # Clock-based so versions don't repeat after the cache is flushed.
+    return time.time_ns() // 1000
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import BCryptSHA256PasswordHasher as DjangoBCryptSHA256PasswordHasher
+
+class BCryptSHA256PasswordHasher(DjangoBCryptSHA256PasswordHasher):
+    """
+    bcrypt_sha256 with the work factor taken from ``settings.BCRYPT_ROUNDS``.
+
+    Existing hashes keep verifying at whatever cost they were made with;
+    Django's must_update() flags the ones that differ from the configured
+    rounds, and they are rehashed the next time the user logs in.
+    """
+
+    @property
+    def rounds(self):
+        return settings.BCRYPT_ROUNDS
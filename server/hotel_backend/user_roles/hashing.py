@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+
+class HashingBusy(Exception):
+    """Raised when every hashing slot stayed taken for PASSWORD_HASHING_QUEUE_TIMEOUT seconds."""
+
+_executor = None
+_slots = None
+_init_lock = threading.Lock()
+
+def hash_password(raw_password) -> str:
+    """make_password() on the bounded hashing pool."""
+    return _run(make_password, raw_password)
+
+def verify_password(user, raw_password) -> bool:
+    """
+    Check ``raw_password`` against ``user.password`` on the bounded hashing
+    pool. A correct password stored with an outdated hasher or work factor
+    is rehashed and saved, like AbstractBaseUser.check_password() does.
+    """
+    if not _run(check_password, raw_password, user.password):
+        return False
+
+    try:
+        outdated = identify_hasher(user.password).must_update(user.password)
+    except ValueError:
+        outdated = False
+    if outdated:
+        user.password = hash_password(raw_password)
+        user.save(update_fields=['password'])
+    return True
+
+def _run(func, *args):
+    return _submit(func, *args).result()
+
+def _submit(func, *args):
+    """
+    Queue a hash on the pool. At most PASSWORD_HASHING_WORKERS hashes run at
+    once and as many again may wait; beyond that callers give up after
+    PASSWORD_HASHING_QUEUE_TIMEOUT instead of stacking up behind a burst.
+    """
+    executor, slots = _pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT):
+        raise HashingBusy("Password hashing is saturated")
+    try:
+        future = executor.submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+def _pool():
+    # Created lazily so pre-fork servers start the threads in each worker.
+    global _executor, _slots
+    if _executor is None:
+        with _init_lock:
+            if _executor is None:
+                workers = settings.PASSWORD_HASHING_WORKERS
+                _slots = threading.BoundedSemaphore(workers * 2)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+    return _executor, _slots
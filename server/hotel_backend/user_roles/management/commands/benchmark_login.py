@@ -0,0 +1,60 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from user_roles.hashing import verify_password, HashingBusy
+
+class Command(BaseCommand):
+    help = "Measure login password-check throughput with hashing in the request threads vs. the bounded pool"
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Password checks per run")
+        parser.add_argument('--concurrency', type=int, default=16, help="Simultaneous login requests")
+        parser.add_argument('--rounds', type=int, default=None, help="bcrypt work factor (default: BCRYPT_ROUNDS)")
+    
+    def handle(self, *args, **options):
+        rounds = options['rounds'] or settings.BCRYPT_ROUNDS
+        
+        with override_settings(BCRYPT_ROUNDS=rounds):
+            encoded = make_password('benchmark-password')
+            user = SimpleNamespace(password=encoded)
+            
+            self.stdout.write(
+                f"bcrypt rounds {rounds}, {options['requests']} logins, "
+                f"{options['concurrency']} concurrent, {settings.PASSWORD_HASHING_WORKERS} hashing workers"
+            )
+            self.report("request threads", options, lambda: check_password('benchmark-password', encoded))
+            self.report("bounded pool", options, lambda: verify_password(user, 'benchmark-password'))
+    
+    def report(self, label, options, login):
+        latencies = []
+        rejected = 0
+        
+        def timed_login():
+            started = time.perf_counter()
+            try:
+                login()
+            except HashingBusy:
+                return None
+            return time.perf_counter() - started
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as clients:
+            for latency in clients.map(lambda _: timed_login(), range(options['requests'])):
+                if latency is None:
+                    rejected += 1
+                else:
+                    latencies.append(latency)
+        elapsed = time.perf_counter() - started
+        
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+        self.stdout.write(
+            f"{label:<16} {len(latencies) / elapsed:>8.1f} logins/s  "
+            f"p50 {statistics.median(latencies) * 1000 if latencies else 0:>7.1f} ms  "
+            f"p95 {p95 * 1000:>7.1f} ms  rejected {rejected}"
+        )
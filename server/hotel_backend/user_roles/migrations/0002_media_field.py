@@ -0,0 +1,19 @@
+# Generated by Django 5.1.8 on 2026-10-19 00:14
+
+import hotel_backend.media
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_roles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customusers',
+            name='profile_image',
+            field=hotel_backend.media.MediaField(blank=True, folder='profile_images', null=True, verbose_name='profile_image'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.8 on 2026-10-19 00:24
+
+import hotel_backend.media
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_roles', '0002_media_field'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customusers',
+            name='profile_image',
+            field=hotel_backend.media.MediaField(blank=True, derivatives={'large': {'crop': 'fill', 'gravity': 'face', 'height': 320, 'width': 320}, 'medium': {'crop': 'fill', 'gravity': 'face', 'height': 160, 'width': 160}, 'small': {'crop': 'fill', 'gravity': 'face', 'height': 64, 'width': 64}}, folder='profile_images', null=True, verbose_name='profile_image'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
-from cloudinary.models import CloudinaryField # type: ignore
+from hotel_backend.media import MediaField, AVATAR_DERIVATIVES
 
 # Create your models here.
 class CustomUsers(AbstractUser):
@@ -16,7 +16,9 @@ class CustomUsers(AbstractUser):
         choices=ROLE_CHOICES,
         default='guest',
     )
-    profile_image = CloudinaryField('profile_image', null=True, blank=True)
+    profile_image = MediaField(
+        'profile_image', folder='profile_images', derivatives=AVATAR_DERIVATIVES, null=True, blank=True
+    )
     
     class Meta:
         db_table = 'users'
@@ -0,0 +1,83 @@
+import hashlib
+import hmac
+from hotel_backend.cache import cache_namespace
+
+REGISTRATION = 'account_verification'
+PASSWORD_RESET = 'reset_password'
+
+OTP_EXPIRATION_TIME = 120
+OTP_MAX_ATTEMPTS = 5
+# How long a verified password-reset OTP stays redeemable by reset_password.
+RESET_GRANT_TIME = 60 * 10
+
+VALID = 'valid'
+INVALID = 'invalid'
+EXPIRED = 'expired'
+LOCKED = 'locked'
+
+otp_cache = cache_namespace('otp')
+
+def store_otp(email, purpose, otp, data=None, timeout=OTP_EXPIRATION_TIME) -> None:
+    """
+    Save a freshly sent OTP for ``email`` and ``purpose``, replacing any
+    pending one and resetting its attempt counter. ``data`` is kept with the
+    OTP and handed back by verify_otp_code().
+    """
+    key = _otp_key(email, purpose)
+    otp_cache.set(key, {**(data or {}), 'otp': str(otp)}, timeout)
+    otp_cache.set(_attempts_key(key), 0, timeout)
+
+def pending_otp(email, purpose):
+    return otp_cache.get(_otp_key(email, purpose))
+
+def verify_otp_code(email, purpose, submitted):
+    """
+    Check a submitted OTP with one lookup. Returns ``(status, entry)`` where
+    status is VALID, INVALID, EXPIRED or LOCKED and entry is the stored
+    data on VALID. A valid OTP is consumed; if several requests submit it
+    concurrently only the one that deletes it gets VALID.
+    """
+    key = _otp_key(email, purpose)
+    entry = otp_cache.get(key)
+    if entry is None:
+        return EXPIRED, None
+
+    try:
+        attempts = otp_cache.incr(_attempts_key(key))
+    except ValueError:
+        return EXPIRED, None
+    if attempts > OTP_MAX_ATTEMPTS:
+        discard_otp(email, purpose)
+        return LOCKED, None
+
+    if not hmac.compare_digest(entry['otp'].encode(), str(submitted).strip().encode()):
+        return INVALID, None
+
+    if not otp_cache.delete(key):
+        return EXPIRED, None
+    otp_cache.delete(_attempts_key(key))
+    return VALID, entry
+
+def discard_otp(email, purpose) -> None:
+    key = _otp_key(email, purpose)
+    otp_cache.delete(key)
+    otp_cache.delete(_attempts_key(key))
+
+def grant_password_reset(email) -> None:
+    otp_cache.set(_grant_key(email), True, RESET_GRANT_TIME)
+
+def consume_password_reset(email) -> bool:
+    """True once per verified reset OTP; reset_password must redeem it."""
+    return otp_cache.delete(_grant_key(email))
+
+def _normalize(email) -> str:
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+def _otp_key(email, purpose) -> str:
+    return f"{purpose}:{_normalize(email)}"
+
+def _attempts_key(key) -> str:
+    return f"{key}:attempts"
+
+def _grant_key(email) -> str:
+    return f"reset_grant:{_normalize(email)}"
@@ -1,18 +1,18 @@
 from .models import CustomUsers
 from rest_framework import serializers
+from hotel_backend.media import media_url, MediaDerivativesField, AVATAR_DERIVATIVES
 
 class CustomUserSerializer(serializers.ModelSerializer):
     profile_image = serializers.SerializerMethodField()
+    profile_image_sizes = MediaDerivativesField(source='profile_image', sizes=AVATAR_DERIVATIVES)
     
     class Meta:
         model = CustomUsers
-        fields = ['id', 'email', 'username', 'first_name', 'last_name', 'role', 'profile_image', 'date_joined']
+        fields = ['id', 'email', 'username', 'first_name', 'last_name', 'role', 'profile_image', 'profile_image_sizes', 'date_joined']
         extra_kwargs = { 'password': { 'write_only': True } }
         
     def get_profile_image(self, obj):
-        if obj.profile_image:
-            return obj.profile_image.url
-        return ""
+        return media_url(obj.profile_image) or ""
 
     def create(self, validated_data):
         if not validated_data.get('username'):
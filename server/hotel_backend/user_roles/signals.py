@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import CustomUsers
+from .cache import bump_user_data_version, bump_auth_version
+
+@receiver(post_save, sender=CustomUsers)
+@receiver(post_delete, sender=CustomUsers)
+def user_changed(sender, instance, **kwargs):
+    bump_user_data_version(instance.id)
+    bump_auth_version(instance.id)
@@ -1,3 +1,405 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken # type: ignore
+from rest_framework_simplejwt.tokens import RefreshToken # type: ignore
+from rest_framework_simplejwt.utils import aware_utcnow # type: ignore
+from hotel_backend.tests import CacheTestCase, TEST_CACHES
+from hotel_backend.tests.storage import Image, image_upload
+from admin_dashboard.models import MediaUpload
+from admin_dashboard.uploads import PROVISIONAL_MAX_AGE
+from .models import CustomUsers
+from . import hashing, otp as otp_store
+from .backends import check_credentials, AUTHENTICATED, BAD_PASSWORD, INACTIVE, UNKNOWN_USER
+from .throttling import OTPIPThrottle, OTPEmailThrottle, parse_rate
 
-# Create your tests here.
+def make_user(email="guest@example.com", password=None, **fields):
+    user = CustomUsers(username=email, email=email, role='guest', **fields)
+    if password:
+        user.set_password(password)
+    else:
+        user.set_unusable_password()
+    user.save()
+    return user
+
+class OTPStoreTests(CacheTestCase):
+    def test_valid_code_is_consumed(self):
+        otp_store.store_otp("Guest@Example.com", otp_store.REGISTRATION, 123456, {'email': "Guest@Example.com"})
+        otp_status, entry = otp_store.verify_otp_code(" guest@example.com", otp_store.REGISTRATION, "123456")
+        self.assertEqual(otp_status, otp_store.VALID)
+        self.assertEqual(entry['email'], "Guest@Example.com")
+        self.assertEqual(otp_store.verify_otp_code("guest@example.com", otp_store.REGISTRATION, "123456")[0], otp_store.EXPIRED)
+    
+    def test_purposes_are_separate(self):
+        otp_store.store_otp("guest@example.com", otp_store.PASSWORD_RESET, 123456)
+        self.assertEqual(otp_store.verify_otp_code("guest@example.com", otp_store.REGISTRATION, "123456")[0], otp_store.EXPIRED)
+    
+    def test_locked_after_max_attempts(self):
+        otp_store.store_otp("guest@example.com", otp_store.REGISTRATION, 123456)
+        for _ in range(otp_store.OTP_MAX_ATTEMPTS):
+            self.assertEqual(otp_store.verify_otp_code("guest@example.com", otp_store.REGISTRATION, "000000")[0], otp_store.INVALID)
+        # Even the right code is refused once the attempts are used up, and the OTP is gone
+        self.assertEqual(otp_store.verify_otp_code("guest@example.com", otp_store.REGISTRATION, "123456")[0], otp_store.LOCKED)
+        self.assertIsNone(otp_store.pending_otp("guest@example.com", otp_store.REGISTRATION))
+    
+    def test_resend_resets_the_attempts(self):
+        otp_store.store_otp("guest@example.com", otp_store.REGISTRATION, 123456)
+        for _ in range(otp_store.OTP_MAX_ATTEMPTS):
+            otp_store.verify_otp_code("guest@example.com", otp_store.REGISTRATION, "000000")
+        otp_store.store_otp("guest@example.com", otp_store.REGISTRATION, 654321)
+        self.assertEqual(otp_store.verify_otp_code("guest@example.com", otp_store.REGISTRATION, "654321")[0], otp_store.VALID)
+    
+    def test_password_reset_grant_is_single_use(self):
+        otp_store.grant_password_reset("guest@example.com")
+        self.assertTrue(otp_store.consume_password_reset("GUEST@example.com"))
+        self.assertFalse(otp_store.consume_password_reset("guest@example.com"))
+
+@override_settings(EMAIL_HOST_USER='noreply@example.com', BCRYPT_ROUNDS=4)
+class OTPViewTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+    
+    def test_registration_verifies_once(self):
+        response = self.client.post(reverse('send_register_otp'), {
+            'email': "new@example.com", 'password': "secret123", 'confirm_password': "secret123",
+        })
+        self.assertEqual(response.status_code, 200)
+        otp = otp_store.pending_otp("new@example.com", otp_store.REGISTRATION)['otp']
+        
+        response = self.client.post(reverse('verify_otp'), {'email': "new@example.com", 'otp': otp})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(CustomUsers.objects.get(email="new@example.com").check_password("secret123"))
+        
+        response = self.client.post(reverse('verify_otp'), {'email': "new@example.com", 'otp': otp})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_wrong_codes_lock_the_otp(self):
+        otp_store.store_otp("new@example.com", otp_store.REGISTRATION, 123456, {'email': "new@example.com", 'password_hash': "!"})
+        for _ in range(otp_store.OTP_MAX_ATTEMPTS):
+            response = self.client.post(reverse('verify_otp'), {'email': "new@example.com", 'otp': "000000"})
+            self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse('verify_otp'), {'email': "new@example.com", 'otp': "123456"})
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(CustomUsers.objects.filter(email="new@example.com").exists())
+    
+    def test_reset_password_requires_a_verified_otp(self):
+        make_user(password="old-secret")
+        data = {'email': "guest@example.com", 'new_password': "new-secret", 'confirm_password': "new-secret"}
+        self.assertEqual(self.client.post(reverse('reset_password'), data).status_code, 403)
+        
+        otp_store.store_otp("guest@example.com", otp_store.PASSWORD_RESET, 123456)
+        response = self.client.post(reverse('verify_reset_otp'), {'email': "guest@example.com", 'otp': "123456"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.post(reverse('reset_password'), data).status_code, 200)
+        self.assertTrue(CustomUsers.objects.get(email="guest@example.com").check_password("new-secret"))
+        # The grant is redeemed
+        self.assertEqual(self.client.post(reverse('reset_password'), data).status_code, 403)
+
+class CachedAuthenticationTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user(first_name="Ana")
+        self.client = APIClient()
+        self.client.cookies['access_token'] = str(RefreshToken.for_user(self.user).access_token)
+    
+    def test_user_is_loaded_once(self):
+        self.assertEqual(self.client.get(reverse('user_auth')).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('user_auth')).json()['user']['first_name'], "Ana")
+    
+    def test_account_changes_apply_after_commit(self):
+        self.client.get(reverse('user_auth'))
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.first_name = "Bea"
+            self.user.save()
+            self.assertEqual(self.client.get(reverse('user_auth')).json()['user']['first_name'], "Ana")
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(reverse('user_auth')).json()['user']['first_name'], "Bea")
+    
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(reverse('user_auth'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.client.get(reverse('user_auth')).status_code, 401)
+
+    @override_settings(BCRYPT_ROUNDS=4)
+    def test_password_hash_is_not_cached(self):
+        self.user.password = hashing.hash_password("secret123")
+        self.user.save()
+        self.client.get(reverse('user_auth'))
+        cached = caches['default']._cache.values()
+        self.assertTrue(cached)
+        self.assertFalse(any(self.user.password.encode() in value for value in cached))
+
+        # A cached user loads the hash on demand and saves only what it has
+        response = self.client.post(reverse('change_password'), {
+            'old_password': "secret123", 'new_password': "secret456", 'confirm_new_password': "secret456",
+        })
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("secret456"))
+        self.assertEqual((self.user.first_name, self.user.email), ("Ana", "guest@example.com"))
+
+@override_settings(BCRYPT_ROUNDS=4)
+class PasswordHashingTests(CacheTestCase):
+    def test_hash_and_verify_on_the_pool(self):
+        user = make_user()
+        user.password = hashing.hash_password("secret123")
+        self.assertTrue(user.password.startswith("bcrypt_sha256$"))
+        self.assertTrue(hashing.verify_password(user, "secret123"))
+        self.assertFalse(hashing.verify_password(user, "wrong"))
+    
+    def test_outdated_work_factor_is_upgraded_on_login(self):
+        with self.settings(BCRYPT_ROUNDS=5):
+            user = make_user(password="secret123")
+        self.assertTrue(hashing.verify_password(user, "secret123"))
+        user.refresh_from_db()
+        self.assertIn("$2b$04$", user.password)
+    
+    def test_saturated_pool_is_busy(self):
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(release.set)
+        slots = threading.BoundedSemaphore(2)
+        with mock.patch.object(hashing, '_pool', return_value=(executor, slots)), \
+                self.settings(PASSWORD_HASHING_QUEUE_TIMEOUT=0.05):
+            # One hash running, one queued: the third caller gives up
+            hashing._submit(release.wait)
+            hashing._submit(release.wait)
+            with self.assertRaises(hashing.HashingBusy):
+                hashing.hash_password("secret123")
+            
+            make_user(password="secret123")
+            response = APIClient().post(reverse('user_login'), {'email': "guest@example.com", 'password': "secret123"})
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], '5')
+
+class PruneTokensTests(TestCase):
+    def setUp(self):
+        user = make_user()
+        now = aware_utcnow()
+        self.expired = [
+            OutstandingToken.objects.create(user=user, jti=f"old{i}", token="t", expires_at=now - timedelta(days=1))
+            for i in range(5)
+        ]
+        self.live = [
+            OutstandingToken.objects.create(user=user, jti=f"new{i}", token="t", expires_at=now + timedelta(days=1))
+            for i in range(3)
+        ]
+        BlacklistedToken.objects.create(token=self.expired[0])
+        BlacklistedToken.objects.create(token=self.live[0])
+    
+    def prune(self, *args):
+        call_command('prune_tokens', '--batch-size', '2', *args, stdout=StringIO())
+    
+    def test_prunes_expired_tokens_and_their_blacklist_entries(self):
+        self.prune()
+        self.assertEqual(
+            set(OutstandingToken.objects.values_list('jti', flat=True)),
+            {token.jti for token in self.live}
+        )
+        self.assertEqual(list(BlacklistedToken.objects.values_list('token_id', flat=True)), [self.live[0].id])
+    
+    def test_stops_at_the_first_live_batch_unless_full(self):
+        # An expired token after the live ones is only reached by --full
+        straggler = OutstandingToken.objects.create(
+            user=self.live[0].user, jti="straggler", token="t", expires_at=aware_utcnow() - timedelta(days=1)
+        )
+        self.prune()
+        self.assertTrue(OutstandingToken.objects.filter(id=straggler.id).exists())
+        self.prune('--full')
+        self.assertFalse(OutstandingToken.objects.filter(id=straggler.id).exists())
+    
+    def test_dry_run_deletes_nothing(self):
+        self.prune('--dry-run')
+        self.assertEqual(OutstandingToken.objects.count(), 8)
+    
+    def test_check_indexes(self):
+        call_command('prune_tokens', '--check-indexes', stdout=StringIO())
+
+THROTTLE_SETTINGS = {
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {'otp_ip': '3/m', 'otp_email': '2/m', 'login_ip': '30/m', 'login_email': '10/15m'},
+}
+
+@override_settings(REST_FRAMEWORK=THROTTLE_SETTINGS)
+class ThrottleTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = APIRequestFactory()
+    
+    def allowed(self, throttle_class, data=None, **extra):
+        request = Request(self.factory.post('/', data or {}, format='json', **extra), parsers=[JSONParser()])
+        return throttle_class().allow_request(request, None)
+    
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/10m'), (5, 600))
+        self.assertEqual(parse_rate('20/h'), (20, 3600))
+    
+    def test_ip_limit_ignores_forwarded_for_without_proxies(self):
+        results = [
+            self.allowed(OTPIPThrottle, REMOTE_ADDR='203.0.113.7', HTTP_X_FORWARDED_FOR=f"198.51.100.{i}")
+            for i in range(4)
+        ]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertTrue(self.allowed(OTPIPThrottle, REMOTE_ADDR='203.0.113.8'))
+    
+    def test_ip_limit_behind_a_trusted_proxy(self):
+        with self.settings(REST_FRAMEWORK={**THROTTLE_SETTINGS, 'NUM_PROXIES': 1}):
+            # The client can prepend anything; the proxy appends the real address
+            results = [
+                self.allowed(OTPIPThrottle, REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f"198.51.100.{i}, 203.0.113.7")
+                for i in range(4)
+            ]
+            self.assertEqual(results, [True, True, True, False])
+            self.assertTrue(self.allowed(OTPIPThrottle, REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.8'))
+    
+    def test_email_limit_is_case_insensitive(self):
+        results = [self.allowed(OTPEmailThrottle, {'email': email}) for email in ("a@example.com", " A@example.com", "a@EXAMPLE.com")]
+        self.assertEqual(results, [True, True, False])
+        self.assertTrue(self.allowed(OTPEmailThrottle, {'email': "b@example.com"}))
+    
+    def test_email_limit_skips_bodies_without_an_email(self):
+        for data in ([{'email': "a@example.com"}], {'email': ["a@example.com"]}, {}):
+            for _ in range(3):
+                self.assertTrue(self.allowed(OTPEmailThrottle, data))
+    
+    def test_previous_window_is_weighted(self):
+        with mock.patch('user_roles.throttling.time.time', return_value=60 * 1000 + 30):
+            for email in ("a@example.com", "b@example.com"):
+                self.assertEqual([self.allowed(OTPEmailThrottle, {'email': email}) for _ in range(2)], [True, True])
+        # A quarter into the next window, 3/4 of the previous two still count...
+        with mock.patch('user_roles.throttling.time.time', return_value=60 * 1001 + 15):
+            self.assertFalse(self.allowed(OTPEmailThrottle, {'email': "a@example.com"}))
+        # ...five sixths in, only 1/6 of them do
+        with mock.patch('user_roles.throttling.time.time', return_value=60 * 1001 + 50):
+            self.assertTrue(self.allowed(OTPEmailThrottle, {'email': "b@example.com"}))
+    
+    def test_throttled_view_answers_429(self):
+        for _ in range(2):
+            response = self.client.post(reverse('forgot_password'), {'email': "nobody@example.com"})
+            self.assertEqual(response.status_code, 404)
+        response = self.client.post(reverse('forgot_password'), {'email': "nobody@example.com"})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+@override_settings(BCRYPT_ROUNDS=4)
+class EmailBackendTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user(password="secret123")
+    
+    def test_outcomes(self):
+        self.assertEqual(check_credentials("guest@example.com", "secret123"), (self.user, AUTHENTICATED))
+        self.assertEqual(check_credentials("guest@example.com", "wrong"), (self.user, BAD_PASSWORD))
+        self.assertEqual(check_credentials("nobody@example.com", "secret123"), (None, UNKNOWN_USER))
+        CustomUsers.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertEqual(check_credentials("guest@example.com", "secret123")[1], INACTIVE)
+    
+    def test_one_query_per_login(self):
+        with self.assertNumQueries(1):
+            check_credentials("guest@example.com", "secret123")
+    
+    def test_authenticate(self):
+        self.assertEqual(authenticate(email="guest@example.com", password="secret123"), self.user)
+        self.assertEqual(authenticate(username="guest@example.com", password="secret123"), self.user)
+        self.assertIsNone(authenticate(email="guest@example.com", password="wrong"))
+    
+    def test_login_view_outcomes(self):
+        def login(email, password):
+            return self.client.post(reverse('user_login'), {'email': email, 'password': password}).status_code
+        
+        self.assertEqual(login("guest@example.com", "secret123"), 200)
+        self.assertEqual(login("guest@example.com", "wrong"), 401)
+        self.assertEqual(login("nobody@example.com", "secret123"), 404)
+
+# A TransactionTestCase: uploads are staged when the request's transaction
+# commits, before the request closes its uploaded files.
+@unittest.skipIf(Image is None, "Pillow is not installed")
+@override_settings(CACHES=TEST_CACHES)
+class ProfilePictureTests(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(
+            MEDIA_STORAGE='hotel_backend.media.LocalFileSystemStorage',
+            MEDIA_ROOT=media_root,
+            MEDIA_STAGING_DIR=os.path.join(media_root, 'staging'),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(make_user())
+    
+    def upload(self, uploaded_file):
+        return self.client.put(reverse('change_profile_picture'), {'profile_image': uploaded_file}, format='multipart')
+    
+    def test_non_images_are_rejected(self):
+        cases = {
+            "html named as an image": SimpleUploadedFile("me.jpg", b"<html><script>alert(1)</script></html>"),
+            "svg": SimpleUploadedFile("me.png", b'<svg xmlns="http://www.w3.org/2000/svg" onload="alert(1)"/>'),
+            "image with an html extension": image_upload("me.html", image_format='PNG'),
+            "truncated image": SimpleUploadedFile("me.png", image_upload("me.png", image_format='PNG').read()[:60]),
+        }
+        for label, uploaded_file in cases.items():
+            with self.subTest(label):
+                response = self.upload(uploaded_file)
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(MediaUpload.objects.exists())
+    
+    def test_pending_image_is_served_inline_as_what_it_is(self):
+        # A PNG the client called .jpeg is staged and served as a PNG
+        response = self.upload(image_upload("photo.jpeg", image_format='PNG'))
+        self.assertEqual(response.status_code, 202)
+        job = MediaUpload.objects.get()
+        self.assertTrue(job.staged_path.endswith('.png'))
+        self.assertEqual(job.original_name, "profile.png")
+        
+        pending = self.client.get(response.json()['profile_image'])
+        self.assertEqual(pending.status_code, 200)
+        self.assertEqual(pending['Content-Type'], 'image/png')
+        self.assertEqual(pending['Content-Disposition'], f'inline; filename="{os.path.basename(job.staged_path)}"')
+        self.assertEqual(pending['X-Content-Type-Options'], 'nosniff')
+        self.assertEqual(b"".join(pending.streaming_content)[:8], b"\x89PNG\r\n\x1a\n")
+    
+    def test_only_pending_uploads_are_served(self):
+        url = self.upload(image_upload("me.jpg")).json()['profile_image']
+        job = MediaUpload.objects.get()
+        
+        MediaUpload.objects.filter(id=job.id).update(status=MediaUpload.FAILED)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        
+        MediaUpload.objects.filter(id=job.id).update(status=MediaUpload.DONE, result='profile_images/me.jpg')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], '/media/profile_images/me.jpg')
+    
+    def test_provisional_url_expires(self):
+        url = self.upload(image_upload("me.jpg")).json()['profile_image']
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with mock.patch('django.core.signing.time.time', return_value=time.time() + PROVISIONAL_MAX_AGE + 1):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(url.replace('/media/pending/', '/media/pending/x')).status_code, 404)
@@ -0,0 +1,110 @@
+import hashlib
+import time
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from django.core.exceptions import ImproperlyConfigured
+from hotel_backend.cache import cache_namespace
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+throttle_cache = cache_namespace('throttle')
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Sliding-window rate limit kept in the shared cache.
+
+    Requests are counted in fixed windows; the rate is estimated as the
+    current window's count plus the previous window's count weighted by how
+    much of it still overlaps the sliding window. That costs one incr and
+    one get per request, regardless of the rate, and the incr is atomic so
+    concurrent requests can't all slip under the limit.
+
+    Subclasses set ``scope`` (a key of DEFAULT_THROTTLE_RATES, e.g.
+    ``'5/10m'``) and implement get_ident_key().
+    """
+    scope = None
+
+    def __init__(self):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if rate is None:
+            raise ImproperlyConfigured(f"No throttle rate set for scope '{self.scope}'")
+        self.num_requests, self.duration = parse_rate(rate)
+        self._wait = None
+
+    def get_ident_key(self, request):
+        """Identifier to limit on, or None to skip this throttle for the request."""
+        raise NotImplementedError('.get_ident_key() must be overridden')
+
+    def allow_request(self, request, view):
+        ident = self.get_ident_key(request)
+        if not ident:
+            return True
+
+        now = time.time()
+        window = int(now // self.duration)
+        elapsed = (now % self.duration) / self.duration
+        current_key = f"{self.scope}:{ident}:{window}"
+
+        try:
+            current = throttle_cache.incr(current_key)
+        except ValueError:
+            # Windows expire once they can no longer overlap the sliding one.
+            if throttle_cache.add(current_key, 1, self.duration * 2):
+                current = 1
+            else:
+                current = throttle_cache.incr(current_key)
+        previous = throttle_cache.get(f"{self.scope}:{ident}:{window - 1}", 0)
+
+        estimated = previous * (1 - elapsed) + current
+        if estimated <= self.num_requests:
+            return True
+
+        self._wait = self._seconds_until_allowed(previous, current, elapsed)
+        return False
+
+    def wait(self):
+        return self._wait
+
+    def _seconds_until_allowed(self, previous, current, elapsed):
+        if current >= self.num_requests or not previous:
+            return (1 - elapsed) * self.duration
+        # Previous window's weight has to fall far enough for one more request.
+        needed = 1 - (self.num_requests - current) / previous
+        return max(needed - elapsed, 0) * self.duration
+
+class IPThrottle(SlidingWindowThrottle):
+    # Keyed on REMOTE_ADDR, or the address NUM_PROXIES hops back in
+    # X-Forwarded-For behind that many trusted proxies.
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+class EmailThrottle(SlidingWindowThrottle):
+    def get_ident_key(self, request):
+        # JSON bodies can be lists or scalars too
+        if not isinstance(request.data, dict):
+            return None
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+class OTPIPThrottle(IPThrottle):
+    scope = 'otp_ip'
+
+class OTPEmailThrottle(EmailThrottle):
+    scope = 'otp_email'
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+class LoginEmailThrottle(EmailThrottle):
+    scope = 'login_email'
+
+def parse_rate(rate):
+    """
+    Parse ``'<requests>/<period>'`` where period is s, m, h or d with an
+    optional multiplier, e.g. ``'5/10m'`` for five requests per ten minutes.
+    """
+    num, period = rate.split('/')
+    multiplier = period[:-1] or '1'
+    return int(num), int(multiplier) * PERIODS[period[-1]]
@@ -21,6 +21,7 @@ urlpatterns = [
     
     # For guest profile
     path('guest/change_image', views.change_profile_picture, name='change_profile_picture'),
+    path('media/pending/<str:token>', views.pending_media, name='pending_media'),
     path('guest/<int:id>', views.user_details, name='user_details'),
     path('guest/update/<int:id>', views.update_user_details, name='update_user_details'),
     path('guest/bookings', views.get_guest_bookings, name='get_guest_bookings'),
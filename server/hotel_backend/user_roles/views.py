@@ -1,19 +1,35 @@
-from django.contrib.auth import authenticate, logout, login
+from django.contrib.auth import logout, login
+from django.http import FileResponse, HttpResponseRedirect
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken # type: ignore
 from .models import CustomUsers
 from .serializers import CustomUserSerializer
 from .email.email import send_otp_to_email, send_reset_password
-from django.core.cache import cache
 from .validation.validation import RegistrationForm
 from datetime import timedelta
 from booking.models import Bookings
-from booking.serializers import BookingSerializer
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from booking.serializers import BookingSerializer, with_valid_id_status
+from hotel_backend.pagination import page_params, get_page, last_page
 from property.serializers import AreaSerializer
+from hotel_backend.media import media_url, verified_image_extension, image_content_type
+from admin_dashboard.models import MediaUpload
+from admin_dashboard.uploads import queue_media_upload, provisional_url, provisional_upload
+import os
+from .cache import cached_user_payload
+from . import otp as otp_store
+from .hashing import hash_password, verify_password, HashingBusy
+from .backends import check_credentials, AUTHENTICATED, UNKNOWN_USER, EMAIL_BACKEND_PATH
+from .throttling import OTPIPThrottle, OTPEmailThrottle, LoginIPThrottle, LoginEmailThrottle
+
+def hashing_busy_response():
+    response = Response({
+        "error": "The server is busy. Please try again in a few seconds."
+    }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = '5'
+    return response
 
 # Create your views here.
 @api_view(['POST'])
@@ -46,19 +62,22 @@ def change_password(request):
         if new_password != confirm_new_password:
             return Response({'error': 'New password and confirm new password do not match'}, status=status.HTTP_400_BAD_REQUEST)
         
-        if not user.check_password(old_password):
+        if not verify_password(user, old_password):
             return Response({'error': 'Old password is incorrect'}, status=status.HTTP_400_BAD_REQUEST)
         
-        user.set_password(new_password)
+        user.password = hash_password(new_password)
         user.save()
         
         return Response({
             'message': 'Password changed successfully'
         }, status=status.HTTP_200_OK)
+    except HashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
+@throttle_classes([OTPIPThrottle, OTPEmailThrottle])
 def send_register_otp(request):
     try:     
         email = request.data.get("email")
@@ -93,10 +112,7 @@ def send_register_otp(request):
                 "error": "Email already exists"
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        purpose = "account_verification"
-        cache_key = f"{email}_{purpose}"
-        
-        if cache.get(cache_key):
+        if otp_store.pending_otp(email, otp_store.REGISTRATION):
             return Response({
                 "error": "An OTP has already been sent to your email. Please check your inbox."
             }, status=status.HTTP_400_BAD_REQUEST)
@@ -109,18 +125,18 @@ def send_register_otp(request):
                 "error": "An error occurred while sending the OTP. Please try again later."
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-        # Store both OTP and password in cache
-        cache_data = {
-            'otp': otp_generated,
-            'password': password
-        }
-        OTP_EXPIRATION_TIME = 120
-        cache.set(cache_key, cache_data, OTP_EXPIRATION_TIME)
+        # Keep the hashed password with the OTP until the account is verified
+        otp_store.store_otp(email, otp_store.REGISTRATION, otp_generated, {
+            'email': email,
+            'password_hash': hash_password(password)
+        })
         
         return Response({
             "message": "OTP sent for account verification",
             'otp': otp_generated
         }, status=status.HTTP_200_OK)
+    except HashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         print(f"Registration error: {str(e)}")
         return Response({
@@ -130,86 +146,67 @@ def send_register_otp(request):
 @api_view(['POST'])
 def verify_otp(request):
     try:
+        email = request.data.get("email")
         received_otp = request.data.get("otp")
         
-        if not received_otp:
-            return Response({"error": "OTP is required"}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Get the email from the cache using the OTP
-        purpose = "account_verification"
-        
-        # Since we can't use keys(), we'll need to store the email in the cache data
-        # Find the matching OTP in cache
-        matching_key = None
-        cached_data = None
-        
-        # Try to find the cache entry by checking common email patterns
-        for email in [request.data.get("email")] + [f"user{i}@example.com" for i in range(100)]:
-            cache_key = f"{email}_{purpose}"
-            data = cache.get(cache_key)
-            if data and str(data['otp']) == str(received_otp):
-                matching_key = cache_key
-                cached_data = data
-                break
+        if not email or not received_otp:
+            return Response({"error": "Email and OTP are required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not matching_key or not cached_data:
-            return Response({"error": "Incorrect OTP code. Please try again"}, status=status.HTTP_400_BAD_REQUEST)
+        otp_status, cached_data = otp_store.verify_otp_code(email, otp_store.REGISTRATION, received_otp)
         
-        # Extract email from the cache key
-        email = matching_key.split('_')[0]
+        if otp_status == otp_store.EXPIRED:
+            return Response({"error": "OTP expired. Please request a new one."}, status=status.HTTP_400_BAD_REQUEST)
+        if otp_status == otp_store.LOCKED:
+            return Response({"error": "Too many incorrect attempts. Please request a new OTP."}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        if otp_status != otp_store.VALID:
+            return Response({"error": "Incorrect OTP code. Please try again"}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Delete the cache entry
-        cache.delete(matching_key)
+        # Register the address exactly as it was submitted at sign-up
+        email = cached_data['email']
 
         DEFAULT_PROFILE_IMAGE = "https://res.cloudinary.com/ddjp3phzz/image/upload/v1741784007/wyzaupfxdvmwoogegsg8.jpg"
         
         if CustomUsers.objects.filter(email=email).exists():
             return Response({"error": "User already exists"}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create user with default values
-        user = CustomUsers.objects.create_user(
+        # Create user with default values; the password was hashed at sign-up
+        user = CustomUsers(
             username=email,
-            email=email,
-            password=cached_data['password'],
+            email=CustomUsers.objects.normalize_email(email),
             first_name="Guest",
             last_name="",
             role="guest",
             profile_image=DEFAULT_PROFILE_IMAGE
         )
+        user.password = cached_data['password_hash']
         user.save()
 
-        user_auth = authenticate(request, username=email, password=cached_data['password'])
-        if user_auth is not None:
-            login(request, user_auth)
-            refresh = RefreshToken.for_user(user_auth)
-            response = Response({
-                "message": "OTP verified and user registered successfully",
-                "access_token": str(refresh.access_token),
-                "refresh_token": str(refresh),
-                "user": CustomUserSerializer(user_auth).data
-            }, status=status.HTTP_200_OK)
-            # Set access and refresh token cookies.
-            response.set_cookie(
-                key="access_token",
-                value=str(refresh.access_token),
-                httponly=True,
-                secure=False,
-                samesite='Lax',
-                max_age=timedelta(days=1)
-            )
-            response.set_cookie(
-                key="refresh_token",
-                value=str(refresh),
-                httponly=True,
-                secure=False,
-                samesite='Lax',
-                max_age=timedelta(days=7)
-            )
-            return response
-        else:
-            return Response({
-                "error": "An error occurred during authentication. Please try again later."
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        login(request, user, backend=EMAIL_BACKEND_PATH)
+        refresh = RefreshToken.for_user(user)
+        response = Response({
+            "message": "OTP verified and user registered successfully",
+            "access_token": str(refresh.access_token),
+            "refresh_token": str(refresh),
+            "user": CustomUserSerializer(user).data
+        }, status=status.HTTP_200_OK)
+        # Set access and refresh token cookies.
+        response.set_cookie(
+            key="access_token",
+            value=str(refresh.access_token),
+            httponly=True,
+            secure=False,
+            samesite='Lax',
+            max_age=timedelta(days=1)
+        )
+        response.set_cookie(
+            key="refresh_token",
+            value=str(refresh),
+            httponly=True,
+            secure=False,
+            samesite='Lax',
+            max_age=timedelta(days=7)
+        )
+        return response
     except Exception as e:
         print(f"Error in verify_otp: {str(e)}")
         return Response({
@@ -217,6 +214,7 @@ def verify_otp(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
+@throttle_classes([OTPIPThrottle, OTPEmailThrottle])
 def resend_otp(request):
     try:
         email = request.data.get("email")
@@ -225,19 +223,21 @@ def resend_otp(request):
                 "error": "Email is required"
             }, status=status.HTTP_400_BAD_REQUEST)
             
-        purpose = "account_verification"
-        cache_key = f"{email}_{purpose}"
+        pending = otp_store.pending_otp(email, otp_store.REGISTRATION)
+        if pending is None:
+            return Response({
+                "error": "Your registration has expired. Please sign up again."
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        cached_otp = cache.get(cache_key)
-        if cached_otp:
-            otp_to_send = cached_otp
-        else:
-            otp_to_send = send_otp_to_email(email, "Your OTP for account verification")
-            if otp_to_send is None:
-                return Response({
-                    "error": "An error occurred while resending the OTP. Please try again later."
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            cache.set(cache_key, otp_to_send, timeout=120)
+        otp_to_send = send_otp_to_email(email, "Your OTP for account verification")
+        if otp_to_send is None:
+            return Response({
+                "error": "An error occurred while resending the OTP. Please try again later."
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        otp_store.store_otp(email, otp_store.REGISTRATION, otp_to_send, {
+            'email': pending['email'],
+            'password_hash': pending['password_hash']
+        })
             
         return Response({
             "message": "OTP resent successfully",
@@ -248,6 +248,7 @@ def resend_otp(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
+@throttle_classes([OTPIPThrottle, OTPEmailThrottle])
 def forgot_password(request):
     try:
         email = request.data.get('email')
@@ -266,9 +267,7 @@ def forgot_password(request):
                 "error": "An error occurred while sending the OTP. Please try again later."
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-        purpose = "reset_password"
-        cache_key = f"{email}_{purpose}"
-        cache.set(cache_key, otp, timeout=120)
+        otp_store.store_otp(email, otp_store.PASSWORD_RESET, otp)
         
         return Response({
             "message": "OTP sent successfully",
@@ -290,21 +289,24 @@ def verify_reset_otp(request):
                 "error": "Email and OTP are required"
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        purpose = "reset_password"
-        cache_key = f"{email}_{purpose}"
-        cached_otp = cache.get(cache_key)
+        otp_status, _ = otp_store.verify_otp_code(email, otp_store.PASSWORD_RESET, received_otp)
         
-        if cached_otp is None:
+        if otp_status == otp_store.EXPIRED:
             return Response({
                 "error": "OTP expired. Please request a new one."
             }, status=status.HTTP_404_NOT_FOUND)
+        
+        if otp_status == otp_store.LOCKED:
+            return Response({
+                "error": "Too many incorrect attempts. Please request a new OTP."
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
             
-        if str(cached_otp) != str(received_otp):
+        if otp_status != otp_store.VALID:
             return Response({
                 "error": "Incorrect OTP code. Please try again."
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        cache.delete(cache_key)
+        otp_store.grant_password_reset(email)
         
         return Response({
             "message": "OTP verified successfully"
@@ -338,50 +340,52 @@ def reset_password(request):
                 "error": "User does not exist"
             }, status=status.HTTP_404_NOT_FOUND)
         
+        if not otp_store.consume_password_reset(email):
+            return Response({
+                "error": "Please verify the OTP sent to your email first."
+            }, status=status.HTTP_403_FORBIDDEN)
+        
         existing_profile_image = user.profile_image
         
-        user.set_password(new_password)
+        user.password = hash_password(new_password)
         user.profile_image = existing_profile_image
         user.save()
         
-        user = authenticate(request, username=email, password=new_password)
-        if user is not None:
-            login(request, user)
-            refresh = RefreshToken.for_user(user)
-            response = Response({
-                "message": "Password reset successfully",
-                'profile_image': user.profile_image.url if user.profile_image else "",
-            }, status=status.HTTP_200_OK)
-            
-            response.set_cookie(
-                key="access_token",
-                value=str(refresh.access_token),
-                httponly=True,
-                secure=False,
-                samesite='Lax',
-                max_age=timedelta(days=1)
-            )
-            
-            response.set_cookie(
-                key="refresh_token",
-                value=str(refresh),
-                httponly=True,
-                secure=False,
-                samesite='Lax',
-                max_age=timedelta(days=7)
-            )
-            
-            return response
-        else:
-            return Response({
-                "error": "Password reset failed. Please try again later."
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        login(request, user, backend=EMAIL_BACKEND_PATH)
+        refresh = RefreshToken.for_user(user)
+        response = Response({
+            "message": "Password reset successfully",
+            'profile_image': media_url(user.profile_image) or "",
+        }, status=status.HTTP_200_OK)
+
+        response.set_cookie(
+            key="access_token",
+            value=str(refresh.access_token),
+            httponly=True,
+            secure=False,
+            samesite='Lax',
+            max_age=timedelta(days=1)
+        )
+
+        response.set_cookie(
+            key="refresh_token",
+            value=str(refresh),
+            httponly=True,
+            secure=False,
+            samesite='Lax',
+            max_age=timedelta(days=7)
+        )
+
+        return response
+    except HashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         return Response({
             "error": "An error occurred while resetting the password. Please try again later."
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
+@throttle_classes([LoginIPThrottle, LoginEmailThrottle])
 def user_login(request):
     try:
         email = request.data.get('email')
@@ -390,32 +394,30 @@ def user_login(request):
         if not email or not password:
             return Response({'error': 'Email and password are required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        user = CustomUsers.objects.filter(email=email).first()
-        if not user:
+        user, outcome = check_credentials(email, password)
+        if outcome == UNKNOWN_USER:
             return Response({'error': 'User does not exist'}, status=status.HTTP_404_NOT_FOUND)
             
-        auth_user = authenticate(request, username=email, password=password)
-        
-        if auth_user is None:
+        if outcome != AUTHENTICATED:
             return Response({'error': 'Your password is incorrect'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        token = RefreshToken.for_user(auth_user)
+        token = RefreshToken.for_user(user)
         
         user_data = {
-            'id': auth_user.id,
-            'email': auth_user.email,
-            'username': auth_user.username,
-            'first_name': auth_user.first_name,
-            'last_name': auth_user.last_name,
-            'role': auth_user.role,
-            'profile_image': auth_user.profile_image.url if auth_user.profile_image else "",
+            'id': user.id,
+            'email': user.email,
+            'username': user.username,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'role': user.role,
+            'profile_image': media_url(user.profile_image) or "",
         }
         
         # Check if user is admin
-        is_admin = auth_user.role == 'admin'
+        is_admin = user.role == 'admin'
         
         response = Response({
-            'message': f'{auth_user.first_name} logged in successfully!',
+            'message': f'{user.first_name} logged in successfully!',
             'user': user_data,
             'access_token': str(token.access_token),
             'refresh_token': str(token),
@@ -444,7 +446,7 @@ def user_login(request):
         # Set role in cookie for frontend to check
         response.set_cookie(
             key="user_role",
-            value=auth_user.role,
+            value=user.role,
             httponly=False,
             secure=False,
             samesite='Lax',
@@ -452,6 +454,8 @@ def user_login(request):
         )
         
         return response
+    except HashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -476,7 +480,7 @@ def user_auth(request):
                 'username': user.username,
                 'first_name': user.first_name,
                 'last_name': user.last_name,
-                'profile_image': user.profile_image.url if user.profile_image else "",
+                'profile_image': media_url(user.profile_image) or "",
             }
         }, status=status.HTTP_200_OK)
     except Exception as e:
@@ -489,11 +493,11 @@ def user_auth(request):
 @permission_classes([IsAuthenticated])
 def user_details(request, id):
     try:
-        user = CustomUsers.objects.get(id=id)
-        serializer = CustomUserSerializer(user)
-        return Response({
-            'data': serializer.data
-        }, status=status.HTTP_200_OK)
+        payload = cached_user_payload(
+            id, 'details',
+            lambda: {'data': CustomUserSerializer(CustomUsers.objects.get(id=id)).data}
+        )
+        return Response(payload, status=status.HTTP_200_OK)
     except CustomUsers.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
@@ -509,16 +513,54 @@ def change_profile_picture(request):
                 'error': 'User not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        user.profile_image = request.FILES['profile_image']
-        user.save()
+        profile_image = request.FILES.get('profile_image')
+        if not profile_image:
+            return Response({
+                'error': 'Profile image is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Served back from our own origin until it is stored, so only real
+        # images go through, staged under the extension of what they are.
+        extension = verified_image_extension(profile_image)
+        if extension is None:
+            return Response({
+                'error': 'Profile image must be a JPEG, PNG, GIF or WebP image'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        profile_image.name = f"profile{extension}"
+        
+        # Stored, resized and swapped in by process_media_uploads; until then
+        # the provisional URL serves the uploaded file as it is.
+        job = queue_media_upload(user, 'profile_image', profile_image, discard_previous=True)
         
         return Response({
-            'message': 'Profile picture updated successfully',
-            'profile_image': user.profile_image.url
-        }, status=status.HTTP_200_OK)
+            'message': 'Profile picture is being updated',
+            'profile_image': request.build_absolute_uri(provisional_url(job))
+        }, status=status.HTTP_202_ACCEPTED)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+def pending_media(request, token):
+    job = provisional_upload(token)
+    if job is None:
+        return Response({'error': 'File not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    # Stored files are served by the media storage; failed uploads are
+    # never served, although their staged file is kept.
+    if job.status == MediaUpload.DONE:
+        return HttpResponseRedirect(media_url(job.result))
+    
+    content_type = image_content_type(job.staged_path)
+    if job.status != MediaUpload.PENDING or content_type is None or not os.path.exists(job.staged_path):
+        return Response({'error': 'File not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    response = FileResponse(
+        open(job.staged_path, 'rb'), content_type=content_type, filename=os.path.basename(job.staged_path)
+    )
+    response['X-Content-Type-Options'] = 'nosniff'
+    response['Cache-Control'] = 'no-store'
+    return response
+
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def update_user_details(request, id):
@@ -561,50 +603,49 @@ def update_user_details(request, id):
 def get_guest_bookings(request):
     try:        
         user = request.user
-        bookings = Bookings.objects.filter(user=user).order_by('-created_at')
-        
-        page = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 5)
-        
-        paginator = Paginator(bookings, page_size)
-        
-        try:
-            paginated_bookings = paginator.page(page)
-        except PageNotAnInteger:
-            paginated_bookings = paginator.page(1)
-        except EmptyPage:
-            paginated_bookings = paginator.page(paginator.num_pages)
-            
-        booking_data = []
-        for booking in paginated_bookings:
-            booking_serializer = BookingSerializer(booking)
-            data = booking_serializer.data
+        page, page_size = page_params(request, 5)
+        # Resolve the page before keying the cache, so only real pages get
+        # an entry and pages past the end share the last one's.
+        total = cached_user_payload(user.id, "bookings_count", Bookings.objects.filter(user=user).count)
+        page = min(page, last_page(total, page_size))
+        
+        def build_payload():
+            bookings = with_valid_id_status(Bookings.objects.filter(user=user)).order_by('-created_at').select_related(
+                'user', 'room', 'area'
+            ).prefetch_related('room__amenities')
             
-            if booking.is_venue_booking and booking.area:
-                area_serializer = AreaSerializer(booking.area)
-                data['area_details'] = area_serializer.data
-            elif booking.room:
-                from property.serializers import RoomSerializer
-                room_serializer = RoomSerializer(booking.room)
-                data['room_details'] = room_serializer.data
-            
-            if booking.valid_id:
-                if hasattr(booking.valid_id, 'url'):
-                    data['valid_id'] = booking.valid_id.url
-                else:
-                    data['valid_id'] = booking.valid_id
+            paginated_bookings = get_page(bookings, page, page_size, count=total)
+                
+            booking_data = []
+            for booking in paginated_bookings:
+                booking_serializer = BookingSerializer(booking)
+                data = booking_serializer.data
+                
+                if booking.is_venue_booking and booking.area:
+                    area_serializer = AreaSerializer(booking.area)
+                    data['area_details'] = area_serializer.data
+                elif booking.room:
+                    from property.serializers import RoomSerializer
+                    room_serializer = RoomSerializer(booking.room)
+                    data['room_details'] = room_serializer.data
+                
+                if booking.valid_id:
+                    data['valid_id'] = media_url(booking.valid_id)
+                
+                booking_data.append(data)
             
-            booking_data.append(data)
-        
-        return Response({
-            "data": booking_data,
-            "pagination": {
-                "total_pages": paginator.num_pages,
-                "current_page": int(page),
-                "total_items": paginator.count,
-                "page_size": int(page_size)
+            return {
+                "data": booking_data,
+                "pagination": {
+                    "total_pages": paginated_bookings.paginator.num_pages,
+                    "current_page": page,
+                    "total_items": total,
+                    "page_size": page_size
+                }
             }
-        }, status=status.HTTP_200_OK)
+        
+        payload = cached_user_payload(user.id, f"guest_bookings:{page}:{page_size}", build_payload)
+        return Response(payload, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 